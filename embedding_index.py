@@ -0,0 +1,127 @@
+import re
+import math
+import hashlib
+import numpy as np
+
+
+class HashingTfidfEmbedder:
+    """
+    CPU-only text embedding which needs no model download and no network.
+
+    Word unigrams and bigrams are hashed (signed feature hashing) into a fixed number of
+    dimensions , weighted by log term frequency and , once `fit` has seen the corpus , by inverse
+    document frequency , then L2 normalized , so a dot product is the cosine similarity.
+
+    Any callable taking a list of texts and returning a 2D NumPy array can be used in its place
+    by `EmbeddingIndex` (e.g. a sentence-transformers model) , `fit` is optional.
+
+    Args:
+        dimensions (int): Size of each embedding vector.
+        use_bigrams (bool): Adds word bigrams to the hashed features.
+    """
+
+    def __init__(self, dimensions=2048, use_bigrams=True):
+        self.dimensions = dimensions
+        self.use_bigrams = use_bigrams
+        self.idf_weights = None
+
+    def _features(self, text):
+        tokens = re.findall(r"\w+", str(text or "").lower())
+        features = list(tokens)
+        if self.use_bigrams:
+            features += [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        return features
+
+    def _bucket(self, feature):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dimensions, (1.0 if (digest >> 63) & 1 else -1.0)
+
+    def _term_frequency_matrix(self, texts):
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row_index, each_text in enumerate(texts):
+            for each_feature in self._features(each_text):
+                bucket_index, sign = self._bucket(each_feature)
+                matrix[row_index, bucket_index] += sign
+        # log scaled term frequency , keeping the sign of the hashed feature
+        return np.sign(matrix) * np.log1p(np.abs(matrix))
+
+    def fit(self, texts):
+        """Learns inverse document frequency of every bucket from the given corpus."""
+        document_frequency = (self._term_frequency_matrix(texts) != 0).sum(axis=0)
+        self.idf_weights = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self
+
+    def __call__(self, texts):
+        matrix = self._term_frequency_matrix(texts)
+        if self.idf_weights is not None:
+            matrix *= self.idf_weights
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class EmbeddingIndex:
+    """
+    In-memory vector index with NumPy cosine top-k search.
+
+    Args:
+        embedding_function (callable): list[str] -> np.ndarray of shape (len(texts), dimensions).
+            `HashingTfidfEmbedder()` when not given. If it has a `fit` method it is fitted on the
+            indexed texts when the index is built.
+
+    Example Usage:
+        project_index = EmbeddingIndex()
+        project_index.add(page_id, "Marketing Agent ...", {"page_project_title": "Marketing Agent"})
+        relevant_projects = project_index.search(latest_meeting_summary, top_k=5)
+    """
+
+    def __init__(self, embedding_function=None):
+        self.embedding_function = embedding_function or HashingTfidfEmbedder()
+        self.item_ids = []
+        self.texts = []
+        self.metadata = []
+        self.matrix = None
+
+    def __len__(self):
+        return len(self.item_ids)
+
+    def add(self, item_id, text, metadata=None):
+        self.item_ids.append(item_id)
+        self.texts.append(text)
+        self.metadata.append(metadata or {})
+        self.matrix = None    # rebuilt on next search
+
+    def build(self):
+        if hasattr(self.embedding_function, "fit"):
+            self.embedding_function.fit(self.texts)
+        self.matrix = np.asarray(self.embedding_function(self.texts), dtype=np.float32) if self.texts else None
+        if self.matrix is not None:
+            # Normalizing here as well , so plugged-in functions do not have to
+            norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.matrix = self.matrix / norms
+        return self
+
+    def search(self, query_text, top_k=5, min_score=0.0):
+        """
+        Returns:
+            list[dict]: Up to `top_k` items {"id", "score", "metadata"} with score >= `min_score` , best first.
+        """
+        if not self.item_ids:
+            return []
+        if self.matrix is None:
+            self.build()
+
+        query_vector = np.asarray(self.embedding_function([query_text]), dtype=np.float32)[0]
+        query_norm = np.linalg.norm(query_vector)
+        if query_norm == 0 or math.isnan(query_norm):
+            return []
+        scores = self.matrix @ (query_vector / query_norm)
+
+        top_k = min(top_k, len(scores))
+        top_indexes = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_indexes = top_indexes[np.argsort(-scores[top_indexes])]
+        return [
+            {"id": self.item_ids[index], "score": float(scores[index]), "metadata": self.metadata[index]}
+            for index in top_indexes if scores[index] >= min_score
+        ]
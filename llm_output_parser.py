@@ -0,0 +1,394 @@
+import re
+import json
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, RootModel, ValidationError, field_validator
+
+
+class LLMOutputParseError(ValueError):
+    """Raised when an LLM response can not be turned into the expected schema , even after the re-ask."""
+
+
+#####  Output schemas of the graph nodes  #####
+
+class LenientModel(BaseModel):
+    # LLMs add keys of their own now and then , they are kept instead of failing the run
+    model_config = ConfigDict(extra="allow")
+
+
+def _lower_stripped(value):
+    # "Yes" , " update " -> "yes" , "update"
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+class MeetingActionItem(LenientModel):
+    user: Optional[str] = None
+    task: Optional[str] = None
+
+
+class MeetingStakeholders(LenientModel):
+    leader: Optional[str] = None
+    task_assignees: List[str] = Field(default_factory=list)
+
+
+class MeetingStructure(LenientModel):
+    """Output of the meeting structuring prompt in `myAgentInvokation`."""
+    meeting_title: str
+    cleaned_summary: Optional[str] = None
+    stakeholders: MeetingStakeholders = Field(default_factory=MeetingStakeholders)
+    action_items: List[MeetingActionItem] = Field(default_factory=list)
+
+
+class TopicClassification(LenientModel):
+    """Output of `checking_new_or_old_topic`."""
+    status: Optional[str] = None
+    matched_meeting_name: Optional[str] = None
+    new_topic_name: Optional[str] = None
+    reason: Optional[str] = None
+    is_new_topic: Literal["yes", "no"]
+
+    _normalize_is_new_topic = field_validator("is_new_topic", mode="before")(_lower_stripped)
+
+
+class ProjectPoints(LenientModel):
+    notion_id: str
+    project_name: str
+    points_list: List[str] = Field(default_factory=list)
+
+
+class ProjectPointsList(RootModel[List[ProjectPoints]]):
+    """Output of the project mapping prompt in `getting_structured_meeting_summary`."""
+
+
+class BlockChange(LenientModel):
+    LineId: Optional[str] = None
+    objectId: str
+    ChangeType: Literal["add", "append", "update", "delete"]
+    function_to_be_used: Optional[str] = None
+    ContentForChange: Optional[str] = None
+
+    _normalize_change_type = field_validator("ChangeType", mode="before")(_lower_stripped)
+
+
+class PageChanges(LenientModel):
+    """Output of the per page changes prompt in `getting_structured_meeting_summary`."""
+    page_id: Optional[str] = None
+    changes: List[BlockChange] = Field(default_factory=list)
+    notion_changeLogs: List[str] = Field(default_factory=list)
+    effective_change_logs: List[str] = Field(default_factory=list)
+    summarized_points: List[str] = Field(default_factory=list)
+    suggested_action_items_add: List[Any] = Field(default_factory=list)
+
+
+class HumanIntent(LenientModel):
+    """Output of the slack reply intent prompt in `handling_sending_msg_in_thread`."""
+    acceptance: Literal["yes", "no"]
+    notion_page_id: Optional[str] = None
+
+    _normalize_acceptance = field_validator("acceptance", mode="before")(_lower_stripped)
+
+
+class NewProjectNotes(LenientModel):
+    """One project of the new meeting topic prompt in `process_new_meeting_topic`."""
+    project_name: str
+    latest_notes: List[Dict[str, Any]] = Field(default_factory=list)
+    action_items: List[Dict[str, Any]] = Field(default_factory=list)
+    summarized_list: List[str] = Field(default_factory=list)
+
+
+class NewProjectNotesList(RootModel[List[NewProjectNotes]]):
+    """Output of the new meeting topic prompt in `process_new_meeting_topic`."""
+
+
+class ProvidedPageNotes(LenientModel):
+    """Output of the slack reply prompt in `handling_sending_msg_in_thread` for new topics."""
+    provided_notion_page_id: Literal["yes", "no"]
+    notion_page_id: Optional[str] = None
+    latest_notes: List[Dict[str, Any]] = Field(default_factory=list)
+    action_items: List[Dict[str, Any]] = Field(default_factory=list)
+    summarized_points: List[str] = Field(default_factory=list)
+
+    _normalize_provided_notion_page_id = field_validator("provided_notion_page_id", mode="before")(_lower_stripped)
+
+
+#####  Extraction and repair  #####
+
+# ```json ... ``` , ``` ... ``` and the json``` ... ``` spelling used in some of our prompt examples
+FENCED_BLOCK_PATTERN = re.compile(r"(?:```|json```)\s*(?:json|JSON)?\s*\n?(.*?)```", re.DOTALL)
+
+
+def extract_json_text(llm_content):
+    """
+    Returns the part of an LLM response which holds the JSON value.
+
+    A fenced block containing a JSON value is preferred. Otherwise the text from the first
+    `{` or `[` to its matching bracket (or to the end , for a cut off response) is returned.
+    """
+    text = str(llm_content or "").strip()
+    for fenced_match in FENCED_BLOCK_PATTERN.finditer(text):
+        fenced_text = fenced_match.group(1).strip()
+        if fenced_text[:1] in ("{", "["):
+            return fenced_text
+
+    start_positions = [position for position in (text.find("{"), text.find("[")) if position != -1]
+    if not start_positions:
+        return text
+    start_index = min(start_positions)
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start_index, len(text)):
+        character = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif character == "\\":
+                escaped = True
+            elif character == '"':
+                in_string = False
+        elif character == '"':
+            in_string = True
+        elif character in "{[":
+            depth += 1
+        elif character in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start_index:index + 1]
+    return text[start_index:].rstrip("`").strip()
+
+
+def repair_json_text(json_text):
+    """
+    Fixes the mistakes LLMs usually make in JSON , so that `json.loads` accepts it.
+
+    - smart quotes , `//` line comments , Python `None` / `True` / `False`
+    - trailing commas before `}` or `]`
+    - a response cut off in the middle: the open string is closed , a dangling key or comma
+      is dropped and the open brackets are closed
+    """
+    text = json_text.replace("“", '"').replace("”", '"')
+
+    # Walking the text once , so the replacements never touch the inside of strings
+    repaired_characters = []
+    open_brackets = []
+    in_string = False
+    escaped = False
+    index = 0
+    while index < len(text):
+        character = text[index]
+        if in_string:
+            repaired_characters.append(character)
+            if escaped:
+                escaped = False
+            elif character == "\\":
+                escaped = True
+            elif character == '"':
+                in_string = False
+            elif character == "\n":
+                repaired_characters[-1] = "\\n"
+            index += 1
+            continue
+
+        if character == '"':
+            in_string = True
+        elif character in "{[":
+            open_brackets.append("}" if character == "{" else "]")
+        elif character in "}]":
+            # dropping a trailing comma before the closing bracket
+            while repaired_characters and repaired_characters[-1].isspace():
+                repaired_characters.pop()
+            if repaired_characters and repaired_characters[-1] == ",":
+                repaired_characters.pop()
+            if open_brackets:
+                open_brackets.pop()
+        elif text.startswith("//", index):
+            newline_index = text.find("\n", index)
+            index = len(text) if newline_index == -1 else newline_index
+            continue
+        else:
+            literal_match = re.match(r"(None|True|False)\b", text[index:])
+            if literal_match and not (repaired_characters and (repaired_characters[-1].isalnum() or repaired_characters[-1] == "_")):
+                repaired_characters.append({"None": "null", "True": "true", "False": "false"}[literal_match.group(1)])
+                index += len(literal_match.group(1))
+                continue
+        repaired_characters.append(character)
+        index += 1
+
+    repaired_text = "".join(repaired_characters)
+    if in_string:
+        repaired_text += '"'
+    if open_brackets:
+        repaired_text = _drop_dangling_tail(repaired_text.rstrip(), open_brackets[-1])
+        repaired_text += "".join(reversed(open_brackets))
+    return repaired_text
+
+
+def _drop_dangling_tail(text, innermost_closing_bracket):
+    # For a cut off response: `{"a": 1,` , `{"a": 1, "b":` and `{"a": 1, "b"` all become `{"a": 1`
+    text = text.rstrip()
+    if text.endswith(","):
+        return text[:-1].rstrip()
+    if text.endswith(":"):
+        text = text[:-1].rstrip()
+        innermost_closing_bracket = "}"
+    if innermost_closing_bracket == "}":
+        dangling_key_match = re.search(r'([{,])\s*"(?:[^"\\]|\\.)*"$', text)
+        if dangling_key_match:
+            text = text[:dangling_key_match.start()] + ("{" if dangling_key_match.group(1) == "{" else "")
+    return text.rstrip()
+
+
+def load_llm_json(llm_content):
+    """
+    Returns the JSON value held by an LLM response , repairing it when needed.
+
+    Raises:
+        json.JSONDecodeError: If the JSON is broken beyond repair.
+    """
+    json_text = extract_json_text(llm_content)
+    try:
+        return json.loads(json_text)
+    except json.JSONDecodeError:
+        return json.loads(repair_json_text(json_text))
+
+
+#####  Validation and targeted re-ask  #####
+
+def _coerce_root(data, schema):
+    # {"projects": [...]} for a list schema , or [{...}] for an object schema
+    expects_list = issubclass(schema, RootModel)
+    if expects_list and isinstance(data, dict):
+        list_values = [value for value in data.values() if isinstance(value, list)]
+        if len(list_values) == 1:
+            return list_values[0]
+    if not expects_list and isinstance(data, list) and len(data) == 1 and isinstance(data[0], dict):
+        return data[0]
+    return data
+
+
+def _dump(validated_model):
+    return validated_model.model_dump(mode="json")
+
+
+def _set_value_at_path(data, path, value):
+    container = data
+    for step in path[:-1]:
+        container = container[step]
+    container[path[-1]] = value
+
+
+def _failing_field_paths(validation_error):
+    # Asking for the smallest field still worth re-generating: the object holding a missing key , or the bad value itself
+    failing_paths = []
+    for each_error in validation_error.errors():
+        path = tuple(step for step in each_error["loc"] if step != "__root__")
+        if each_error["type"] == "missing" and path:
+            path = path[:-1] if len(path) > 1 else path
+        if path not in failing_paths:
+            failing_paths.append(path)
+    return failing_paths
+
+
+def _describe_path(path):
+    return "".join(f"[{step}]" if isinstance(step, int) else f".{step}" for step in path).lstrip(".") or "<root>"
+
+
+def _invalidate_cached_response(llm, llm_content):
+    # A cached unparseable response would fail the same way on every replay , so it is dropped from the cache
+    invalidate_response = getattr(llm, "invalidate_response", None)
+    if invalidate_response is not None:
+        invalidate_response(llm_content)
+
+
+def parse_llm_output(llm_content, schema, llm=None, node_name=""):
+    """
+    Parses an LLM response into `schema` , tolerating the usual wrapping and JSON mistakes.
+
+    The JSON is taken out of a fenced block (or the outermost brackets) and repaired if it does
+    not load. When the value does not match the schema and `llm` is given , the LLM is asked
+    once more , only for the failing fields , with the invalid values and the validation errors
+    in the prompt instead of the whole original prompt. The returned values are merged back.
+    A response which fails (the original or the re-ask) is removed from the cache of a
+    `CachingChatModel` `llm`.
+
+    Args:
+        llm_content (str): The `.content` of the LLM response.
+        schema (type[BaseModel]): One of the schemas above.
+        llm: Chat model used for the re-ask , None to skip it.
+        node_name (str): Name printed in the logs.
+
+    Returns:
+        dict | list: The validated value as plain JSON data , so callers keep using dicts.
+
+    Raises:
+        LLMOutputParseError: If the response can not be parsed or validated after the re-ask.
+    """
+    try:
+        data = load_llm_json(llm_content)
+    except json.JSONDecodeError as e:
+        if llm is None:
+            raise LLMOutputParseError(f"{node_name}: response is not valid JSON: {e}") from e
+        _invalidate_cached_response(llm, llm_content)
+        print(f"⚠️ {node_name}: response is not valid JSON ({e}) , asking LLM to re-send it as JSON only")
+        reask_prompt = f"""The following text was supposed to be a single JSON value but it could not be parsed ({e}).
+Return the same content as valid JSON only , without any explanation or markdown.
+
+{llm_content}"""
+        reask_content = llm.invoke(reask_prompt).content
+        try:
+            data = load_llm_json(reask_content)
+        except json.JSONDecodeError as reask_error:
+            _invalidate_cached_response(llm, reask_content)
+            raise LLMOutputParseError(f"{node_name}: response is not valid JSON after re-ask: {reask_error}") from reask_error
+
+    data = _coerce_root(data, schema)
+    try:
+        return _dump(schema.model_validate(data))
+    except ValidationError as validation_error:
+        if llm is None:
+            raise LLMOutputParseError(f"{node_name}: {validation_error}") from validation_error
+        _invalidate_cached_response(llm, llm_content)
+        first_validation_error = validation_error
+
+    failing_paths = _failing_field_paths(first_validation_error)
+    if () in failing_paths:
+        raise LLMOutputParseError(f"{node_name}: {first_validation_error}")
+
+    def current_value(path):
+        value = data
+        for step in path:
+            try:
+                value = value[step]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return value
+
+    failing_fields = {_describe_path(path): current_value(path) for path in failing_paths}
+    error_lines = "\n".join(
+        f"- {_describe_path(tuple(each_error['loc']))}: {each_error['msg']}" for each_error in first_validation_error.errors()
+    )
+    print(f"⚠️ {node_name}: fields {list(failing_fields)} do not match the expected format , asking LLM to fix only them")
+    reask_prompt = f"""Some fields of your previous JSON response are invalid.
+
+Validation errors:
+{error_lines}
+
+Current values of the invalid fields:
+{json.dumps(failing_fields, ensure_ascii=False)}
+
+Expected JSON schema of the whole response:
+{json.dumps(schema.model_json_schema(), separators=(",", ":"))}
+
+Return only a JSON object mapping each of these field paths {list(failing_fields)} to its corrected value , without any explanation."""
+
+    reask_content = llm.invoke(reask_prompt).content
+    try:
+        corrected_fields = load_llm_json(reask_content)
+        for each_path in failing_paths:
+            field_path_text = _describe_path(each_path)
+            if isinstance(corrected_fields, dict) and field_path_text in corrected_fields:
+                _set_value_at_path(data, each_path, corrected_fields[field_path_text])
+        return _dump(schema.model_validate(data))
+    except (json.JSONDecodeError, ValidationError, KeyError, IndexError, TypeError) as e:
+        _invalidate_cached_response(llm, reask_content)
+        raise LLMOutputParseError(f"{node_name}: still invalid after re-ask: {e}") from e
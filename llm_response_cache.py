@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from langchain_core.messages import AIMessage, BaseMessage
+
+# Responses whose cache key is remembered for `CachingChatModel.invalidate_response`
+MAX_RECENT_CACHE_KEYS = 256
+
+
+class LLMResponseCache:
+    """
+    On-disk (SQLite) store of LLM responses , addressed by a hash of model , parameters and prompt.
+
+    Entries older than `ttl_seconds` are treated as missing and removed. When more than
+    `max_entries` are stored , the least recently used ones are evicted. Every hit refreshes
+    the entry's last used time.
+
+    Args:
+        cache_dir (str): Directory where the SQLite database file is created.
+        db_file_name (str): Name of the SQLite database file inside `cache_dir`.
+        ttl_seconds (float): Age after which an entry expires , None to keep entries forever.
+        max_entries (int): Number of entries kept before LRU eviction.
+    """
+
+    def __init__(self, cache_dir=".llm_cache", db_file_name="llm_response_cache.sqlite3",
+                 ttl_seconds=7 * 86400.0, max_entries=5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, db_file_name)
+
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    model_name TEXT,
+                    response_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used_at ON llm_responses (last_used_at);
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def build_key(model_name, params, prompt):
+        """Returns the sha256 hex digest of the canonical JSON of (model_name, params, prompt)."""
+        canonical_json = json.dumps([model_name, params, prompt], sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key):
+        """
+        Returns:
+            dict | None: The stored response , None on a miss or an expired entry.
+        """
+        now = time.time()
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT response_json, created_at FROM llm_responses WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+            if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                connection.execute("DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,))
+                row = None
+            if row:
+                connection.execute("UPDATE llm_responses SET last_used_at = ? WHERE cache_key = ?", (now, cache_key))
+
+        with self._lock:
+            self.stats["hits" if row else "misses"] += 1
+        return json.loads(row[0]) if row else None
+
+    def put(self, cache_key, model_name, response):
+        """Stores a JSON-serializable response and evicts expired and least recently used entries."""
+        now = time.time()
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses (cache_key, model_name, response_json, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                (cache_key, model_name, json.dumps(response, default=str), now, now)
+            )
+            evicted_count = 0
+            if self.ttl_seconds is not None:
+                evicted_count += connection.execute(
+                    "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)
+                ).rowcount
+            evicted_count += connection.execute(
+                """
+                DELETE FROM llm_responses WHERE cache_key IN (
+                    SELECT cache_key FROM llm_responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            ).rowcount
+
+        with self._lock:
+            self.stats["writes"] += 1
+            self.stats["evictions"] += evicted_count
+
+    def delete(self, cache_key):
+        """Removes one entry , e.g. a response its caller could not parse. Returns True if it was stored."""
+        with closing(self._connect()) as connection, connection:
+            deleted_count = connection.execute("DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,)).rowcount
+        return deleted_count == 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+class CachingChatModel:
+    """
+    Drop-in wrapper around a LangChain chat model whose `invoke` answers from `LLMResponseCache`.
+
+    The cache key covers the model name , the model's identifying parameters (temperature ,
+    max tokens , ...) , the prompt and any extra `invoke` kwargs , so changing any of them
+    asks the model again. Only the message content and additional kwargs are stored. Every
+    other attribute is passed through to the wrapped model.
+
+    A response its caller could not use is dropped again with `invalidate_response` , so the
+    next run asks the model instead of replaying the same broken answer (`parse_llm_output`
+    does this on a parse failure).
+
+    Args:
+        chat_model: The LangChain chat model (e.g. ChatOpenAI) to wrap.
+        response_cache (LLMResponseCache): The store to read and write responses.
+
+    Example Usage:
+        llm = CachingChatModel(ChatOpenAI(model="gpt-4o-mini"), LLMResponseCache())
+        llm_response = llm.invoke(prompt)    # same AIMessage as before , served from disk on replays
+        print(llm.get_cache_stats())
+    """
+
+    def __init__(self, chat_model, response_cache):
+        self.chat_model = chat_model
+        self.response_cache = response_cache
+        self.model_name = getattr(chat_model, "model_name", None) or getattr(chat_model, "model", None) or type(chat_model).__name__
+        # response content -> cache key of the latest responses , for `invalidate_response`
+        self._recent_cache_keys = OrderedDict()
+        self._recent_cache_keys_lock = threading.Lock()
+
+    def __getattr__(self, attribute_name):
+        return getattr(self.chat_model, attribute_name)
+
+    def _model_params(self):
+        try:
+            return dict(self.chat_model._identifying_params)
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _serialize_prompt(prompt):
+        if isinstance(prompt, str):
+            return prompt
+        if isinstance(prompt, BaseMessage):
+            prompt = [prompt]
+        if isinstance(prompt, (list, tuple)):
+            return [
+                [each_message.type, each_message.content] if isinstance(each_message, BaseMessage) else each_message
+                for each_message in prompt
+            ]
+        return str(prompt)
+
+    def invoke(self, prompt, config=None, **kwargs):
+        cache_key = LLMResponseCache.build_key(
+            self.model_name,
+            {**self._model_params(), **kwargs},
+            self._serialize_prompt(prompt)
+        )
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            print(f"🟢 LLM response served from cache , stats: {self.response_cache.get_stats()}")
+            self._remember_cache_key(cached_response["content"], cache_key)
+            return AIMessage(content=cached_response["content"], additional_kwargs=cached_response.get("additional_kwargs", {}))
+
+        llm_response = self.chat_model.invoke(prompt, config=config, **kwargs)
+        self.response_cache.put(
+            cache_key,
+            self.model_name,
+            {"content": llm_response.content, "additional_kwargs": getattr(llm_response, "additional_kwargs", {})}
+        )
+        self._remember_cache_key(llm_response.content, cache_key)
+        return llm_response
+
+    def _remember_cache_key(self, content, cache_key):
+        if not isinstance(content, str):
+            return
+        with self._recent_cache_keys_lock:
+            self._recent_cache_keys[content] = cache_key
+            self._recent_cache_keys.move_to_end(content)
+            while len(self._recent_cache_keys) > MAX_RECENT_CACHE_KEYS:
+                self._recent_cache_keys.popitem(last=False)
+
+    def invalidate_response(self, content):
+        """
+        Drops the cached entry of a response returned earlier by this model , given its content.
+
+        Returns:
+            bool: True if a cached entry was removed.
+        """
+        with self._recent_cache_keys_lock:
+            cache_key = self._recent_cache_keys.pop(content, None) if isinstance(content, str) else None
+        if cache_key is None:
+            return False
+        removed = self.response_cache.delete(cache_key)
+        if removed:
+            print("🗑️ Unusable LLM response removed from cache")
+        return removed
+
+    def get_cache_stats(self):
+        return self.response_cache.get_stats()
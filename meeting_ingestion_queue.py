@@ -0,0 +1,256 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import inspect
+from contextlib import closing
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MEETING_INGESTION_WORKERS = int(os.getenv("MEETING_INGESTION_WORKERS", "2"))
+MEETING_INGESTION_MAX_ATTEMPTS = int(os.getenv("MEETING_INGESTION_MAX_ATTEMPTS", "5"))
+# A claimed summary whose worker stops renewing the lease (crash , killed kernel) is handed out again after this
+MEETING_INGESTION_LEASE_SECONDS = float(os.getenv("MEETING_INGESTION_LEASE_SECONDS", "300"))
+RETRY_BACKOFF_BASE_SECONDS = 30.0
+RETRY_BACKOFF_MAX_SECONDS = 3600.0
+
+
+class MeetingIngestionQueue:
+    """
+    Durable (SQLite , WAL journal) work queue of the Read.ai meeting summaries captured from Slack.
+
+    Every summary is stored once , under a dedupe key (Slack `client_msg_id` , else channel:ts),
+    so Slack's event retries and reconnect replays never queue a meeting twice. Workers claim a
+    summary with a lease , run the agent on it and then ack it (done) or fail it:
+
+    - a failed summary is retried with exponential backoff , and moved to "dead" (dead letter)
+      after `max_attempts` attempts , where it waits for `requeue_dead`.
+    - a worker renews its lease while the agent runs , so only a summary whose worker died
+      (crash , killed kernel) is claimed again once its lease runs out.
+
+    Processing is at-least-once , and meetings which were acked are never run again. The value
+    returned by the handler is stored (as JSON) with the ack , and read back with `get_result`.
+
+    Args:
+        cache_dir (str): Directory where the SQLite database file is created.
+        db_file_name (str): Name of the SQLite database file inside `cache_dir`.
+        max_attempts (int): Attempts before a summary is dead lettered.
+        lease_seconds (float): Seconds a claim is valid without being renewed.
+
+    Example Usage:
+        meeting_ingestion_queue.enqueue(summary_key, summary_text, channel_id=channel_id, message_ts=ts)
+        await meeting_ingestion_queue.run_workers(myAgentInvokation)
+    """
+
+    def __init__(self, cache_dir=".ingestion_queue", db_file_name="meeting_summaries_queue.sqlite3",
+                 max_attempts=MEETING_INGESTION_MAX_ATTEMPTS, lease_seconds=MEETING_INGESTION_LEASE_SECONDS):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, db_file_name)
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+
+        with closing(self._connect()) as connection:
+            # WAL lets the Socket Mode listener enqueue while workers read and update rows
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meeting_summaries (
+                    summary_key TEXT PRIMARY KEY,
+                    channel_id TEXT,
+                    message_ts TEXT,
+                    summary_text TEXT NOT NULL,
+                    status TEXT NOT NULL,              -- pending , processing , done , dead
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,        -- unix time from which it may be claimed
+                    lease_owner TEXT,
+                    leased_until REAL,
+                    last_error TEXT,
+                    result_json TEXT,                  -- return value of the handler , set on ack
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_meeting_summaries_status ON meeting_summaries (status, available_at);
+                """
+            )
+            column_names = [row[1] for row in connection.execute("PRAGMA table_info(meeting_summaries)")]
+            if "result_json" not in column_names:
+                # Queue files created before results were stored
+                connection.execute("ALTER TABLE meeting_summaries ADD COLUMN result_json TEXT")
+
+    def _connect(self):
+        # Autocommit mode , transactions are opened explicitly with BEGIN IMMEDIATE where rows are claimed
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    @staticmethod
+    def build_summary_key(event):
+        """Dedupe key of a Slack message event , its `client_msg_id` when present , else "channel:ts"."""
+        return event.get("client_msg_id") or f"{event.get('channel')}:{event.get('ts')}"
+
+    def enqueue(self, summary_key, summary_text, channel_id=None, message_ts=None):
+        """
+        Adds a summary , unless one with the same key was already queued (whatever its status).
+
+        Returns:
+            bool: True if the summary was added , False for a duplicate.
+        """
+        now_text = datetime.now().isoformat()
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(
+                """
+                INSERT OR IGNORE INTO meeting_summaries
+                    (summary_key, channel_id, message_ts, summary_text, status, attempts, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, 'pending', 0, ?, ?, ?)
+                """,
+                (summary_key, channel_id, message_ts, summary_text, time.time(), now_text, now_text)
+            )
+            return cursor.rowcount == 1
+
+    def claim(self, lease_owner):
+        """
+        Claims the oldest summary which is due , or whose previous lease ran out.
+
+        Returns:
+            dict: {"summary_key", "summary_text", "channel_id", "message_ts", "attempts"} , or None when nothing is due.
+        """
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    """
+                    SELECT summary_key, summary_text, channel_id, message_ts, attempts FROM meeting_summaries
+                    WHERE (status = 'pending' AND available_at <= ?) OR (status = 'processing' AND leased_until < ?)
+                    ORDER BY available_at LIMIT 1
+                    """,
+                    (now, now)
+                ).fetchone()
+                if row is None:
+                    connection.execute("COMMIT")
+                    return None
+                connection.execute(
+                    """
+                    UPDATE meeting_summaries
+                    SET status = 'processing', attempts = attempts + 1, lease_owner = ?, leased_until = ?, updated_at = ?
+                    WHERE summary_key = ?
+                    """,
+                    (lease_owner, now + self.lease_seconds, datetime.now().isoformat(), row[0])
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return {"summary_key": row[0], "summary_text": row[1], "channel_id": row[2], "message_ts": row[3], "attempts": row[4] + 1}
+
+    def _update_claimed(self, summary_key, lease_owner, set_clause, values):
+        # Only the current lease owner may change a claimed row , a worker whose lease was taken over is ignored
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(
+                f"UPDATE meeting_summaries SET {set_clause}, updated_at = ? WHERE summary_key = ? AND lease_owner = ? AND status = 'processing'",
+                (*values, datetime.now().isoformat(), summary_key, lease_owner)
+            )
+            return cursor.rowcount == 1
+
+    def renew_lease(self, summary_key, lease_owner):
+        return self._update_claimed(summary_key, lease_owner, "leased_until = ?", (time.time() + self.lease_seconds,))
+
+    def ack(self, summary_key, lease_owner, result=None):
+        """Marks the summary as processed , it is never handed out again. `result` is stored as JSON."""
+        result_json = json.dumps(result, default=str) if result is not None else None
+        return self._update_claimed(
+            summary_key, lease_owner,
+            "status = 'done', leased_until = NULL, last_error = NULL, result_json = ?", (result_json,)
+        )
+
+    def get_result(self, summary_key):
+        """Returns the stored result of a processed summary , None when it has none (yet)."""
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT result_json FROM meeting_summaries WHERE summary_key = ?", (summary_key,)).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def fail(self, summary_key, lease_owner, error_text):
+        """Schedules a retry with exponential backoff , or dead letters the summary after `max_attempts`."""
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT attempts FROM meeting_summaries WHERE summary_key = ?", (summary_key,)).fetchone()
+        attempts = row[0] if row else self.max_attempts
+        if attempts >= self.max_attempts:
+            print(f"☠️ Meeting summary {summary_key} failed {attempts} times , moved to dead letter: {error_text}")
+            return self._update_claimed(summary_key, lease_owner, "status = 'dead', leased_until = NULL, last_error = ?", (error_text,))
+        retry_in_seconds = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)))
+        print(f"🔁 Meeting summary {summary_key} failed (attempt {attempts}) , retrying in {retry_in_seconds:.0f} seconds: {error_text}")
+        return self._update_claimed(
+            summary_key, lease_owner,
+            "status = 'pending', available_at = ?, leased_until = NULL, last_error = ?",
+            (time.time() + retry_in_seconds, error_text)
+        )
+
+    def requeue_dead(self, summary_key=None):
+        """Moves dead lettered summaries (all , or the given one) back to pending with fresh attempts."""
+        query = "UPDATE meeting_summaries SET status = 'pending', attempts = 0, available_at = ?, updated_at = ? WHERE status = 'dead'"
+        values = [time.time(), datetime.now().isoformat()]
+        if summary_key is not None:
+            query += " AND summary_key = ?"
+            values.append(summary_key)
+        with closing(self._connect()) as connection:
+            return connection.execute(query, values).rowcount
+
+    def get_counts(self):
+        """Returns the number of summaries per status."""
+        with closing(self._connect()) as connection:
+            return dict(connection.execute("SELECT status, COUNT(*) FROM meeting_summaries GROUP BY status").fetchall())
+
+    #####  Workers  #####
+
+    async def _renew_lease_periodically(self, summary_key, lease_owner):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(self.renew_lease, summary_key, lease_owner)
+
+    async def _run_worker(self, worker_number, handle_summary, poll_interval_seconds, stop_when_empty):
+        lease_owner = f"{os.getpid()}-{worker_number}-{uuid.uuid4().hex[:8]}"
+        # SQLite calls block (up to the 30 second busy timeout under contention) , so they run in worker threads
+        while True:
+            claimed_summary = await asyncio.to_thread(self.claim, lease_owner)
+            if claimed_summary is None:
+                if stop_when_empty:
+                    return
+                await asyncio.sleep(poll_interval_seconds)
+                continue
+
+            summary_key = claimed_summary["summary_key"]
+            print(f"📥 Worker {worker_number} processing meeting summary {summary_key} (attempt {claimed_summary['attempts']})")
+            lease_renewal_task = asyncio.create_task(self._renew_lease_periodically(summary_key, lease_owner))
+            try:
+                handler_result = handle_summary(claimed_summary["summary_text"])
+                if inspect.isawaitable(handler_result):
+                    handler_result = await handler_result
+            except Exception as e:
+                await asyncio.to_thread(self.fail, summary_key, lease_owner, f"{type(e).__name__}: {e}")
+            else:
+                await asyncio.to_thread(self.ack, summary_key, lease_owner, handler_result)
+                print(f"✅ Meeting summary {summary_key} processed")
+            finally:
+                lease_renewal_task.cancel()
+
+    async def run_workers(self, handle_summary, worker_count=MEETING_INGESTION_WORKERS, poll_interval_seconds=5.0, stop_when_empty=False):
+        """
+        Runs `worker_count` workers which pass queued summaries to `handle_summary` (sync or async).
+
+        Args:
+            handle_summary (callable): Called with the summary text , e.g. `myAgentInvokation`. Raising marks the attempt failed,
+                its return value is stored with the ack.
+            worker_count (int): Summaries processed at the same time.
+            poll_interval_seconds (float): Wait between two claims while the queue is empty.
+            stop_when_empty (bool): Return once nothing is due , instead of waiting for new summaries.
+        """
+        async with asyncio.TaskGroup() as task_group:
+            for worker_number in range(worker_count):
+                task_group.create_task(self._run_worker(worker_number, handle_summary, poll_interval_seconds, stop_when_empty))
+
+
+# Single queue shared by the Slack listener and the agent workers
+meeting_ingestion_queue = MeetingIngestionQueue(os.getenv("MEETING_INGESTION_QUEUE_DIR", ".ingestion_queue"))
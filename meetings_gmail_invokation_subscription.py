@@ -1,51 +1,133 @@
-from flask import Flask, request, jsonify
+import os
 import base64
+import asyncio
+import binascii
+from contextlib import asynccontextmanager
 from bs4 import BeautifulSoup
-import json
+from fastapi import FastAPI, Body
+from fastapi.responses import JSONResponse
+from dotenv import load_dotenv
+from meeting_ingestion_queue import MeetingIngestionQueue
+
+load_dotenv()
+
+GMAIL_WEBHOOK_HOST = os.getenv("GMAIL_WEBHOOK_HOST", "0.0.0.0")
+GMAIL_WEBHOOK_PORT = int(os.getenv("GMAIL_WEBHOOK_PORT", "5000"))
+# uvicorn worker processes , they share the SQLite queue so each message is processed once
+GMAIL_WEBHOOK_WORKERS = int(os.getenv("GMAIL_WEBHOOK_WORKERS", "4"))
+# Background link extraction workers per process
+GMAIL_LINK_EXTRACTION_WORKERS = int(os.getenv("GMAIL_LINK_EXTRACTION_WORKERS", "2"))
+# Wait before the extraction workers are started again after they crashed
+GMAIL_LINK_EXTRACTION_RESTART_SECONDS = float(os.getenv("GMAIL_LINK_EXTRACTION_RESTART_SECONDS", "5"))
+
+# Pub/Sub push messages , deduped on their messageId and processed in the background
+gmail_push_queue = MeetingIngestionQueue(
+    os.getenv("MEETING_INGESTION_QUEUE_DIR", ".ingestion_queue"),
+    db_file_name="gmail_push_messages.sqlite3"
+)
 
-app = Flask(__name__)
 
 def extract_links(email_body):
     """Extracts all links from an email body."""
     soup = BeautifulSoup(email_body, "html.parser")
     links = soup.find_all("a")
-    
+
     link_dict = {}
     for link in links:
         link_text = link.get_text(strip=True)
         link_url = link.get("href")
         if link_text and link_url:
             link_dict[link_text] = link_url
-    
+
     return link_dict
 
-@app.route('/email-webhook', methods=['POST'])
-def email_webhook():
-    """Handles incoming email notifications from Google Pub/Sub."""
+
+def decode_and_extract_links(message_data):
+    """Decodes the base64 Pub/Sub payload and extracts the links of the email body."""
+    email_body = base64.urlsafe_b64decode(message_data).decode("utf-8")
+    return extract_links(email_body)
+
+
+async def process_email_message(message_data):
+    # Decoding and HTML parsing are CPU work , run off the event loop so the webhook keeps answering
+    extracted_links = await asyncio.to_thread(decode_and_extract_links, message_data)
+    print(f"🔗 Extracted {len(extracted_links)} links from email: {extracted_links}")
+    # Stored on the message's queue row with the ack , read back with gmail_push_queue.get_result(message_id)
+    return extracted_links
+
+
+# Background link extraction of this process , restarted whenever it stops unexpectedly
+extraction_state = {"task": None, "stopping": False}
+
+
+def start_extraction_task():
+    if extraction_state["stopping"]:
+        return
+    extraction_task = asyncio.create_task(
+        gmail_push_queue.run_workers(process_email_message, worker_count=GMAIL_LINK_EXTRACTION_WORKERS, poll_interval_seconds=1.0)
+    )
+    extraction_task.add_done_callback(on_extraction_task_done)
+    extraction_state["task"] = extraction_task
+
+
+def on_extraction_task_done(extraction_task):
+    if extraction_state["stopping"] or extraction_task.cancelled():
+        return
+    print(
+        f"❌ Link extraction workers stopped ({extraction_task.exception()!r}) , "
+        f"restarting them in {GMAIL_LINK_EXTRACTION_RESTART_SECONDS} seconds"
+    )
+    asyncio.get_running_loop().call_later(GMAIL_LINK_EXTRACTION_RESTART_SECONDS, start_extraction_task)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Every uvicorn worker runs its own extraction workers , claims on the shared queue keep them apart
+    extraction_state["stopping"] = False
+    start_extraction_task()
+    yield
+    extraction_state["stopping"] = True
+    extraction_task = extraction_state["task"]
+    if extraction_task is not None:
+        extraction_task.cancel()
+        # Waiting for the workers to unwind , a message cut off mid extraction is claimed again once its lease runs out
+        await asyncio.gather(extraction_task, return_exceptions=True)
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.post("/email-webhook")
+async def email_webhook(data: dict = Body(default=None)):
+    """
+    Handles incoming email notifications from Google Pub/Sub.
+
+    Only validates the push and queues it , link extraction runs in the background. Pub/Sub
+    redelivers a message until it gets a 2xx , so a repeated `messageId` is answered 200 without
+    being queued again.
+    """
+    # 🔹 Validate the Pub/Sub push envelope
+    if not data or not isinstance(data.get("message"), dict):
+        return JSONResponse({"error": "Invalid request"}, status_code=400)
+
+    message = data["message"]
+    message_data = message.get("data")
+    if not message_data:
+        return JSONResponse({"error": "No email body received"}, status_code=400)
     try:
-        # 🔹 Parse incoming JSON data
-        data = request.get_json()
-        
-        if not data or "message" not in data:
-            return jsonify({"error": "Invalid request"}), 400
-
-        # 🔹 Decode the Pub/Sub message payload
-        message_data = data["message"].get("data")
-        if not message_data:
-            return jsonify({"error": "No email body received"}), 400
-        
-        email_body = base64.urlsafe_b64decode(message_data).decode("utf-8")
-
-        # 🔹 Extract links from the email body
-        extracted_links = extract_links(email_body)
-
-        return jsonify({
-            "status": "success",
-            "extracted_links": extracted_links
-        }), 200
-    
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        base64.urlsafe_b64decode(message_data)
+    except (binascii.Error, ValueError, TypeError):
+        return JSONResponse({"error": "Message data is not base64"}, status_code=400)
+
+    message_id = message.get("messageId") or message.get("message_id")
+    if not message_id:
+        return JSONResponse({"error": "No messageId received"}, status_code=400)
+
+    # 🔹 Queue for background link extraction , a duplicate push is acknowledged as well
+    newly_queued = await asyncio.to_thread(gmail_push_queue.enqueue, message_id, message_data)
+    return JSONResponse({"status": "queued" if newly_queued else "duplicate", "message_id": message_id}, status_code=200)
+
 
 if __name__ == '__main__':
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    import uvicorn
+    uvicorn.run("meetings_gmail_invokation_subscription:app", host=GMAIL_WEBHOOK_HOST, port=GMAIL_WEBHOOK_PORT, workers=GMAIL_WEBHOOK_WORKERS)
@@ -10,8 +10,17 @@ import logging
 import sys
 import re
 from datetime import datetime
+import concurrent.futures
+import sqlite3
+import asyncio
+from urllib.parse import unquote
 import os
 from dotenv import load_dotenv
+from notion_block_cache import NotionBlockTreeCache
+from notion_database_mirror import NotionDatabaseMirror
+from embedding_index import EmbeddingIndex
+from llm_output_parser import parse_llm_output, PageChanges
+from notion_http_client import notion_http
 
 
 logging.basicConfig(
@@ -31,18 +40,29 @@ NOTION_API_KEY = os.getenv("NOTION_API_KEY")
 # Initialize the Notion client
 notion = Client(auth=NOTION_API_KEY)
 
+# On-disk cache of fetched page block trees , re-crawls only subtrees whose last_edited_time moved
+notion_block_tree_cache = NotionBlockTreeCache(os.getenv("NOTION_BLOCK_CACHE_DIR", ".notion_cache"))
+
+
+# Marks the cached children lists touched by a write to the given block as stale , called after every successful write.
+# Notion rounds last_edited_time to the minute , so an edit made in the same minute as the last fetch
+# would otherwise leave the stale children in the cache. Block types stay cached for the next edits.
+# A cache failure is only logged , the write itself already succeeded
+def mark_cached_block_stale(block_id):
+    try:
+        notion_block_tree_cache.mark_block_stale(block_id)
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not mark block {block_id} stale in the block tree cache: {e}")
+
 async def validate_notion_page(notion_page_id):
     """
     Checks if the given Notion Page ID is valid and accessible.
     Returns True if valid, else False.
     """
     url = f"https://api.notion.com/v1/pages/{notion_page_id}"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Notion-Version": "2022-06-28"
-    }
 
-    response = requests.get(url, headers=headers)
+    # Running blocking request in a worker thread , so the event loop of the caller is not stalled
+    response = await asyncio.to_thread(notion_http.get, url)
     
     if response.status_code == 200:
         return True  # ✅ Notion Page is valid
@@ -54,36 +74,63 @@ async def validate_notion_page(notion_page_id):
 
 
 
+# Generator which yields every child block of given block , following `next_cursor` pagination
+def iterate_block_children(parent_block_id, page_size=100):
+    """
+    Yields the child blocks of a Notion block page by page, following `has_more` / `next_cursor`.
+
+    Only one page of results (at most `page_size` blocks) is held at a time, so very long
+    pages can be streamed without keeping every raw JSON response in memory.
+
+    Args:
+        parent_block_id (str): The Notion Page Id or Block Id whose children should be listed.
+        page_size (int): Number of blocks requested per call (Notion allows at most 100).
+
+    Yields:
+        dict: Each child block object as returned by the Notion API.
+
+    Raises:
+        requests.RequestException: If any page of children could not be fetched.
+    """
+    url_to_get_children = f"https://api.notion.com/v1/blocks/{parent_block_id}/children"
+    params = {"page_size": page_size}
+
+    while True:
+        response = notion_http.get(url_to_get_children, params=params)
+        response.raise_for_status()
+        children_page_json_data = response.json()
+
+        for each_block in children_page_json_data.get("results", []):
+            yield each_block
+
+        if not children_page_json_data.get("has_more"):
+            break
+        params["start_cursor"] = children_page_json_data.get("next_cursor")
+
+
+# Helper Function to get plain text of a block from its rich_text list
+def extract_block_text(block):
+    object_type = block.get("type")
+    object_data = block.get(object_type, {})
+    rich_text_list = object_data.get("rich_text", []) if isinstance(object_data, dict) else []
+    return "".join([text_item["text"]["content"] for text_item in rich_text_list if "text" in text_item])
+
+
 # Helper Function to get Notion Content because it is recursive
 def fetch_content_by_given_block_page_id_helper_func(parent_page_id, number_stack=None, level=0):
     if number_stack is None:
         number_stack = []
 
-    url_to_get_all_content = f"https://api.notion.com/v1/blocks/{parent_page_id}/children"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
-
     try:
-        response = requests.get(url_to_get_all_content, headers=headers)
-        response.raise_for_status()
+        results_list = list(iterate_block_children(parent_page_id))
     except requests.RequestException as e:
         return [f"{'.'.join(map(str, number_stack))} Data not fetched for ObjectId {parent_page_id}"]
 
-    page_content_json_data = response.json()
-    results_list = page_content_json_data.get("results", [])
-
     over_all_data = []
 
     for index, each_result in enumerate(results_list, start=1):
-        object_type = each_result.get("type")
         has_children = each_result.get("has_children", False)
-        object_data = each_result.get(object_type, {})
-        rich_text_list = object_data.get("rich_text", [])
-
-        text_data = "".join([text_item["text"]["content"] for text_item in rich_text_list if "text" in text_item])
+        text_data = extract_block_text(each_result)
 
         # Update the numbering stack for this level
         if len(number_stack) > level:
@@ -104,15 +151,160 @@ def fetch_content_by_given_block_page_id_helper_func(parent_page_id, number_stac
     return over_all_data
 
 
+# Max number of `/blocks/{id}/children` requests kept in flight while crawling one page
+MAX_CONCURRENT_BLOCK_FETCHES = int(os.getenv("NOTION_MAX_CONCURRENT_BLOCK_FETCHES", "8"))
+
+# Helper Function to get direct children of one block , returns None when fetching failed
+def fetch_block_children_list(parent_block_id):
+    try:
+        return [summarize_block_for_tree(each_block) for each_block in iterate_block_children(parent_block_id)]
+    except requests.RequestException as e:
+        return None
+
+
+# Only id , type , text , has_children and last_edited_time are kept for each block instead of the raw JSON
+def summarize_block_for_tree(block):
+    return {
+        "id": block["id"],
+        "type": block.get("type"),
+        "text": extract_block_text(block),
+        "has_children": block.get("has_children", False),
+        "last_edited_time": block.get("last_edited_time")
+    }
+
+
+# Generator which renders a fetched block tree in document order with hierarchy numbering
+# children_by_parent_id :- parent_block_id -> list of summarized child blocks (None if fetching failed)
+def render_block_tree_lines(children_by_parent_id, parent_block_id, number_stack=None):
+    if number_stack is None:
+        number_stack = []
+
+    children_list = children_by_parent_id.get(parent_block_id)
+    if children_list is None:
+        yield f"{'.'.join(map(str, number_stack))} Data not fetched for ObjectId {parent_block_id}"
+        return
+
+    for index, each_child in enumerate(children_list, start=1):
+        child_number_stack = number_stack + [index]
+        hierarchy_number = ".".join(map(str, child_number_stack))
+
+        if each_child["text"]:
+            yield f"{hierarchy_number} - {each_child['text']} {{id: {each_child['id']}}}"
+
+        if each_child["has_children"]:
+            yield from render_block_tree_lines(children_by_parent_id, each_child["id"], child_number_stack)
+
+
+# Helper Function to get last_edited_time of a page or block , returns None when fetching failed
+def retrieve_notion_block_last_edited_time(blockId):
+    url_to_get_object = f"https://api.notion.com/v1/blocks/{blockId}"
+    try:
+        response = notion_http.get(url_to_get_object)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        return None
+    return response.json().get("last_edited_time")
+
+
+# Helper Function to get Notion Content level by level , children of one level are fetched concurrently
+def fetch_content_by_given_block_page_id_concurrently(parent_page_id, max_workers=MAX_CONCURRENT_BLOCK_FETCHES, block_tree_cache=None):
+    """
+    Crawls the block tree of a Notion page breadth-first and renders it in the same
+    "1.2.3 - text {id: ...}" format as `fetch_content_by_given_block_page_id_helper_func`.
+
+    Every block which has children on the current level is fetched through a bounded
+    thread pool, so a page costs one round of requests per nesting level instead of
+    one sequential request per parent block.
+
+    Args:
+        parent_page_id (str): The Notion Page Id (or Block Id) whose content should be fetched.
+        max_workers (int): Maximum number of concurrent requests to the Notion API.
+        block_tree_cache (NotionBlockTreeCache): Optional cache , when given only the subtrees
+            whose parent's `last_edited_time` moved since the last fetch are re-crawled.
+
+    Returns:
+        list[str]: Lines of the page in document order, same as the recursive helper.
+    """
+    return list(iterate_content_lines_by_given_block_page_id(parent_page_id, max_workers, block_tree_cache))
+
+
+# Copies cached children of an unchanged parent into children_by_parent_id , cached descendants which can not be reused are added to missing_parent_ids
+# Shared by the sync crawler below and `fetch_notion_page_content_async`
+def reuse_cached_children(cached_page_tree, children_by_parent_id, last_edited_time_by_parent_id,
+                          parent_block_id, current_last_edited_time, missing_parent_ids):
+    cached_entry = cached_page_tree.get(parent_block_id)
+    if current_last_edited_time is None or cached_entry is None or cached_entry["last_edited_time"] != current_last_edited_time:
+        return False
+
+    children_by_parent_id[parent_block_id] = cached_entry["children"]
+    for each_child in cached_entry["children"]:
+        if each_child["has_children"]:
+            last_edited_time_by_parent_id[each_child["id"]] = each_child["last_edited_time"]
+            if not reuse_cached_children(cached_page_tree, children_by_parent_id, last_edited_time_by_parent_id,
+                                         each_child["id"], each_child["last_edited_time"], missing_parent_ids):
+                missing_parent_ids.append(each_child["id"])
+    return True
+
+
+# Builds the `save_page_tree` argument of a crawl , failed parents are not stored so they are fetched again next time
+def build_page_tree_to_save(children_by_parent_id, last_edited_time_by_parent_id):
+    return {
+        each_parent_id: {
+            "last_edited_time": last_edited_time_by_parent_id.get(each_parent_id),
+            "children": children_list
+        }
+        for each_parent_id, children_list in children_by_parent_id.items() if children_list is not None
+    }
+
+
+# Generator version of above , yields rendered lines one by one in document order
+def iterate_content_lines_by_given_block_page_id(parent_page_id, max_workers=MAX_CONCURRENT_BLOCK_FETCHES, block_tree_cache=None):
+    # parent_block_id -> list of child blocks (None if request failed)
+    children_by_parent_id = {}
+    # parent_block_id -> last_edited_time of the parent when its children were read
+    last_edited_time_by_parent_id = {}
+    cached_page_tree = {}
+
+    if block_tree_cache is not None:
+        cached_page_tree = block_tree_cache.load_page_tree(parent_page_id)
+        last_edited_time_by_parent_id[parent_page_id] = retrieve_notion_block_last_edited_time(parent_page_id)
+
+    def reuse_cached_children_of(parent_block_id, current_last_edited_time, missing_parent_ids):
+        return reuse_cached_children(cached_page_tree, children_by_parent_id, last_edited_time_by_parent_id,
+                                     parent_block_id, current_last_edited_time, missing_parent_ids)
+
+    current_level_parent_ids = []
+    if not reuse_cached_children_of(parent_page_id, last_edited_time_by_parent_id.get(parent_page_id), current_level_parent_ids):
+        current_level_parent_ids = [parent_page_id]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while current_level_parent_ids:
+            fetched_children_lists = executor.map(fetch_block_children_list, current_level_parent_ids)
+            next_level_parent_ids = []
+            for each_parent_id, children_list in zip(current_level_parent_ids, fetched_children_lists):
+                children_by_parent_id[each_parent_id] = children_list
+                for each_child in children_list or []:
+                    if each_child["has_children"]:
+                        last_edited_time_by_parent_id[each_child["id"]] = each_child["last_edited_time"]
+                        if not reuse_cached_children_of(each_child["id"], each_child["last_edited_time"], next_level_parent_ids):
+                            next_level_parent_ids.append(each_child["id"])
+            current_level_parent_ids = next_level_parent_ids
+
+    if block_tree_cache is not None:
+        block_tree_cache.save_page_tree(parent_page_id, build_page_tree_to_save(children_by_parent_id, last_edited_time_by_parent_id))
+
+    yield from render_block_tree_lines(children_by_parent_id, parent_page_id)
+
+
 @tool   # It requires Notion PageId
 def fetch_notion_page_content(notion_page_id_info: dict):
     """
     Fetches content from a Notion page using the provided dictionary containing the Notion Page ID.
 
     This function extracts block content from a Notion page by retrieving the "notion_page_id" 
-    from the input dictionary. It utilizes a helper function for recursive fetching to handle 
-    hierarchical content efficiently. The extracted content is then formatted into a single 
-    string, with each point separated by a newline.
+    from the input dictionary. It utilizes a helper function which fetches the block tree level by 
+    level with concurrent requests to handle hierarchical content efficiently. The extracted content 
+    is then formatted into a single string, with each point separated by a newline.
 
     Args:
         notion_page_id_info (dict): A dictionary which contains below keys
@@ -123,24 +315,26 @@ def fetch_notion_page_content(notion_page_id_info: dict):
              with each point separated by a newline.
     """
     NOTION_PAGE_ID = notion_page_id_info.get("notion_page_id")
-    all_content_list = fetch_content_by_given_block_page_id_helper_func(NOTION_PAGE_ID)
-    over_all_content_list_from_notion_page = "\n".join(all_content_list)
+    all_content_lines = iterate_content_lines_by_given_block_page_id(NOTION_PAGE_ID, block_tree_cache=notion_block_tree_cache)
+    over_all_content_list_from_notion_page = "\n".join(all_content_lines)
     return over_all_content_list_from_notion_page
 
 
 
 
 # Helper Fucntion to just retrieve type of block from given blockId
+# Type is taken from the block tree cache (filled by fetch_notion_page_content) , GET is sent only on a cache miss
 def retrieve_notion_block_type(blockId):
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
+    cached_block_info = notion_block_tree_cache.lookup_block(blockId)
+    if cached_block_info and cached_block_info.get("type"):
+        print(f"🟢🟢🟢 Found Object Type in cache , Object Type is {cached_block_info['type']} 🟢🟢🟢")
+        return cached_block_info["type"]
+
+    object_type = ""
     url_to_get_object = f"https://api.notion.com/v1/blocks/{blockId}"
     try:
         print("⌛⌛ Getting Object , Please wait ⌛⌛")
-        obj_response = requests.get(url_to_get_object , headers=headers)
+        obj_response = notion_http.get(url_to_get_object)
         print("🟢🟢🟢 Object Arrived , Got Response 🟢🟢🟢")
         response_data_json = obj_response.json()
         object_type = response_data_json.get("type" , "")
@@ -165,7 +359,7 @@ def append_bulleted_list_to_block(adding_content_info: dict):
         - bullet_points_list (list[str]): A list of bullet points (strings) to be added as child blocks.
 
     Process:
-    1. Determines the object type of the given `blockId` (though not actively used in the request).
+    1. Looks up the object type of the given `blockId` in the block tree cache (only used for logging , no request is sent).
     2. Constructs a payload with bullet points as `bulleted_list_item` blocks.
     3. Sends a PATCH request to the Notion API to add the content.
     4. Validates the response and prints success or failure messages.
@@ -176,13 +370,14 @@ def append_bulleted_list_to_block(adding_content_info: dict):
     - Error handling ensures the function logs failure details if the API request fails.
 
     Returns:
-        None: The function prints logs indicating success or failure.
+        bool: True if the bullet points were added , otherwise False. Logs are printed as well.
  
     """
     blockId = adding_content_info.get('blockId')
     bullet_points_list = adding_content_info.get('bullet_points_list')
 
-    block_type = retrieve_notion_block_type(blockId)
+    cached_block_info = notion_block_tree_cache.lookup_block(blockId)
+    block_type = cached_block_info.get("type") if cached_block_info else "unknown"
 
     # logging.info("Preparing Payload to add content to ObjectId: %s", objectId)
     print(f"Preparing Payload to add content to ObjectId: {blockId}")
@@ -204,27 +399,27 @@ def append_bulleted_list_to_block(adding_content_info: dict):
     # logging.info("Payload Prepared: %s", data)
     print(f"Payload Prepared: {data}")
 
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url_to_add_text = f"https://api.notion.com/v1/blocks/{blockId}/children"
 
     # logging.info("Sending request to add content to Notion...")
     print("Sending request to add content to Notion...")
 
     try:
-        response = requests.patch(url_to_add_text, headers=headers, json=data)
-        if response.status_code == 200:
-            # logging.info("✅ Data successfully added to %s with object-type %s", blockId, block_type)
-            print(f"✅ Data successfully added to {blockId} with object-type {block_type}")
-        else:
-            print(f"❌ Failed to add data. Status Code: {response.status_code}, Response: {response.text}")
-            # logging.error("❌ Failed to add data. Status Code: %d, Response: %s", response.status_code, response.text)
+        response = notion_http.patch(url_to_add_text, json=data)
     except Exception as e:
         # logging.exception("🚨 Error occurred while adding content to %s: %s", blockId, str(e))
         print(f"🚨 Error occurred while adding content to {blockId}: {str(e)}")
+        return False
+
+    if response.status_code == 200:
+        # logging.info("✅ Data successfully added to %s with object-type %s", blockId, block_type)
+        print(f"✅ Data successfully added to {blockId} with object-type {block_type}")
+        mark_cached_block_stale(blockId)
+        return True
+    else:
+        print(f"❌ Failed to add data. Status Code: {response.status_code}, Response: {response.text}")
+        # logging.error("❌ Failed to add data. Status Code: %d, Response: %s", response.status_code, response.text)
+        return False
 
 # append_bulleted_list_to_block.invoke(input = {"adding_content_info" : {"blockId": block_id, "list_of_bullet_points": [content]}})
 
@@ -258,11 +453,6 @@ def append_Toggle_to_Notion_page_By_using_first_child_id(NOTION_PAGE_ID, toggle_
     """
 
     url_to_add_toggle_Item_as_children = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     payload_to_add_Toggle_Element = {
         "children": [
@@ -288,14 +478,13 @@ def append_Toggle_to_Notion_page_By_using_first_child_id(NOTION_PAGE_ID, toggle_
     try:
         # logging.info(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
         print(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
-        response = requests.patch(url_to_add_toggle_Item_as_children, headers=headers, json=payload_to_add_Toggle_Element)
+        response = notion_http.patch(url_to_add_toggle_Item_as_children, json=payload_to_add_Toggle_Element)
         response_json_data = response.json()
 
         if response.status_code == 200:
             toggle_block_id = response_json_data["results"][0]["id"]
             # logging.info(f"🟢 Toggle Item added successfully! Toggle ID: {toggle_block_id}")
             print(f"🟢 Toggle Item added successfully! Toggle ID: {toggle_block_id}")
-            return toggle_block_id
         else:
             # logging.error(f"🔴 Failed to add toggle item. Status Code: {response.status_code}")
             print(f"🔴 Failed to add toggle item. Status Code: {response.status_code}")
@@ -307,6 +496,9 @@ def append_Toggle_to_Notion_page_By_using_first_child_id(NOTION_PAGE_ID, toggle_
         # logging.exception("🔴 Exception occurred while adding a toggle item")
         print("🔴 Exception occurred while adding a toggle item")
         return ""
+
+    mark_cached_block_stale(NOTION_PAGE_ID)
+    return toggle_block_id
     
 @tool   # For adding a new Toggle Item with Bullet-points in list  used for adding Change Log
 def append_toggle_with_bullets_for_change_log(adding_toggle_item_info: dict):
@@ -360,15 +552,10 @@ def append_toggle_with_bullets_for_change_log(adding_toggle_item_info: dict):
     print("🧑‍🏭 Initiating toggle item addition. Fetching first child object ID from the given Notion page ID.")
 
     url_to_fetch_first_children = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children?page_size=1"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     # logging.info("⌛ Requesting to get the first child data...")
     print("⌛ Requesting to get the first child data...")
-    response = requests.get(url_to_fetch_first_children, headers=headers)
+    response = notion_http.get(url_to_fetch_first_children)
     # logging.info("🟩 Response received.")
     print("🟩 Response received.")
     first_block_id = None
@@ -427,7 +614,7 @@ def update_block_content(updating_block_info: dict):
         - blockId (str): The unique ID of the Notion block to be updated.
         - new_text_content (str): The new text content that will replace the existing content.
 
-    If successful, a confirmation message is printed. Otherwise, an error message is shown.
+    If successful, a confirmation message is printed and True is returned. Otherwise, an error message is shown and False is returned.
 
     Example usage:
     update_block_content.invoke({
@@ -445,11 +632,6 @@ def update_block_content(updating_block_info: dict):
     print(f"Retrieving Notion block type for object ID: {objectId}")
     
     url_to_update_block = f"https://api.notion.com/v1/blocks/{objectId}"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     
     # logging.info("Preparing payload to update block content.")
     print("Preparing payload to update block content.")
@@ -467,19 +649,23 @@ def update_block_content(updating_block_info: dict):
     # logging.info("Sending request to update Notion block content...")
     print("Sending request to update Notion block content...")
     try:
-        response = requests.patch(url_to_update_block, headers=headers, json=data)
-        
-        if response.status_code == 200:
-            # logging.info(f"Content successfully updated in block {objectId}.")
-            print(f"Content successfully updated in block {objectId}.")
-        else:
-            # logging.error(f"Failed to update content. Status code: {response.status_code}")
-            print(f"Failed to update content. Status code: {response.status_code}")
-            # logging.error(f"Response: {response.text}")
-            print(f"Response: {response.text}")
+        response = notion_http.patch(url_to_update_block, json=data)
     except Exception as e:
         # logging.exception(f"Error occurred while updating content in block {objectId}.")
         print(f"Error occurred while updating content in block {objectId}.")
+        return False
+
+    if response.status_code == 200:
+        # logging.info(f"Content successfully updated in block {objectId}.")
+        print(f"Content successfully updated in block {objectId}.")
+        mark_cached_block_stale(objectId)
+        return True
+    else:
+        # logging.error(f"Failed to update content. Status code: {response.status_code}")
+        print(f"Failed to update content. Status code: {response.status_code}")
+        # logging.error(f"Response: {response.text}")
+        print(f"Response: {response.text}")
+        return False
 
 # @tool
 # def addNum(inputDict : dict):
@@ -543,63 +729,235 @@ def delete_block(deleting_block_info: dict):
     block_id = deleting_block_info.get("blockId")
     url_to_delete_block = f"https://api.notion.com/v1/blocks/{block_id}"
 
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     payload = {"archived": True}
 
     try:
         print("⌛ Request to delete Block is initiated")
-        response = requests.patch(url_to_delete_block, headers=headers, json=payload)
+        response = notion_http.patch(url_to_delete_block, json=payload)
         response_json = response.json()
-
-        if response.status_code == 200:
-            print(f"✅ Block {block_id} deleted successfully!")
-            return True
-        else:
-            print(f"❌ Failed to delete block {block_id}. API Response: {response_json}")
-            return False
-
     except Exception as e:
         print("❌ Exception occurred while deleting the block")
         return False
+
+    if response.status_code == 200:
+        print(f"✅ Block {block_id} deleted successfully!")
+        mark_cached_block_stale(block_id)
+        return True
+    else:
+        print(f"❌ Failed to delete block {block_id}. API Response: {response_json}")
+        return False
     
 # delete_block.invoke(input = {"deleting_block_info" : {"blockId": block_id}}) 
 
+#####################################################################################################
+# Generic Database Query , used by every database table reader below
+
+# database_id -> {property_name: property_id} , filled once per database by resolve_database_property_ids
+database_property_ids_cache = dict()
+
+def resolve_database_property_ids(database_id, property_names):
+    """
+    Maps property names to the property ids expected by the `filter_properties` query parameter.
+    The database schema is fetched once per database and kept in `database_property_ids_cache`.
+    Names which are not found in the schema are passed through as they are.
+    """
+    if database_id not in database_property_ids_cache:
+        response = notion_http.get(f"https://api.notion.com/v1/databases/{database_id}")
+        response.raise_for_status()
+        # Ids come URL-encoded (e.g. "a%3Fb") , unquoting them since requests encodes query params again
+        database_property_ids_cache[database_id] = {
+            property_name: unquote(property_schema.get("id", ""))
+            for property_name, property_schema in response.json().get("properties", {}).items()
+        }
+    property_ids = database_property_ids_cache[database_id]
+    return [property_ids.get(each_property_name) or each_property_name for each_property_name in property_names]
+
+
+# Generator which yields every row of a database query , following `next_cursor` pagination
+def iterate_database_rows(database_id, filter=None, sorts=None, filter_properties=None, page_size=100):
+    """
+    Yields the rows (page objects) of a Notion database query page by page, following `has_more` / `next_cursor`.
+
+    Args:
+        database_id (str): The Notion Database Id to query.
+        filter (dict): Optional Notion filter object , applied on the server.
+        sorts (list[dict]): Optional Notion sort objects , applied on the server.
+        filter_properties (list[str]): Optional property names , only these columns are sent back for each row.
+        page_size (int): Number of rows requested per call (Notion allows at most 100).
+
+    Yields:
+        dict: Each row (page object) as returned by the Notion API.
+
+    Raises:
+        requests.RequestException: If any page of rows could not be fetched.
+
+    Example Usage:
+        for row in iterate_database_rows(database_id, filter={"property": "happened_date", "rich_text": {"is_not_empty": True}}):
+            meeting_name = extract_property_value(row["properties"], "meeting_name")
+    """
+    url = f"https://api.notion.com/v1/databases/{database_id}/query"
+    params = None
+    if filter_properties:
+        params = [("filter_properties", each_property_id) for each_property_id in resolve_database_property_ids(database_id, filter_properties)]
+
+    payload = {"page_size": page_size}
+    if filter:
+        payload["filter"] = filter
+    if sorts:
+        payload["sorts"] = sorts
+
+    while True:
+        response = notion_http.post(url, params=params, json=payload)
+        response.raise_for_status()
+        rows_page_json_data = response.json()
+
+        for each_row in rows_page_json_data.get("results", []):
+            yield each_row
+
+        if not rows_page_json_data.get("has_more"):
+            break
+        payload["start_cursor"] = rows_page_json_data.get("next_cursor")
+
+
+# Helper Function to get plain text of a rich_text / title list , long values are split into several items by Notion
+def extract_rich_text_plain_text(rich_text_list):
+    return "".join(
+        text_item.get("plain_text") or text_item.get("text", {}).get("content", "")
+        for text_item in rich_text_list or []
+    )
+
+
+def extract_property_value(properties, property_name, default=None):
+    """
+    Returns the value of a database row property as a plain Python value based on its type.
+
+    - title / rich_text -> str (all text items joined)
+    - number / checkbox / url / email / phone_number / created_time / last_edited_time -> value as it is
+    - select / status -> option name
+    - multi_select -> list of option names
+    - date -> start date string
+    - people -> list of names
+
+    `default` is returned when the property is missing or empty.
+    """
+    property_data = properties.get(property_name)
+    if not property_data:
+        return default
+
+    property_type = property_data.get("type")
+    if property_type is None:
+        # Rows built by hand (or trimmed responses) may not carry "type" , falling back to the only known key
+        property_type = next((each_key for each_key in property_data if each_key != "id"), None)
+    property_value = property_data.get(property_type)
+
+    if property_type in ("title", "rich_text"):
+        property_value = extract_rich_text_plain_text(property_value)
+    elif property_type in ("select", "status"):
+        property_value = property_value.get("name") if property_value else None
+    elif property_type == "multi_select":
+        property_value = [each_option.get("name") for each_option in property_value or []]
+    elif property_type == "date":
+        property_value = property_value.get("start") if property_value else None
+    elif property_type == "people":
+        property_value = [each_person.get("name") for each_person in property_value or []]
+
+    if property_value is None or property_value == "" or property_value == []:
+        return default
+    return property_value
+
+
+# Row extractors of Meetings History and Notion Pages Data tables , shared by the readers and the local mirrors below
+def extract_meetings_history_row(properties):
+    return {
+        "meeting_name": extract_property_value(properties, "meeting_name", "Unnamed"),
+        "happened_date": extract_property_value(properties, "happened_date", "No Date")
+    }
+
+
+def extract_notion_pages_data_row(properties):
+    return {
+        "notion_page_id": extract_property_value(properties, "notion_page_id", ""),
+        "page_project_title": extract_property_value(properties, "page_project_title", "")
+    }
+
+
+#####################################################################################################
+# Local mirrors of Meetings History and Notion Pages Data tables , synced incrementally by last_edited_time
+# Graph nodes read these instead of downloading both tables on every run
+NOTION_MIRROR_SYNC_INTERVAL_SECONDS = float(os.getenv("NOTION_MIRROR_SYNC_INTERVAL_SECONDS", "300"))
+
+meetings_history_mirror = NotionDatabaseMirror(
+    "197e35223beb80039714f0cd468bce2e",
+    row_extractor=extract_meetings_history_row,
+    key_field="meeting_name",
+    query_rows=iterate_database_rows,
+    filter_properties=["meeting_name", "happened_date"],
+    cache_dir=os.getenv("NOTION_BLOCK_CACHE_DIR", ".notion_cache"),
+    min_sync_interval_seconds=NOTION_MIRROR_SYNC_INTERVAL_SECONDS
+)
+
+notion_pages_data_mirror = NotionDatabaseMirror(
+    "1a3e35223beb806e80acdc2563180fb1",
+    row_extractor=extract_notion_pages_data_row,
+    key_field="page_project_title",
+    query_rows=iterate_database_rows,
+    filter_properties=["notion_page_id", "page_project_title"],
+    cache_dir=os.getenv("NOTION_BLOCK_CACHE_DIR", ".notion_cache"),
+    min_sync_interval_seconds=NOTION_MIRROR_SYNC_INTERVAL_SECONDS
+)
+
+
+# Latest Projects Data row , latest_data is a JSON list stored as text
+def extract_latest_projects_data_row(properties):
+    notion_page_id = extract_property_value(properties, "notion_page_id", "")
+    try:
+        latest_data = json.loads(extract_property_value(properties, "latest_data", "null"))
+    except (json.JSONDecodeError, TypeError):
+        # Edited by hand or cut off , the row is kept without its latest_data instead of failing the whole sync
+        print(f"⚠️ latest_data of Notion page {notion_page_id} is not valid JSON , ignoring it")
+        latest_data = None
+    return {
+        "notion_page_id": notion_page_id,
+        "page_project_title": extract_property_value(properties, "page_project_title", ""),
+        "latest_data": latest_data
+    }
+
+
+latest_projects_data_mirror = NotionDatabaseMirror(
+    "1a5e35223beb80d49b99efdbdf21e4be",
+    row_extractor=extract_latest_projects_data_row,
+    key_field="notion_page_id",
+    query_rows=iterate_database_rows,
+    filter_properties=["notion_page_id", "page_project_title", "latest_data"],
+    cache_dir=os.getenv("NOTION_BLOCK_CACHE_DIR", ".notion_cache"),
+    min_sync_interval_seconds=NOTION_MIRROR_SYNC_INTERVAL_SECONDS
+)
+
+
+def get_mirrored_database_rows(database_mirror, force_sync=False):
+    """
+    Syncs the given mirror (skipped while it is fresh) and returns its rows.
+    When Notion can not be reached the rows mirrored so far are returned.
+    """
+    try:
+        database_mirror.sync(force=force_sync)
+    except requests.RequestException as e:
+        print(f"⚠️ Could not sync mirror of database {database_mirror.database_id} , using local rows: {e}")
+    return database_mirror.get_rows()
+
+
 #####################################################################################################
 # Fetching Existing Notion Pages Info
 def fetch_data_from_notion_pages_data_database_table():      #  notion_page_id -  page_project_title
     notion_pages_info_database_id = "1a3e35223beb806e80acdc2563180fb1"
-    # database_id = "1ade35223beb807c92b0e662f4ff95f7"
-    HEADERS = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
-    url = f"https://api.notion.com/v1/databases/{notion_pages_info_database_id}/query"
     notion_pages_info_list = []
-    # rows_info_dict = dict()
 
-    
-    response = requests.post(url, headers=HEADERS)
-    data = response.json()
-    if "results" not in data:
-        raise Exception(f"Error fetching Notion database: {data}")
-    for page in data["results"]:
-        properties = page["properties"]
-        
-        notion_page_id = properties["notion_page_id"]["title"][0]["text"]["content"] if properties["notion_page_id"]["title"] else ""
-        page_project_title = properties["page_project_title"]["rich_text"][0]["text"]["content"] if properties["page_project_title"]["rich_text"] else ""
-        # rows_info_dict[notion_page_id] = action_item_database_id
-        notion_pages_info_list.append({
-            "notion_page_id": notion_page_id,
-            "page_project_title": page_project_title
-        })
-    # Handle pagination
-    url = data.get("next_cursor")
+    try:
+        for page in iterate_database_rows(notion_pages_info_database_id, filter_properties=["notion_page_id", "page_project_title"]):
+            notion_pages_info_list.append(extract_notion_pages_data_row(page["properties"]))
+    except requests.RequestException as e:
+        raise Exception(f"Error fetching Notion database: {e}")
     return notion_pages_info_list
 
 ###############################################################################################################
@@ -612,11 +970,6 @@ def fetch_data_from_notion_pages_data_database_table():      #  notion_page_id -
 def add_page_to_action_items_database_table_by_id(database_id, data):
     print("Went into adding page")
     url = "https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28",
-    }
 
     # Extracting data
     action_item_text = data.get("action_item", "")
@@ -648,7 +1001,7 @@ def add_page_to_action_items_database_table_by_id(database_id, data):
     }
 
     # Making the request
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
 
     # Handling the response
     if response.status_code == 200:
@@ -665,46 +1018,21 @@ def add_page_to_action_items_database_table_by_id(database_id, data):
 # Getting Notion Pages Id along with its corresponding Action Items table Id
 def get_each_notion_page_action_items_table_id_mapping():
     database_id = "1ade35223beb807c92b0e662f4ff95f7"
-    HEADERS = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
-    url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    # rows = []
     rows_info_dict = dict()
 
-    while url:
-        response = requests.post(url, headers=HEADERS)
-        data = response.json()
-
-        if "results" not in data:
-            raise Exception(f"Error fetching Notion database: {data}")
-
-        for page in data["results"]:
+    try:
+        for page in iterate_database_rows(database_id, filter_properties=["notion_page_id", "action_item_database_id"]):
             properties = page["properties"]
-            
-            notion_page_id = properties["notion_page_id"]["title"][0]["text"]["content"] if properties["notion_page_id"]["title"] else ""
-            action_item_database_id = properties["action_item_database_id"]["rich_text"][0]["text"]["content"] if properties["action_item_database_id"]["rich_text"] else ""
-            rows_info_dict[notion_page_id] = action_item_database_id
-            # rows.append({
-            #     "notion_page_id": notion_page_id,
-            #     "action_item_database_id": action_item_database_id
-            # })
-
-        # Handle pagination
-        url = data.get("next_cursor")
+            notion_page_id = extract_property_value(properties, "notion_page_id", "")
+            rows_info_dict[notion_page_id] = extract_property_value(properties, "action_item_database_id", "")
+    except requests.RequestException as e:
+        raise Exception(f"Error fetching Notion database: {e}")
     return rows_info_dict
 
 ##########################################################################################################################
 
 def add_each_notion_page_action_items_table_id_mapping(notion_page_id , action_items_table_id):
     database_id = "1ade35223beb807c92b0e662f4ff95f7"
-    HEADERS = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = "https://api.notion.com/v1/pages"
     
     payload = {
@@ -719,7 +1047,7 @@ def add_each_notion_page_action_items_table_id_mapping(notion_page_id , action_i
         }
     }
 
-    response = requests.post(url, headers=HEADERS, data=json.dumps(payload))
+    response = notion_http.post(url, json=payload)
     
     if response.status_code == 200:
         print("🟢🟢 NotionPageId along with ActionItemsDatabaseId Page added successfully!")
@@ -736,11 +1064,6 @@ def add_page_to_database(data):
     
     database_id_1 = "184e35223beb8072b2f8fc8d22260d67"
     url = "https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28",
-    }
 
     # Clean JSON input
     # data = data.replace("json", "").replace("```", "").strip()
@@ -751,7 +1074,7 @@ def add_page_to_database(data):
     # data = output_parser.invoke(message)
     # list_of_users_url = "https://api.notion.com/v1/users"
 
-    # users_response = requests.get(list_of_users_url , headers=headers)
+    # users_response = notion_http.get(list_of_users_url)
     # response_json = users_response.json()
     # results = response_json.get("results")
     # user_ids_list = []
@@ -791,7 +1114,7 @@ def add_page_to_database(data):
         print("Payload to be sent to Notion API:", json.dumps(payload, indent=4))
 
         # Make the POST request to Notion API
-        response = requests.post(url, headers=headers, json=payload)
+        response = notion_http.post(url, json=payload)
 
         if response.status_code == 200:
             print("✅ Page added successfully!")
@@ -806,42 +1129,14 @@ def add_page_to_database(data):
 
 def fetch_data_from_meetings_history_database_table(DATABASE_ID):
     DATABASE_ID = "197e35223beb80039714f0cd468bce2e"
-    url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-
-# Headers for authentication
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"  # Use the latest Notion API version
-    }
-    response = requests.post(url, headers=headers)
-    # print(json.dumps(response.json() , indent=4))
-    if response.status_code == 200:
-        data = response.json()
-
-        # Extract relevant data from each row
-        all_pages = []
-        for page in data.get("results", []):
-            properties = page.get("properties", {})
 
-            meeting_name = properties.get("meeting_name", {}).get("title", [])
-            meeting_name_text = meeting_name[0].get("text", {}).get("content", "") if meeting_name else "Unnamed"
-
-            # happened_date = properties.get("happened_date", {}).get("date", {}).get("start", "No Date")
-            happened_date = properties.get("happened_date", {}).get("rich_text", [])
-            happened_date_text = happened_date[0].get("text", {}).get("content", "No Date") if happened_date else "No Date"
-
-            all_pages.append({
-                "meeting_name": meeting_name_text,
-                "happened_date": happened_date_text
-            })
-
-        # Print extracted rows
-        # print(json.dumps(all_pages, indent=4))
-
-    else:
-        # print(f"Error: {response.status_code}, {response.text}")
-        return [{"error" : f"Error: {response.status_code}, {response.text}"}]
+    # Extract relevant data from each row , every page of the history is read
+    all_pages = []
+    try:
+        for page in iterate_database_rows(DATABASE_ID, filter_properties=["meeting_name", "happened_date"]):
+            all_pages.append(extract_meetings_history_row(page.get("properties", {})))
+    except requests.RequestException as e:
+        return [{"error" : f"Error: {e}"}]
     return all_pages
 
 
@@ -849,11 +1144,6 @@ def add_page_to_meetings_history_database_table(adding_page_info):
     DATABASE_ID = "197e35223beb80039714f0cd468bce2e"
     database_id_1 = DATABASE_ID
     url = "https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28",
-    }
 
     meeting_name = adding_page_info.get("meeting_name")
     happened_date = adding_page_info.get("happened_date")
@@ -873,9 +1163,10 @@ def add_page_to_meetings_history_database_table(adding_page_info):
     print("Payload to be sent to Notion API:", json.dumps(payload, indent=4))
 
     # Make the POST request to Notion API
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
     if response.status_code == 200:
         print("✅ Page added successfully!")
+        meetings_history_mirror.upsert_page(response.json())
     else:
         print(f"❌ Error: {response.status_code} - {response.text}")
 
@@ -887,45 +1178,21 @@ def add_page_to_meetings_history_database_table(adding_page_info):
 def fetch_data_from_existing_notion_pages_data_database_table(DATABASE_ID=""):
 
     DATABASE_ID = "1a3e35223beb806e80acdc2563180fb1"
-    url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-
-# Headers for authentication
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"  # Use the latest Notion API version
-    }
-    response = requests.post(url, headers=headers)
-    # print(json.dumps(response.json() , indent=4))
-    if response.status_code == 200:
-        data = response.json()
 
-        # Extract relevant data from each row
-        all_pages = []
-        for page in data.get("results", []):
+    # Extract relevant data from each row
+    all_pages = []
+    try:
+        for page in iterate_database_rows(DATABASE_ID, filter_properties=["notion_page_id", "page_project_title"]):
             properties = page.get("properties", {})
-
-            meeting_name = properties.get("notion_page_id", {}).get("title", [])
-            meeting_name_text = meeting_name[0].get("text", {}).get("content", "") if meeting_name else "Unnamed"
-
-            # happened_date = properties.get("happened_date", {}).get("date", {}).get("start", "No Date")
-            # happened_date = properties.get("page_project_title", {}).get("rich_text", [])
-            # happened_date_text = happened_date[0].get("text", {}).get("content", "No Project Title") if happened_date else "No Date"
-
-            page_project_title = properties.get("page_project_title", {}).get("rich_text", [])
-            page_project_title_text = page_project_title[0].get("text", {}).get("content", "No Project Title") if page_project_title else "No Date"
-
             all_pages.append({
-                "notion_page_id": meeting_name_text,
-                "page_project_title": page_project_title_text
+                "notion_page_id": extract_property_value(properties, "notion_page_id", "Unnamed"),
+                "page_project_title": extract_property_value(properties, "page_project_title", "No Date")
             })
+    except requests.RequestException as e:
+        return [{"error" : f"Error: {e}"}]
 
-        # Print extracted rows
-        print(all_pages)
-
-    else:
-        # print(f"Error: {response.status_code}, {response.text}")
-        return [{"error" : f"Error: {response.status_code}, {response.text}"}]
+    # Print extracted rows
+    print(all_pages)
     return all_pages
 
 # adding should also be included
@@ -933,11 +1200,6 @@ def add_new_notion_page_data_to_existing_notion_pages_database(notion_page_id ,
     DATABASE_ID = "1a3e35223beb806e80acdc2563180fb1"
     url = "https://api.notion.com/v1/pages"
     
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     data = {
         "parent": {"database_id": DATABASE_ID},
@@ -951,11 +1213,12 @@ def add_new_notion_page_data_to_existing_notion_pages_database(notion_page_id ,
         }
     }
 
-    response = requests.post(url, headers=headers, json=data)
+    response = notion_http.post(url, json=data)
 
     if response.status_code == 200:
         print("✅ Successfully added a new row to Notion database!")
         print("New Page ID:", response.json().get("id"))
+        notion_pages_data_mirror.upsert_page(response.json())
     else:
         print(f"❌ Error adding row: {response.status_code}, {response.text}")
 
@@ -965,45 +1228,24 @@ def add_new_notion_page_data_to_existing_notion_pages_database(notion_page_id ,
 ##########################################################################################################
 ##########################################################################################################
 def fetch_data_from_latest_projects_data_database_table(DATABASE_ID):
-    url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-
-    # Headers for authentication
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"  # Use the latest Notion API version
-    }
-    
-    response = requests.post(url, headers=headers)
-
-    if response.status_code == 200:
-        data = response.json()
-
-        # Extract relevant data from each row
-        all_pages = []
-        for page in data.get("results", []):
+    # Extract relevant data from each row
+    all_pages = []
+    try:
+        for page in iterate_database_rows(DATABASE_ID, filter_properties=["notion_page_id", "page_project_title", "latest_data"]):
             properties = page.get("properties", {})
-
-            # Extract page ID (title property)
-            meeting_name = properties.get("notion_page_id", {}).get("title", [])
-            meeting_name_text = meeting_name[0].get("text", {}).get("content", "") if meeting_name else "Unnamed"
-
-            # Extract project title (rich_text)
-            happened_date = properties.get("page_project_title", {}).get("rich_text", [])
-            happened_date_text = happened_date[0].get("text", {}).get("content", "No Date") if happened_date else "No Date"
-
-            # Extract latest_data (list of rich_text values)
-            latest_data = properties.get("latest_data", {}).get("rich_text", [])
-            latest_data_text = [item.get("text", {}).get("content", "") for item in latest_data]
-
+            try:
+                # latest_data is a JSON list stored as text , Notion splits long text into several rich_text items
+                latest_data = json.loads(extract_property_value(properties, "latest_data", "null"))
+            except (json.JSONDecodeError, TypeError):
+                print(f"⚠️ Skipping row {page.get('id')} , its latest_data is not valid JSON")
+                continue
             all_pages.append({
-                "notion_page_id": meeting_name_text,
-                "page_project_title": happened_date_text,
-                "latest_data": json.loads(latest_data_text[0])
+                "notion_page_id": extract_property_value(properties, "notion_page_id", "Unnamed"),
+                "page_project_title": extract_property_value(properties, "page_project_title", "No Date"),
+                "latest_data": latest_data
             })
-
-    else:
-        return [{"error": f"Error: {response.status_code}, {response.text}"}]
+    except requests.RequestException as e:
+        return [{"error": f"Error: {e}"}]
 
     return all_pages
 
@@ -1039,47 +1281,93 @@ def get_latest_projects_row_data(row_id):
     """
 
     database_id = "1a5e35223beb80d49b99efdbdf21e4be"
-    url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     # Query to filter by notion_page_id
-    query = {
-        "filter": {
-            "property": "notion_page_id",
-            "title": {
-                "equals": row_id  # Assuming notion_page_id is a "title" column
-            }
+    row_filter = {
+        "property": "notion_page_id",
+        "title": {
+            "equals": row_id  # Assuming notion_page_id is a "title" column
         }
     }
 
-    response = requests.post(url, headers=headers, json=query)
+    try:
+        matching_row = next(iter(iterate_database_rows(
+            database_id,
+            filter=row_filter,
+            filter_properties=["notion_page_id", "page_project_title", "latest_data"],
+            page_size=1
+        )), None)
+    except requests.RequestException as e:
+        print(f"❌ Error fetching row: {e}")
+        return None
 
-    if response.status_code == 200:
-        data = response.json()
-        if len(data["results"]) > 0:
-            row = data["results"][0]["properties"]
-            
-            # Extract specific fields
-            notion_page_id = row["notion_page_id"]["title"][0]["text"]["content"] if row["notion_page_id"]["title"] else None
-            page_project_title = row["page_project_title"]["rich_text"][0]["text"]["content"] if row["page_project_title"]["rich_text"] else None
-            latest_data = [item["text"]["content"] for item in row["latest_data"]["rich_text"]] if row["latest_data"]["rich_text"] else None
-            
-            return {
-                "notion_page_id": notion_page_id,
-                "page_project_title": page_project_title,
-                "latest_data": json.loads(latest_data[0])
-            }
-        else:
-            print("❌ No matching row found in the database.")
-            return None
-    else:
-        print(f"❌ Error fetching row: {response.status_code}, {response.text}")
+    if matching_row is None:
+        print("❌ No matching row found in the database.")
         return None
+
+    row = matching_row["properties"]
+    latest_data = extract_property_value(row, "latest_data")
+    return {
+        "notion_page_id": extract_property_value(row, "notion_page_id"),
+        "page_project_title": extract_property_value(row, "page_project_title"),
+        "latest_data": json.loads(latest_data) if latest_data else None
+    }
     
+##########################################################################################################
+# Local vector index over existing projects , used to pick the Notion pages related to a meeting without the LLM
+# Built index and the mirror and block cache versions it was built from , reused until one of them changes
+projects_embedding_index_cache = {"key": None, "index": None}
+
+def build_notion_projects_embedding_index(embedding_function=None):
+    """
+    Builds an `EmbeddingIndex` with one item per Notion page of the Notion Pages Data table.
+
+    The text of each item is the project title , its `latest_data` summary points and the page
+    text kept in `notion_block_tree_cache` from earlier fetches. Both tables are read from their
+    local mirrors (`notion_pages_data_mirror` , `latest_projects_data_mirror`) , so nothing is
+    downloaded besides the incremental syncs , and the built index is reused until one of the
+    mirrors or the cached page text changes. Item metadata is the Notion Pages Data row ({"notion_page_id", "page_project_title"}).
+
+    Args:
+        embedding_function (callable): Optional embedding function , offline hashing TF-IDF by default.
+
+    Returns:
+        EmbeddingIndex
+    """
+    notion_pages_rows = get_mirrored_database_rows(notion_pages_data_mirror)
+    latest_projects_rows = get_mirrored_database_rows(latest_projects_data_mirror)
+    index_cache_key = (notion_pages_data_mirror.version, latest_projects_data_mirror.version, notion_block_tree_cache.version, embedding_function)
+    if projects_embedding_index_cache["key"] == index_cache_key and projects_embedding_index_cache["index"] is not None:
+        return projects_embedding_index_cache["index"]
+
+    latest_data_by_page_id = {
+        each_row.get("notion_page_id"): each_row.get("latest_data") or []
+        for each_row in latest_projects_rows
+    }
+
+    projects_embedding_index = EmbeddingIndex(embedding_function)
+    for each_page_row in notion_pages_rows:
+        notion_page_id = each_page_row.get("notion_page_id")
+        if not notion_page_id:
+            continue
+        cached_page_tree = notion_block_tree_cache.load_page_tree(notion_page_id)
+        cached_page_text = "\n".join(
+            each_child["text"]
+            for each_parent_entry in cached_page_tree.values()
+            for each_child in each_parent_entry["children"] if each_child["text"]
+        )
+        latest_data = latest_data_by_page_id.get(notion_page_id)
+        latest_data_text = "\n".join(map(str, latest_data)) if isinstance(latest_data, list) else str(latest_data or "")
+        projects_embedding_index.add(
+            notion_page_id,
+            "\n".join([each_page_row.get("page_project_title", ""), latest_data_text, cached_page_text]),
+            each_page_row
+        )
+    projects_embedding_index.build()
+    projects_embedding_index_cache.update(key=index_cache_key, index=projects_embedding_index)
+    return projects_embedding_index
+
+
 ##########################################################################################################
 #
 def add_latest_project_details_row_data(latest_project_row_data_details):
@@ -1090,11 +1378,6 @@ def add_latest_project_details_row_data(latest_project_row_data_details):
     
     database_id = "1a5e35223beb80d49b99efdbdf21e4be"
     url = f"https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     
     # Convert list of strings to a string representation of a list
     latest_project_data_str = json.dumps(latest_project_data)
@@ -1109,10 +1392,12 @@ def add_latest_project_details_row_data(latest_project_row_data_details):
         }
     }
     
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
     
     if response.status_code == 200:
         print("✅ Row successfully added to Notion database.")
+        # Keeping the local mirror (and the projects embedding index built from it) current
+        latest_projects_data_mirror.upsert_page(response.json())
         return response.json()
     else:
         print(f"❌ Error adding row: {response.status_code}, {response.text}")
@@ -1124,30 +1409,24 @@ def update_latest_project_details_row_data(latest_project_row_data_details):
     latest_project_data = latest_project_row_data_details.get("latest_data")
     database_id = "1a5e35223beb80d49b99efdbdf21e4be"
     
-    url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
+    # Step 1: Query the database to find the page with the matching notion_page_id , only its id is needed
+    row_filter = {
+        "property": "notion_page_id",
+        "rich_text": {"equals": notion_page_id}
     }
     
-    # Step 1: Query the database to find the page with the matching notion_page_id
-    query_payload = {
-        "filter": {
-            "property": "notion_page_id",
-            "rich_text": {"equals": notion_page_id}
-        }
-    }
-    
-    response = requests.post(url, headers=headers, json=query_payload)
-    data = response.json()
+    try:
+        matching_row = next(iter(iterate_database_rows(database_id, filter=row_filter, filter_properties=["notion_page_id"], page_size=1)), None)
+    except requests.RequestException as e:
+        print(f"❌ Error fetching row: {e}")
+        return
     
-    if "results" not in data or len(data["results"]) == 0:
+    if matching_row is None:
         print("No matching page found in the database.")
         return
     
     # Extract the page ID of the matching row
-    page_id = data["results"][0]["id"]
+    page_id = matching_row["id"]
     
     # Step 2: Update the "latest_data" property in the matched row
     update_url = f"https://api.notion.com/v1/pages/{page_id}"
@@ -1161,10 +1440,11 @@ def update_latest_project_details_row_data(latest_project_row_data_details):
         }
     }
     
-    update_response = requests.patch(update_url, headers=headers, json=update_payload)
+    update_response = notion_http.patch(update_url, json=update_payload)
     
     if update_response.status_code == 200:
         print("Successfully updated the Notion row.")
+        latest_projects_data_mirror.upsert_page(update_response.json())
     else:
         print("Failed to update the Notion row.", update_response.text)
 
@@ -1188,48 +1468,32 @@ def update_latest_project_details_row_data(latest_project_row_data_details):
 def get_actual_page_id(database_id, modified_row_id):
     """Fetch the actual Notion page_id (UUID) using the modified row_id stored in notion_page_id column."""
     
-    url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
-
     # Query Notion database to find row with given notion_page_id
-    query = {
-        "filter": {
-            "property": "notion_page_id",  # Ensure this matches the column name in your Notion table
-            "rich_text": {
-                "equals": modified_row_id
-            }
+    row_filter = {
+        "property": "notion_page_id",  # Ensure this matches the column name in your Notion table
+        "rich_text": {
+            "equals": modified_row_id
         }
     }
 
-    response = requests.post(url, headers=headers, json=query)
+    try:
+        matching_row = next(iter(iterate_database_rows(database_id, filter=row_filter, filter_properties=["notion_page_id"], page_size=1)), None)
+    except requests.RequestException as e:
+        print(f"❌ Error fetching row: {e}")
+        return None
 
-    if response.status_code == 200:
-        data = response.json()
-        print(data)
-        if len(data["results"]) > 0:
-            actual_page_id = data["results"][0]["id"]  # The actual UUID of the page
-            print(f"✅ Found Notion Page ID (UUID): {actual_page_id}")
-            return actual_page_id
-        else:
-            print("❌ No matching row found in the database.")
-            return None
-    else:
-        print(f"❌ Error fetching row: {response.status_code}, {response.text}")
+    if matching_row is None:
+        print("❌ No matching row found in the database.")
         return None
 
+    actual_page_id = matching_row["id"]  # The actual UUID of the page
+    print(f"✅ Found Notion Page ID (UUID): {actual_page_id}")
+    return actual_page_id
+
 
 def update_latest_data(row_id, new_data_list):
     """Update latest_data column for the given row ID, storing the list as a string."""
     url = f"https://api.notion.com/v1/pages/{row_id}"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     # Convert list to a string representation (formatted as JSON-like list)
     formatted_text = json.dumps(new_data_list, indent=2)  
@@ -1242,10 +1506,11 @@ def update_latest_data(row_id, new_data_list):
         }
     }
 
-    response = requests.patch(url, headers=headers, json=data)
+    response = notion_http.patch(url, json=data)
 
     if response.status_code == 200:
         print("✅ Successfully updated latest_data")
+        latest_projects_data_mirror.upsert_page(response.json())
     else:
         print(f"❌ Error updating latest_data: {response.status_code}, {response.text}")
 
@@ -1290,42 +1555,28 @@ def process_updating_notion_page_latest_data(ROW_PRIMARY_ID , NEW_LATEST_DATA):
     
 # not- need
 def get_table_content(table_id):
-    url_to_get_table_content = f"https://api.notion.com/v1/blocks/{table_id}/children"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
-
+    overall_table_data = []
     try:
-        response = requests.get(url_to_get_table_content, headers=headers)
-        # with open("Results/table_data.json" , "w") as file:
-        #     json.dump(json_data , file , indent = 4)
-        #     print(" ✔️ ✔️ ✔️ ✔️ ✔️ ✔️ ✔️ Table data dumped ✔️ ✔️ ✔️ ✔️ ✔️ ✔️ ✔️ ")
-        # response.raise_for_status()  # Raise an error for non-200 responses
+        # Rows are read page by page , so tables with more than 100 rows are fully covered
+        for each_result in iterate_block_children(table_id):
+            object_type = each_result.get("type")
+            if object_type != "table_row":
+                continue
+            object_data = each_result.get(object_type , [])  # data is in dict
+            cells_data = object_data.get("cells")    # cell_data is a list of lists , each list represents a cell
+            each_row_data = []
+            for each_row_cell in cells_data:    
+                cell_data_list = [
+                        text_obj["text"]["content"] 
+                        for text_obj in each_row_cell 
+                        if "text" in text_obj and "content" in text_obj["text"]
+                    ]
+                each_cell_text = "".join(cell_data_list)
+                each_row_data.append(each_cell_text)
+            formatted_each_row_data = "  |  ".join(each_row_data)
+            overall_table_data.append(formatted_each_row_data)
     except requests.RequestException as e:
-        return ["❌ Exception occurred while fetching: {e}"]
-    
-    table_json_data = response.json()
-    results_list = table_json_data.get("results" , [])
-    overall_table_data = []
-    for each_result in results_list:
-        object_type = each_result.get("type")
-        if object_type != "table_row":
-            continue
-        object_data = each_result.get(object_type , [])  # data is in dict
-        cells_data = object_data.get("cells")    # cell_data is a list of lists , each list represents a cell
-        each_row_data = []
-        for each_row_cell in cells_data:    
-            cell_data_list = [
-                    text_obj["text"]["content"] 
-                    for text_obj in each_row_cell 
-                    if "text" in text_obj and "content" in text_obj["text"]
-                ]
-            each_cell_text = "".join(cell_data_list)
-            each_row_data.append(each_cell_text)
-        formatted_each_row_data = "  |  ".join(each_row_data)
-        overall_table_data.append(formatted_each_row_data)
+        return [f"❌ Exception occurred while fetching: {e}"]
     
     return overall_table_data
 ###########################################################################################################
@@ -1339,11 +1590,6 @@ def get_table_content(table_id):
 def append_toggle_to_given_page(NOTION_PAGE_ID , toggle_item_text):
 
     url_to_add_toggle_Item_as_children = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     payload_to_add_Toggle_Element = {
         "children": [
@@ -1368,7 +1614,7 @@ def append_toggle_to_given_page(NOTION_PAGE_ID , toggle_item_text):
     try:
         # logging.info(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
         # print(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
-        response = requests.patch(url_to_add_toggle_Item_as_children, headers=headers, json=payload_to_add_Toggle_Element)
+        response = notion_http.patch(url_to_add_toggle_Item_as_children, json=payload_to_add_Toggle_Element)
         response_json_data = response.json()
 
         if response.status_code == 200:
@@ -1400,11 +1646,6 @@ def append_new_topic_toggle_under_given_toggle_id(existing_toggle_id, new_topic_
     Returns:
         str: The ID of the newly created toggle block, or None if the request fails.
     """
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = f"https://api.notion.com/v1/blocks/{existing_toggle_id}/children"
 
     payload_to_add_Toggle_Element = {
@@ -1425,7 +1666,7 @@ def append_new_topic_toggle_under_given_toggle_id(existing_toggle_id, new_topic_
         ]
     }
 
-    response = requests.patch(url, headers=headers, json=payload_to_add_Toggle_Element)
+    response = notion_http.patch(url, json=payload_to_add_Toggle_Element)
     
     if response.status_code == 200:
         created_block = response.json()
@@ -1454,11 +1695,6 @@ def add_bulleted_list_with_subpoints(parent_toggle_id, bullet_points):
         list: A list of IDs of the created bullet items.
     """
     
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     
     url = f"https://api.notion.com/v1/blocks/{parent_toggle_id}/children"
     
@@ -1491,7 +1727,7 @@ def add_bulleted_list_with_subpoints(parent_toggle_id, bullet_points):
     
     payload = {"children": children}
 
-    response = requests.patch(url, headers=headers, json=payload)
+    response = notion_http.patch(url, json=payload)
     
     if response.status_code == 200:
         created_blocks = response.json()
@@ -1514,10 +1750,9 @@ def proceeding_to_changes_node(llm_response_content):
     llm_response_content (str): A JSON-formatted string received from the LLM response.
 
     Steps:
-    1. Cleans the JSON string by removing Markdown formatting (````json ... ````) if present.
-    2. Parses the cleaned string into a Python dictionary.
-    3. Extracts the list of changes under the "changes" key.
-    4. Prints the cleaned JSON string, extracted changes list, and the original LLM response.
+    1. Parses the string with `parse_llm_output` (fenced block extraction , JSON repair) against `PageChanges`.
+    2. Extracts the list of changes under the "changes" key.
+    3. Prints the parsed JSON, extracted changes list, and the original LLM response.
 
     Returns:
     None (prints extracted information for debugging/logging purposes).
@@ -1525,20 +1760,14 @@ def proceeding_to_changes_node(llm_response_content):
     print("**************  Received Content below ********")
     print(llm_response_content)
     print("***************************************************")
-    cleaned_json_str = re.sub(r'^```json\n|\n```$', '', llm_response_content.strip())
-    print(cleaned_json_str)
-    json_data = json.loads(cleaned_json_str)
+    json_data = parse_llm_output(llm_response_content, PageChanges, node_name="proceeding_to_changes_node")
+    print(json_data)
     changes_list = json_data.get("changes", [])
     print(changes_list)
     # print(llm_response_content)
 
 
 def add_heading_to_page(NOTION_PAGE_ID ,heading_text):
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children"
 
     payload_to_add_Toggle_Element = {
@@ -1559,7 +1788,7 @@ def add_heading_to_page(NOTION_PAGE_ID ,heading_text):
         ]
     }
 
-    response = requests.patch(url, headers=headers, json=payload_to_add_Toggle_Element)
+    response = notion_http.patch(url, json=payload_to_add_Toggle_Element)
     
     if response.status_code == 200:
         created_block = response.json()
@@ -1576,11 +1805,6 @@ def add_heading_to_page(NOTION_PAGE_ID ,heading_text):
 def create_notion_table(parent_block_id):
     url = "https://api.notion.com/v1/databases"
 
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28",
-    }
 
     payload = {
         "parent": {"type": "page_id", "page_id": parent_block_id},
@@ -1605,7 +1829,7 @@ def create_notion_table(parent_block_id):
         }
     }
 
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
 
     if response.status_code == 200:
         database_id = response.json().get("id")
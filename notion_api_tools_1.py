@@ -12,6 +12,7 @@ import re
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from notion_http_client import notion_http
 
 logging.basicConfig(
     level=logging.INFO,  # Change to DEBUG for more details
@@ -37,12 +38,8 @@ async def validate_notion_page(notion_page_id):
     Returns True if valid, else False.
     """
     url = f"https://api.notion.com/v1/pages/{notion_page_id}"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Notion-Version": "2022-06-28"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = notion_http.get(url)
     
     if response.status_code == 200:
         return True  # ✅ Notion Page is valid
@@ -59,14 +56,9 @@ def fetch_content_by_given_block_page_id_helper_func(parent_page_id, number_stac
         number_stack = []
 
     url_to_get_all_content = f"https://api.notion.com/v1/blocks/{parent_page_id}/children"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     try:
-        response = requests.get(url_to_get_all_content, headers=headers)
+        response = notion_http.get(url_to_get_all_content)
         response.raise_for_status()
     except requests.RequestException as e:
         return [f"{'.'.join(map(str, number_stack))} Data not fetched for ObjectId {parent_page_id}"]
@@ -135,15 +127,10 @@ def fetch_notion_page_content(notion_page_id_info: dict):
 
 # Helper Fucntion to just retrieve type of block from given blockId
 def retrieve_notion_block_type(blockId):
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url_to_get_object = f"https://api.notion.com/v1/blocks/{blockId}"
     try:
         print("⌛⌛ Getting Object , Please wait ⌛⌛")
-        obj_response = requests.get(url_to_get_object , headers=headers)
+        obj_response = notion_http.get(url_to_get_object)
         print("🟢🟢🟢 Object Arrived , Got Response 🟢🟢🟢")
         response_data_json = obj_response.json()
         object_type = response_data_json.get("type" , "")
@@ -211,18 +198,13 @@ def append_bulleted_list_to_block(adding_content_info: dict):
     # logging.info("Payload Prepared: %s", data)
     print(f"Payload Prepared: {data}")
 
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url_to_add_text = f"https://api.notion.com/v1/blocks/{blockId}/children"
 
     # logging.info("Sending request to add content to Notion...")
     print("Sending request to add content to Notion...")
 
     try:
-        response = requests.patch(url_to_add_text, headers=headers, json=data)
+        response = notion_http.patch(url_to_add_text, json=data)
         if response.status_code == 200:
             # logging.info("✅ Data successfully added to %s with object-type %s", blockId, block_type)
             print(f"✅ Data successfully added to {blockId} with object-type {block_type}")
@@ -269,11 +251,6 @@ def append_Toggle_to_Notion_page_By_using_first_child_id(NOTION_PAGE_ID, toggle_
     """
 
     url_to_add_toggle_Item_as_children = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     payload_to_add_Toggle_Element = {
         "children": [
@@ -299,7 +276,7 @@ def append_Toggle_to_Notion_page_By_using_first_child_id(NOTION_PAGE_ID, toggle_
     try:
         # logging.info(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
         print(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
-        response = requests.patch(url_to_add_toggle_Item_as_children, headers=headers, json=payload_to_add_Toggle_Element)
+        response = notion_http.patch(url_to_add_toggle_Item_as_children, json=payload_to_add_Toggle_Element)
         response_json_data = response.json()
 
         if response.status_code == 200:
@@ -374,15 +351,10 @@ def append_toggle_with_bullets_for_change_log(adding_toggle_item_info: dict):
     print("🧑‍🏭 Initiating toggle item addition. Fetching first child object ID from the given Notion page ID.")
 
     url_to_fetch_first_children = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children?page_size=1"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     # logging.info("⌛ Requesting to get the first child data...")
     print("⌛ Requesting to get the first child data...")
-    response = requests.get(url_to_fetch_first_children, headers=headers)
+    response = notion_http.get(url_to_fetch_first_children)
     # logging.info("🟩 Response received.")
     print("🟩 Response received.")
     first_block_id = None
@@ -458,11 +430,6 @@ def update_block_content(updating_block_info: dict):
     print(f"Retrieving Notion block type for object ID: {objectId}")
     
     url_to_update_block = f"https://api.notion.com/v1/blocks/{objectId}"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     
     # logging.info("Preparing payload to update block content.")
     print("Preparing payload to update block content.")
@@ -480,7 +447,7 @@ def update_block_content(updating_block_info: dict):
     # logging.info("Sending request to update Notion block content...")
     print("Sending request to update Notion block content...")
     try:
-        response = requests.patch(url_to_update_block, headers=headers, json=data)
+        response = notion_http.patch(url_to_update_block, json=data)
         
         if response.status_code == 200:
             # logging.info(f"Content successfully updated in block {objectId}.")
@@ -544,17 +511,12 @@ def delete_block(deleting_block_info: dict):
     block_id = deleting_block_info.get("blockId")
     url_to_delete_block = f"https://api.notion.com/v1/blocks/{block_id}"
 
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     payload = {"archived": True}
 
     try:
         print("⌛ Request to delete Block is initiated")
-        response = requests.patch(url_to_delete_block, headers=headers, json=payload)
+        response = notion_http.patch(url_to_delete_block, json=payload)
         response_json = response.json()
 
         if response.status_code == 200:
@@ -577,17 +539,12 @@ def delete_block(deleting_block_info: dict):
 def fetch_data_from_notion_pages_data_database_table():
     notion_pages_info_database_id = "1a3e35223beb806e80acdc2563180fb1"
     # database_id = "1ade35223beb807c92b0e662f4ff95f7"
-    HEADERS = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = f"https://api.notion.com/v1/databases/{notion_pages_info_database_id}/query"
     notion_pages_info_list = []
     # rows_info_dict = dict()
 
     
-    response = requests.post(url, headers=HEADERS)
+    response = notion_http.post(url)
     data = response.json()
     if "results" not in data:
         raise Exception(f"Error fetching Notion database: {data}")
@@ -637,11 +594,6 @@ def add_page_to_action_items_database_table_by_id(adding_action_item_info):
 
     print("Went into adding page")
     url = "https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28",
-    }
 
 
     database_id = adding_action_item_info.get("database_id")
@@ -676,7 +628,7 @@ def add_page_to_action_items_database_table_by_id(adding_action_item_info):
     }
 
     # Making the request
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
 
     # Handling the response
     if response.status_code == 200:
@@ -716,17 +668,12 @@ def get_each_notion_page_action_items_table_id_mapping():
     """
 
     database_id = "1ade35223beb807c92b0e662f4ff95f7"
-    HEADERS = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = f"https://api.notion.com/v1/databases/{database_id}/query"
     # rows = []
     rows_info_dict = dict()
 
     while url:
-        response = requests.post(url, headers=HEADERS)
+        response = notion_http.post(url)
         data = response.json()
 
         if "results" not in data:
@@ -753,17 +700,12 @@ def get_each_notion_page_action_items_table_id_mapping():
 # Getting Notion Pages Id along with its corresponding Action Items table Id
 def get_each_notion_page_action_items_table_id_mapping():
     database_id = "1ade35223beb807c92b0e662f4ff95f7"
-    HEADERS = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = f"https://api.notion.com/v1/databases/{database_id}/query"
     # rows = []
     rows_info_dict = dict()
 
     while url:
-        response = requests.post(url, headers=HEADERS)
+        response = notion_http.post(url)
         data = response.json()
 
         if "results" not in data:
@@ -817,11 +759,6 @@ def add_each_notion_page_action_items_table_id_mapping(action_item_mapping_info)
     action_items_table_id = action_item_mapping_info.get("action_items_table_id")
 
     database_id = "1ade35223beb807c92b0e662f4ff95f7"
-    HEADERS = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = "https://api.notion.com/v1/pages"
     
     payload = {
@@ -836,7 +773,7 @@ def add_each_notion_page_action_items_table_id_mapping(action_item_mapping_info)
         }
     }
 
-    response = requests.post(url, headers=HEADERS, data=json.dumps(payload))
+    response = notion_http.post(url, json=payload)
     
     if response.status_code == 200:
         print("🟢🟢 NotionPageId along with ActionItemsDatabaseId Page added successfully!")
@@ -877,12 +814,7 @@ def fetch_data_from_meetings_history_database_table():
     url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
 
 # Headers for authentication
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"  # Use the latest Notion API version
-    }
-    response = requests.post(url, headers=headers)
+    response = notion_http.post(url)
     # print(json.dumps(response.json() , indent=4))
     if response.status_code == 200:
         data = response.json()
@@ -945,11 +877,6 @@ def add_page_to_meetings_history_database_table(adding_page_info):
     DATABASE_ID = "197e35223beb80039714f0cd468bce2e"
     # database_id_1 = DATABASE_ID
     url = "https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28",
-    }
 
     meeting_name = adding_page_info.get("meeting_name")
     happened_date = adding_page_info.get("happened_date")
@@ -969,7 +896,7 @@ def add_page_to_meetings_history_database_table(adding_page_info):
     print("Payload to be sent to Notion API:", json.dumps(payload, indent=4))
 
     # Make the POST request to Notion API
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
     if response.status_code == 200:
         print("✅ Page added successfully!")
     else:
@@ -1008,12 +935,7 @@ def fetch_data_from_existing_notion_pages_data_database_table():
     url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
 
 # Headers for authentication
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"  # Use the latest Notion API version
-    }
-    response = requests.post(url, headers=headers)
+    response = notion_http.post(url)
     # print(json.dumps(response.json() , indent=4))
     if response.status_code == 200:
         data = response.json()
@@ -1078,11 +1000,6 @@ def add_new_notion_page_data_to_existing_notion_pages_database(new_notion_page_i
     DATABASE_ID = "1a3e35223beb806e80acdc2563180fb1"
     url = "https://api.notion.com/v1/pages"
     
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     notion_page_id = new_notion_page_info.get("notion_page_id")
     page_project_title = new_notion_page_info.get("page_project_title")
     # notion_page_id , page_project_title
@@ -1098,7 +1015,7 @@ def add_new_notion_page_data_to_existing_notion_pages_database(new_notion_page_i
         }
     }
 
-    response = requests.post(url, headers=headers, json=data)
+    response = notion_http.post(url, json=data)
 
     if response.status_code == 200:
         print("✅ Successfully added a new row to Notion database!")
@@ -1140,13 +1057,8 @@ def fetch_data_from_latest_projects_data_database_table():
     url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
 
     # Headers for authentication
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"  # Use the latest Notion API version
-    }
     
-    response = requests.post(url, headers=headers)
+    response = notion_http.post(url)
 
     if response.status_code == 200:
         data = response.json()
@@ -1214,11 +1126,6 @@ def get_latest_projects_row_data(row_id):
 
     database_id = "1a5e35223beb80d49b99efdbdf21e4be"
     url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     # Query to filter by notion_page_id
     query = {
@@ -1230,7 +1137,7 @@ def get_latest_projects_row_data(row_id):
         }
     }
 
-    response = requests.post(url, headers=headers, json=query)
+    response = notion_http.post(url, json=query)
 
     if response.status_code == 200:
         data = response.json()
@@ -1292,11 +1199,6 @@ def add_latest_project_details_row_data(latest_project_row_data_details):
     
     database_id = "1a5e35223beb80d49b99efdbdf21e4be"
     url = f"https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     
     # Convert list of strings to a string representation of a list
     latest_project_data_str = json.dumps(latest_project_data)
@@ -1311,7 +1213,7 @@ def add_latest_project_details_row_data(latest_project_row_data_details):
         }
     }
     
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
     
     if response.status_code == 200:
         print("✅ Row successfully added to Notion database.")
@@ -1357,11 +1259,6 @@ def update_latest_project_details_row_data(latest_project_row_data_details):
     database_id = "1a5e35223beb80d49b99efdbdf21e4be"
     
     url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     
     # Step 1: Query the database to find the page with the matching notion_page_id
     query_payload = {
@@ -1371,7 +1268,7 @@ def update_latest_project_details_row_data(latest_project_row_data_details):
         }
     }
     
-    response = requests.post(url, headers=headers, json=query_payload)
+    response = notion_http.post(url, json=query_payload)
     data = response.json()
     
     if "results" not in data or len(data["results"]) == 0:
@@ -1393,7 +1290,7 @@ def update_latest_project_details_row_data(latest_project_row_data_details):
         }
     }
     
-    update_response = requests.patch(update_url, headers=headers, json=update_payload)
+    update_response = notion_http.patch(update_url, json=update_payload)
     
     if update_response.status_code == 200:
         print("Successfully updated the Notion row.")
@@ -1443,11 +1340,6 @@ def append_toggle_to_given_page(NOTION_PAGE_ID , toggle_item_text):
     # toggle_item_text = toogle_item_info.get("toggle_item_text")
 
     url_to_add_toggle_Item_as_children = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
     payload_to_add_Toggle_Element = {
         "children": [
@@ -1472,7 +1364,7 @@ def append_toggle_to_given_page(NOTION_PAGE_ID , toggle_item_text):
     try:
         # logging.info(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
         # print(f"⌚ Requesting to add Toggle Item after ObjectId: {existing_first_child_id} ⌚")
-        response = requests.patch(url_to_add_toggle_Item_as_children, headers=headers, json=payload_to_add_Toggle_Element)
+        response = notion_http.patch(url_to_add_toggle_Item_as_children, json=payload_to_add_Toggle_Element)
         response_json_data = response.json()
 
         if response.status_code == 200:
@@ -1508,11 +1400,6 @@ def append_new_topic_toggle_under_given_toggle_id(existing_toggle_id, new_topic_
     Returns:
         str: The ID of the newly created toggle block, or None if the request fails.
     """
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = f"https://api.notion.com/v1/blocks/{existing_toggle_id}/children"
 
     payload_to_add_Toggle_Element = {
@@ -1533,7 +1420,7 @@ def append_new_topic_toggle_under_given_toggle_id(existing_toggle_id, new_topic_
         ]
     }
 
-    response = requests.patch(url, headers=headers, json=payload_to_add_Toggle_Element)
+    response = notion_http.patch(url, json=payload_to_add_Toggle_Element)
     
     if response.status_code == 200:
         created_block = response.json()
@@ -1564,11 +1451,6 @@ def add_bulleted_list_with_subpoints(parent_toggle_id, bullet_points):
         list: A list of IDs of the created bullet items.
     """
     
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     
     url = f"https://api.notion.com/v1/blocks/{parent_toggle_id}/children"
     
@@ -1601,7 +1483,7 @@ def add_bulleted_list_with_subpoints(parent_toggle_id, bullet_points):
     
     payload = {"children": children}
 
-    response = requests.patch(url, headers=headers, json=payload)
+    response = notion_http.patch(url, json=payload)
     
     if response.status_code == 200:
         created_blocks = response.json()
@@ -1613,11 +1495,6 @@ def add_bulleted_list_with_subpoints(parent_toggle_id, bullet_points):
         return None
 
 def add_heading_to_page(NOTION_PAGE_ID ,heading_text):
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
     url = f"https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children"
 
     payload_to_add_Toggle_Element = {
@@ -1638,7 +1515,7 @@ def add_heading_to_page(NOTION_PAGE_ID ,heading_text):
         ]
     }
 
-    response = requests.patch(url, headers=headers, json=payload_to_add_Toggle_Element)
+    response = notion_http.patch(url, json=payload_to_add_Toggle_Element)
     
     if response.status_code == 200:
         created_block = response.json()
@@ -1652,11 +1529,6 @@ def add_heading_to_page(NOTION_PAGE_ID ,heading_text):
 def create_notion_table(parent_block_id):
     url = "https://api.notion.com/v1/databases"
 
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28",
-    }
 
     payload = {
         "parent": {"type": "page_id", "page_id": parent_block_id},
@@ -1681,7 +1553,7 @@ def create_notion_table(parent_block_id):
         }
     }
 
-    response = requests.post(url, headers=headers, json=payload)
+    response = notion_http.post(url, json=payload)
 
     if response.status_code == 200:
         database_id = response.json().get("id")
@@ -0,0 +1,579 @@
+import os
+import json
+import asyncio
+import aiohttp
+from dotenv import load_dotenv
+from notion_http_client import NOTION_API_BASE_URL, NOTION_API_VERSION, AsyncHTTPClientBase, notion_http, is_idempotent_notion_request
+from notion_api_tools import summarize_block_for_tree, render_block_tree_lines, MAX_CONCURRENT_BLOCK_FETCHES, notion_block_tree_cache
+from notion_api_tools import reuse_cached_children, build_page_tree_to_save, mark_cached_block_stale
+from notion_api_tools import meetings_history_mirror, notion_pages_data_mirror, latest_projects_data_mirror
+
+
+load_dotenv()
+
+MEETINGS_HISTORY_DATABASE_ID = "197e35223beb80039714f0cd468bce2e"
+EXISTING_NOTION_PAGES_DATABASE_ID = "1a3e35223beb806e80acdc2563180fb1"
+ACTION_ITEMS_TABLE_MAPPING_DATABASE_ID = "1ade35223beb807c92b0e662f4ff95f7"
+LATEST_PROJECTS_DATABASE_ID = "1a5e35223beb80d49b99efdbdf21e4be"
+
+# Notion accepts at most 100 children in one append request
+MAX_CHILDREN_PER_APPEND = 100
+# New projects (slack confirmation + Notion writes) handled at the same time by run_bounded_tasks
+MAX_CONCURRENT_NEW_PROJECT_TASKS = int(os.getenv("MAX_CONCURRENT_NEW_PROJECT_TASKS", "5"))
+
+
+class NotionAPIError(Exception):
+    """Raised by the async iterators when Notion answers with a non-200 status."""
+
+    def __init__(self, status_code, response_json):
+        super().__init__(f"Notion API returned {status_code}: {response_json}")
+        self.status_code = status_code
+        self.response_json = response_json
+
+
+class AsyncNotionHTTP(AsyncHTTPClientBase):
+    """
+    asyncio counterpart of `NotionHTTP` , built on aiohttp.
+
+    Sessions per event loop (with preset Authorization, Notion-Version and Content-Type headers)
+    and the retry loop come from `AsyncHTTPClientBase`. Requests take tokens from the same
+    `TokenBucketRateLimiter` as the sync client , so the integration stays under one budget, and
+    429 / 5xx / connection errors are retried the same way with `asyncio.sleep` instead of
+    blocking the loop. Requests which are not idempotent (see `is_idempotent_notion_request`) are
+    only retried after a 429 or a failure to connect , same as the sync client.
+
+    Args:
+        api_key (str): Notion integration token.
+        pool_size (int): Maximum number of open connections per event loop.
+        connect_timeout (float): Seconds to wait for a connection to be established.
+        read_timeout (float): Seconds to wait for the server to send data.
+        notion_version (str): Value sent in the Notion-Version header.
+        base_url (str): Prefix used when a path (e.g. "/blocks/{id}") is given instead of a full URL.
+        rate_limiter (TokenBucketRateLimiter): Limiter shared with the sync client.
+        max_retries (int): Number of retries for throttled , 5xx or failed-to-connect requests.
+        backoff_base_seconds (float): First backoff step , doubled on every retry.
+        backoff_max_seconds (float): Upper bound of a single backoff.
+
+    Example Usage:
+        status_code, response_json = await notion_async_http.get(f"/blocks/{block_id}/children")
+    """
+
+    def __init__(self, api_key, pool_size=10, connect_timeout=5.0, read_timeout=30.0,
+                 notion_version=NOTION_API_VERSION, base_url=NOTION_API_BASE_URL,
+                 rate_limiter=None, max_retries=5, backoff_base_seconds=0.5, backoff_max_seconds=30.0):
+        super().__init__(
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+                "Notion-Version": notion_version
+            },
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            pool_size=pool_size,
+            max_retries=max_retries,
+            backoff_base_seconds=backoff_base_seconds,
+            backoff_max_seconds=backoff_max_seconds
+        )
+        self.base_url = base_url.rstrip("/")
+        self.rate_limiter = rate_limiter or notion_http.rate_limiter
+
+    def build_url(self, path_or_url):
+        if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    async def request(self, method, path_or_url, **kwargs):
+        """
+        Sends one request , retrying throttled / transient failures.
+
+        Returns:
+            tuple: (status_code, response_json). Bodies which are not JSON come back as {"message": <text>}.
+        """
+        url = self.build_url(path_or_url)
+        return await self._send_with_retries(
+            f"Notion {method} {url}",
+            self.rate_limiter,
+            is_idempotent_notion_request(method, url),
+            lambda status_code, response_json: status_code == 429,
+            method,
+            url,
+            **kwargs
+        )
+
+    async def get(self, path_or_url, **kwargs):
+        return await self.request("GET", path_or_url, **kwargs)
+
+    async def post(self, path_or_url, **kwargs):
+        return await self.request("POST", path_or_url, **kwargs)
+
+    async def patch(self, path_or_url, **kwargs):
+        return await self.request("PATCH", path_or_url, **kwargs)
+
+    async def delete(self, path_or_url, **kwargs):
+        return await self.request("DELETE", path_or_url, **kwargs)
+
+
+# Single async client shared by every async Notion tool function
+notion_async_http = AsyncNotionHTTP(
+    os.getenv("NOTION_API_KEY"),
+    pool_size=int(os.getenv("NOTION_HTTP_POOL_SIZE", "10")),
+    connect_timeout=float(os.getenv("NOTION_HTTP_CONNECT_TIMEOUT", "5")),
+    read_timeout=float(os.getenv("NOTION_HTTP_READ_TIMEOUT", "30")),
+    rate_limiter=notion_http.rate_limiter,
+    max_retries=int(os.getenv("NOTION_HTTP_MAX_RETRIES", "5"))
+)
+
+
+def build_rich_text(text_content):
+    return [{"type": "text", "text": {"content": text_content}}]
+
+
+def build_bulleted_list_item(text_content, children=None):
+    bulleted_list_item = {
+        "object": "block",
+        "type": "bulleted_list_item",
+        "bulleted_list_item": {"rich_text": build_rich_text(text_content)}
+    }
+    if children:
+        bulleted_list_item["bulleted_list_item"]["children"] = children
+    return bulleted_list_item
+
+
+def build_heading(heading_type, heading_text, is_toggleable):
+    return {
+        "object": "block",
+        "type": heading_type,
+        heading_type: {
+            "rich_text": build_rich_text(heading_text),
+            "is_toggleable": is_toggleable
+        }
+    }
+
+
+###########################################################################################################
+# Pages and Blocks
+
+async def validate_notion_page_async(notion_page_id):
+    """
+    Checks if the given Notion Page ID is valid and accessible.
+    Returns True if valid, else False.
+    """
+    status_code, response_json = await notion_async_http.get(f"/pages/{notion_page_id}")
+
+    if status_code == 200:
+        return True  # ✅ Notion Page is valid
+    else:
+        print(f"❌ Invalid Notion Page ID: {notion_page_id}. Error: {response_json}")
+        return False  # ❌ Invalid Page ID
+
+
+# Async generator which yields every child block of given block , following `next_cursor` pagination
+async def iterate_block_children_async(parent_block_id, page_size=100):
+    """
+    Yields the child blocks of a Notion block page by page, following `has_more` / `next_cursor`.
+
+    Raises:
+        NotionAPIError: If any page of children can not be fetched.
+    """
+    params = {"page_size": page_size}
+    while True:
+        status_code, response_json = await notion_async_http.get(f"/blocks/{parent_block_id}/children", params=params)
+        if status_code != 200:
+            raise NotionAPIError(status_code, response_json)
+
+        for each_block in response_json.get("results", []):
+            yield each_block
+
+        next_cursor = response_json.get("next_cursor")
+        if not response_json.get("has_more") or not next_cursor:
+            break
+        params = {"page_size": page_size, "start_cursor": next_cursor}
+
+
+async def fetch_notion_page_content_async(notion_page_id, max_concurrency=MAX_CONCURRENT_BLOCK_FETCHES, block_tree_cache=notion_block_tree_cache):
+    """
+    Fetches the whole block tree of a page level by level , requesting every parent of a level
+    concurrently (at most `max_concurrency` in flight) , and renders it in the same
+    "1.2.3 - text {id: ...}" format as `fetch_notion_page_content`.
+
+    Like the sync crawler , children of parents whose `last_edited_time` did not move since the
+    last fetch are taken from `block_tree_cache` , and the tree is saved back afterwards. Pass
+    None to always crawl the whole page.
+
+    Returns:
+        str: Rendered page content , one block per line.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # parent_block_id -> list of child blocks (None if request failed)
+    children_by_parent_id = {}
+    # parent_block_id -> last_edited_time of the parent when its children were read
+    last_edited_time_by_parent_id = {}
+    cached_page_tree = {}
+
+    async def fetch_children(parent_block_id):
+        async with semaphore:
+            try:
+                return [summarize_block_for_tree(each_block) async for each_block in iterate_block_children_async(parent_block_id)]
+            except (NotionAPIError, aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+
+    async def fetch_last_edited_time(block_id):
+        try:
+            status_code, response_json = await notion_async_http.get(f"/blocks/{block_id}")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        return response_json.get("last_edited_time") if status_code == 200 else None
+
+    def reuse_cached_children_of(parent_block_id, current_last_edited_time, missing_parent_ids):
+        return reuse_cached_children(cached_page_tree, children_by_parent_id, last_edited_time_by_parent_id,
+                                     parent_block_id, current_last_edited_time, missing_parent_ids)
+
+    if block_tree_cache is not None:
+        # SQLite reads and writes run on a worker thread , off the event loop
+        cached_page_tree, last_edited_time_by_parent_id[notion_page_id] = await asyncio.gather(
+            asyncio.to_thread(block_tree_cache.load_page_tree, notion_page_id),
+            fetch_last_edited_time(notion_page_id)
+        )
+
+    current_level_parent_ids = []
+    if not reuse_cached_children_of(notion_page_id, last_edited_time_by_parent_id.get(notion_page_id), current_level_parent_ids):
+        current_level_parent_ids = [notion_page_id]
+
+    while current_level_parent_ids:
+        children_lists = await asyncio.gather(*(fetch_children(parent_id) for parent_id in current_level_parent_ids))
+
+        next_level_parent_ids = []
+        for parent_id, children_list in zip(current_level_parent_ids, children_lists):
+            children_by_parent_id[parent_id] = children_list
+            for each_child in children_list or []:
+                if each_child["has_children"]:
+                    last_edited_time_by_parent_id[each_child["id"]] = each_child["last_edited_time"]
+                    if not reuse_cached_children_of(each_child["id"], each_child["last_edited_time"], next_level_parent_ids):
+                        next_level_parent_ids.append(each_child["id"])
+        current_level_parent_ids = next_level_parent_ids
+
+    if block_tree_cache is not None:
+        await asyncio.to_thread(
+            block_tree_cache.save_page_tree,
+            notion_page_id,
+            build_page_tree_to_save(children_by_parent_id, last_edited_time_by_parent_id)
+        )
+
+    return "\n".join(render_block_tree_lines(children_by_parent_id, notion_page_id))
+
+
+async def retrieve_notion_block_type_async(block_id):
+    cached_block_info = notion_block_tree_cache.lookup_block(block_id)
+    if cached_block_info and cached_block_info.get("type"):
+        return cached_block_info["type"]
+
+    status_code, response_json = await notion_async_http.get(f"/blocks/{block_id}")
+    if status_code != 200:
+        print(f"❌ Failed to get block {block_id}. Status Code: {status_code}")
+        return ""
+    return response_json.get("type", "")
+
+
+async def append_children_to_block_async(parent_block_id, children, after=None):
+    """
+    Appends child blocks under the given block , splitting them into requests of
+    `MAX_CHILDREN_PER_APPEND` blocks which are sent in order.
+
+    Args:
+        parent_block_id (str): Block (or page) under which the children are added.
+        children (list[dict]): Notion block objects.
+        after (str): Optional block id after which the children are inserted.
+
+    Returns:
+        list[str] | None: Ids of the created blocks in order , None if any request failed.
+    """
+    created_block_ids = []
+    for start_index in range(0, len(children), MAX_CHILDREN_PER_APPEND):
+        payload = {"children": children[start_index:start_index + MAX_CHILDREN_PER_APPEND]}
+        if after:
+            payload["after"] = after
+
+        status_code, response_json = await notion_async_http.patch(f"/blocks/{parent_block_id}/children", json=payload)
+        if status_code != 200:
+            print(f"❌ Failed to add children to {parent_block_id}. Status Code: {status_code}, Response: {response_json}")
+            if created_block_ids:
+                # Earlier chunks were written
+                await asyncio.to_thread(mark_cached_block_stale, parent_block_id)
+            return None
+
+        created_block_ids.extend(each_block["id"] for each_block in response_json.get("results", []))
+        # Next chunk goes after the last block created by this one
+        if after and created_block_ids:
+            after = created_block_ids[-1]
+    await asyncio.to_thread(mark_cached_block_stale, parent_block_id)
+    return created_block_ids
+
+
+async def append_bulleted_list_to_block_async(block_id, bullet_points_list):
+    created_block_ids = await append_children_to_block_async(
+        block_id,
+        [build_bulleted_list_item(each_bullet_point) for each_bullet_point in bullet_points_list]
+    )
+    if created_block_ids is not None:
+        print(f"✅ Data successfully added to {block_id}")
+    return created_block_ids
+
+
+async def update_block_content_async(block_id, new_text_content, block_type=None):
+    """
+    Replaces the text of a block. When `block_type` is not given it is taken from the block tree
+    cache , with a GET only for blocks which were never fetched.
+
+    Returns:
+        bool: True if the block was updated , otherwise False.
+    """
+    if not block_type:
+        block_type = await retrieve_notion_block_type_async(block_id)
+        if not block_type:
+            return False
+
+    payload = {block_type: {"rich_text": build_rich_text(new_text_content)}}
+    status_code, response_json = await notion_async_http.patch(f"/blocks/{block_id}", json=payload)
+    if status_code == 200:
+        print(f"Content successfully updated in block {block_id}.")
+        await asyncio.to_thread(mark_cached_block_stale, block_id)
+        return True
+    print(f"Failed to update content. Status code: {status_code}, Response: {response_json}")
+    return False
+
+
+async def delete_block_async(block_id):
+    """Archives the given block. Returns True if it was deleted , otherwise False."""
+    status_code, response_json = await notion_async_http.patch(f"/blocks/{block_id}", json={"archived": True})
+    if status_code == 200:
+        print(f"✅ Block {block_id} deleted successfully!")
+        await asyncio.to_thread(mark_cached_block_stale, block_id)
+        return True
+    print(f"❌ Failed to delete block {block_id}. API Response: {response_json}")
+    return False
+
+
+async def add_heading_to_page_async(notion_page_id, heading_text):
+    created_block_ids = await append_children_to_block_async(notion_page_id, [build_heading("heading_1", heading_text, False)])
+    return created_block_ids[0] if created_block_ids else None
+
+
+async def append_toggle_to_given_page_async(notion_page_id, toggle_item_text):
+    created_block_ids = await append_children_to_block_async(notion_page_id, [build_heading("heading_1", toggle_item_text, True)])
+    return created_block_ids[0] if created_block_ids else ""
+
+
+async def append_new_topic_toggles_under_given_toggle_id_async(existing_toggle_id, new_topic_toggle_texts):
+    """Appends one toggleable heading_2 per topic in a single request. Returns their ids in order."""
+    return await append_children_to_block_async(
+        existing_toggle_id,
+        [build_heading("heading_2", each_topic_text, True) for each_topic_text in new_topic_toggle_texts]
+    )
+
+
+async def add_bulleted_list_with_subpoints_async(parent_toggle_id, bullet_points):
+    """
+    Adds a bulleted list , where each bullet may carry sub-bullets , under the given block in one request.
+
+    Args:
+        parent_toggle_id (str): Block under which the list is added.
+        bullet_points (list[dict]): [{"sub_topic": str, "bullet_points": [str, ...]}, ...]
+
+    Returns:
+        list[str] | None: Ids of the created top level bullets.
+    """
+    children = [
+        build_bulleted_list_item(
+            each_bullet["sub_topic"],
+            [build_bulleted_list_item(sub_text) for sub_text in each_bullet.get("bullet_points") or []]
+        )
+        for each_bullet in bullet_points
+    ]
+    return await append_children_to_block_async(parent_toggle_id, children)
+
+
+async def append_toggle_with_bullets_for_change_log_async(notion_page_id, toggle_item_text, bullet_points_list):
+    """
+    Inserts a Change Log toggle right after the first block of the page , with its bullet points
+    sent as children of the toggle in the same request.
+
+    Returns:
+        str | None: Id of the created toggle.
+    """
+    status_code, response_json = await notion_async_http.get(f"/blocks/{notion_page_id}/children", params={"page_size": 1})
+    if status_code != 200:
+        print(f"❌ Failed to fetch child elements. Status Code: {status_code}")
+        return None
+
+    first_children = response_json.get("results", [])
+    if not first_children:
+        print("❌ Could not retrieve an existing child element ID.")
+        return None
+
+    toggle_block = {
+        "object": "block",
+        "type": "toggle",
+        "toggle": {
+            "rich_text": build_rich_text(toggle_item_text),
+            "children": [build_bulleted_list_item(each_bullet_point) for each_bullet_point in bullet_points_list]
+        }
+    }
+    created_block_ids = await append_children_to_block_async(notion_page_id, [toggle_block], after=first_children[0]["id"])
+    return created_block_ids[0] if created_block_ids else None
+
+
+###########################################################################################################
+# Databases
+
+async def iterate_database_query_async(database_id, filter=None, sorts=None, filter_properties=None, page_size=100):
+    """
+    Yields every row (page object) of a database query , following `next_cursor` pagination.
+    `filter_properties` takes property ids (see `resolve_database_property_ids`) to trim every row to those columns.
+
+    Raises:
+        NotionAPIError: If any page of results can not be fetched.
+    """
+    payload = {"page_size": page_size}
+    if filter:
+        payload["filter"] = filter
+    if sorts:
+        payload["sorts"] = sorts
+
+    params = [("filter_properties", each_property_id) for each_property_id in filter_properties] if filter_properties else None
+
+    while True:
+        status_code, response_json = await notion_async_http.post(f"/databases/{database_id}/query", params=params, json=payload)
+        if status_code != 200:
+            raise NotionAPIError(status_code, response_json)
+
+        for each_row in response_json.get("results", []):
+            yield each_row
+
+        next_cursor = response_json.get("next_cursor")
+        if not response_json.get("has_more") or not next_cursor:
+            break
+        payload["start_cursor"] = next_cursor
+
+
+async def query_database_async(database_id, filter=None, sorts=None, filter_properties=None):
+    return [
+        each_row async for each_row in
+        iterate_database_query_async(database_id, filter=filter, sorts=sorts, filter_properties=filter_properties)
+    ]
+
+
+async def create_database_page_async(database_id, properties):
+    """Adds a row to the given database. Returns the created page object , or None on failure."""
+    payload = {"parent": {"database_id": database_id}, "properties": properties}
+    status_code, response_json = await notion_async_http.post("/pages", json=payload)
+    if status_code == 200:
+        return response_json
+    print(f"❌ Error adding row to {database_id}: {status_code}, {response_json}")
+    return None
+
+
+async def create_database_async(parent_page_id, title, properties):
+    """Creates an inline database under the given page. Returns the new database id , or None on failure."""
+    payload = {
+        "parent": {"type": "page_id", "page_id": parent_page_id},
+        "title": build_rich_text(title),
+        "properties": properties
+    }
+    status_code, response_json = await notion_async_http.post("/databases", json=payload)
+    if status_code == 200:
+        database_id = response_json.get("id")
+        print(f"Database created successfully! ID: {database_id}")
+        return database_id
+    print(f"Error: {status_code}, {response_json}")
+    return None
+
+
+async def create_notion_table_async(parent_block_id):
+    return await create_database_async(parent_block_id, "Action Items Table", {
+        "Action Item": {"title": {}},
+        "Status": {
+            "multi_select": {
+                "options": [
+                    {"name": "Not Started", "color": "gray"},
+                    {"name": "Block", "color": "red"},
+                    {"name": "Completed", "color": "green"},
+                    {"name": "In Progress", "color": "blue"},
+                ]
+            }
+        },
+        "Assigned To": {"rich_text": {}}
+    })
+
+
+async def add_page_to_action_items_database_table_by_id_async(database_id, data):
+    return await create_database_page_async(database_id, {
+        "Action Item": {"title": [{"text": {"content": data.get("action_item", "")}}]},
+        "Status": {"multi_select": [{"name": data.get("status", "")}]},
+        "Assigned To": {"rich_text": [{"text": {"content": json.dumps(data.get("assigned_to", []))}}]}
+    })
+
+
+async def add_each_notion_page_action_items_table_id_mapping_async(notion_page_id, action_items_table_id):
+    return await create_database_page_async(ACTION_ITEMS_TABLE_MAPPING_DATABASE_ID, {
+        "notion_page_id": {"title": [{"text": {"content": notion_page_id}}]},
+        "action_item_database_id": {"rich_text": [{"text": {"content": action_items_table_id}}]}
+    })
+
+
+async def add_page_to_meetings_history_database_table_async(adding_page_info):
+    created_page = await create_database_page_async(MEETINGS_HISTORY_DATABASE_ID, {
+        "meeting_name": {"title": [{"text": {"content": adding_page_info.get("meeting_name")}}]},
+        "happened_date": {"rich_text": [{"text": {"content": adding_page_info.get("happened_date")}}]}
+    })
+    meetings_history_mirror.upsert_page(created_page)
+    return created_page
+
+
+async def add_new_notion_page_data_to_existing_notion_pages_database_async(notion_page_id, page_project_title):
+    created_page = await create_database_page_async(EXISTING_NOTION_PAGES_DATABASE_ID, {
+        "notion_page_id": {"title": build_rich_text(notion_page_id)},
+        "page_project_title": {"rich_text": build_rich_text(page_project_title)}
+    })
+    notion_pages_data_mirror.upsert_page(created_page)
+    return created_page
+
+
+async def add_latest_project_details_row_data_async(latest_project_row_data_details):
+    created_page = await create_database_page_async(LATEST_PROJECTS_DATABASE_ID, {
+        "notion_page_id": {"title": [{"text": {"content": latest_project_row_data_details.get("notion_page_id")}}]},
+        "page_project_title": {"rich_text": [{"text": {"content": latest_project_row_data_details.get("page_project_title")}}]},
+        "latest_data": {"rich_text": [{"text": {"content": json.dumps(latest_project_row_data_details.get("latest_data"))}}]}
+    })
+    latest_projects_data_mirror.upsert_page(created_page)
+    return created_page
+
+
+###########################################################################################################
+# Running many coroutines on the caller's event loop
+
+async def run_bounded_tasks(coroutine_function, items, max_concurrency=MAX_CONCURRENT_NEW_PROJECT_TASKS):
+    """
+    Runs `coroutine_function(item)` for every item as tasks of one `asyncio.TaskGroup` on the
+    running event loop , at most `max_concurrency` at the same time.
+
+    Every task shares the loop's aiohttp session of `notion_async_http` instead of starting a
+    loop and a session of its own. A failing item is printed and gives None , so it does not
+    cancel the others.
+
+    Returns:
+        list: Results in the same order as `items`.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def running_one_item(item_index, item):
+        async with semaphore:
+            try:
+                results[item_index] = await coroutine_function(item)
+            except Exception as e:
+                print(f"❌ Task for {item!r:.80} failed: {e!r}")
+
+    async with asyncio.TaskGroup() as task_group:
+        for item_index, item in enumerate(items):
+            task_group.create_task(running_one_item(item_index, item))
+    return results
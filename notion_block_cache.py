@@ -0,0 +1,212 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+
+class NotionBlockTreeCache:
+    """
+    On-disk (SQLite) cache of Notion page block trees.
+
+    For every parent block whose children were fetched, the cache keeps the parent's
+    `last_edited_time` at fetch time along with its ordered list of children. Each child
+    is stored with its id, type, plain text, `has_children` and `last_edited_time`.
+
+    A cached children list is only reused while the parent's `last_edited_time` is the
+    same as the one stored with it, so only subtrees whose parent moved are re-crawled.
+    `version` goes up whenever a saved tree changes the cached block texts , so data built
+    from them (e.g. the projects embedding index) can be cached until then.
+
+    Args:
+        cache_dir (str): Directory where the SQLite database file is created.
+        db_file_name (str): Name of the SQLite database file inside `cache_dir`.
+    """
+
+    def __init__(self, cache_dir=".notion_cache", db_file_name="block_tree_cache.sqlite3"):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, db_file_name)
+        self.version = 0                    # bumped when the cached text of any page changes
+        self._version_lock = threading.Lock()
+
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS block_parents (
+                    parent_id TEXT PRIMARY KEY,
+                    page_id TEXT NOT NULL,
+                    last_edited_time TEXT,
+                    fetched_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_block_parents_page_id ON block_parents (page_id);
+
+                CREATE TABLE IF NOT EXISTS blocks (
+                    parent_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    block_id TEXT NOT NULL,
+                    block_type TEXT,
+                    block_text TEXT,
+                    has_children INTEGER NOT NULL,
+                    last_edited_time TEXT,
+                    PRIMARY KEY (parent_id, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_blocks_block_id ON blocks (block_id);
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def load_page_tree(self, page_id):
+        """
+        Loads every cached children list belonging to the given page.
+
+        Returns:
+            dict: parent_id -> {"last_edited_time": str, "children": list[dict]} where each child
+                  dict has "id", "type", "text", "has_children" and "last_edited_time" keys.
+        """
+        page_tree = {}
+        with closing(self._connect()) as connection:
+            parent_rows = connection.execute(
+                "SELECT parent_id, last_edited_time FROM block_parents WHERE page_id = ?",
+                (page_id,)
+            ).fetchall()
+            for parent_id, last_edited_time in parent_rows:
+                page_tree[parent_id] = {"last_edited_time": last_edited_time, "children": []}
+
+            block_rows = connection.execute(
+                """
+                SELECT blocks.parent_id, blocks.block_id, blocks.block_type, blocks.block_text,
+                       blocks.has_children, blocks.last_edited_time
+                FROM blocks JOIN block_parents ON blocks.parent_id = block_parents.parent_id
+                WHERE block_parents.page_id = ?
+                ORDER BY blocks.parent_id, blocks.position
+                """,
+                (page_id,)
+            ).fetchall()
+            for parent_id, block_id, block_type, block_text, has_children, last_edited_time in block_rows:
+                page_tree[parent_id]["children"].append({
+                    "id": block_id,
+                    "type": block_type,
+                    "text": block_text,
+                    "has_children": bool(has_children),
+                    "last_edited_time": last_edited_time
+                })
+        return page_tree
+
+    def save_page_tree(self, page_id, page_tree):
+        """
+        Replaces the cached tree of the given page with `page_tree` in one transaction.
+
+        Args:
+            page_id (str): The Notion Page Id which owns the tree.
+            page_tree (dict): Same shape as returned by `load_page_tree`.
+        """
+        fetched_at = datetime.now().isoformat()
+        saved_texts = sorted(
+            (parent_id, position, each_child["id"], each_child.get("text"))
+            for parent_id, parent_entry in page_tree.items()
+            for position, each_child in enumerate(parent_entry.get("children", []))
+        )
+        with closing(self._connect()) as connection, connection:
+            cached_texts = connection.execute(
+                """
+                SELECT blocks.parent_id, blocks.position, blocks.block_id, blocks.block_text
+                FROM blocks JOIN block_parents ON blocks.parent_id = block_parents.parent_id
+                WHERE block_parents.page_id = ?
+                ORDER BY blocks.parent_id, blocks.position
+                """,
+                (page_id,)
+            ).fetchall()
+            connection.execute(
+                "DELETE FROM blocks WHERE parent_id IN (SELECT parent_id FROM block_parents WHERE page_id = ?)",
+                (page_id,)
+            )
+            connection.execute("DELETE FROM block_parents WHERE page_id = ?", (page_id,))
+
+            for parent_id, parent_entry in page_tree.items():
+                connection.execute(
+                    "INSERT OR REPLACE INTO block_parents (parent_id, page_id, last_edited_time, fetched_at) VALUES (?, ?, ?, ?)",
+                    (parent_id, page_id, parent_entry.get("last_edited_time"), fetched_at)
+                )
+                connection.execute("DELETE FROM blocks WHERE parent_id = ?", (parent_id,))
+                connection.executemany(
+                    """
+                    INSERT INTO blocks (parent_id, position, block_id, block_type, block_text, has_children, last_edited_time)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            parent_id, position, each_child["id"], each_child.get("type"), each_child.get("text"),
+                            int(bool(each_child.get("has_children"))), each_child.get("last_edited_time")
+                        )
+                        for position, each_child in enumerate(parent_entry.get("children", []))
+                    ]
+                )
+
+        if [tuple(each_row) for each_row in cached_texts] != saved_texts:
+            with self._version_lock:
+                self.version += 1
+
+    @staticmethod
+    def _candidate_ids(block_id):
+        # Fetched ids are stored dashed , ids pasted by users and LLMs (and page ids in URLs) often are not
+        candidate_ids = [block_id]
+        compact_id = block_id.replace("-", "").lower()
+        if len(compact_id) == 32:
+            dashed_id = f"{compact_id[:8]}-{compact_id[8:12]}-{compact_id[12:16]}-{compact_id[16:20]}-{compact_id[20:]}"
+            candidate_ids += [each_id for each_id in (dashed_id, compact_id) if each_id != block_id]
+        return candidate_ids
+
+    def lookup_block(self, block_id):
+        """
+        Looks up a block seen by any cached page fetch , so edit tools can skip a GET for its type.
+
+        Args:
+            block_id (str): Block id , with or without dashes.
+
+        Returns:
+            dict | None: {"id", "type", "parent_id", "page_id"} or None when the block was never fetched.
+        """
+        with closing(self._connect()) as connection:
+            for each_candidate_id in self._candidate_ids(block_id):
+                row = connection.execute(
+                    """
+                    SELECT blocks.block_id, blocks.block_type, blocks.parent_id, block_parents.page_id
+                    FROM blocks JOIN block_parents ON blocks.parent_id = block_parents.parent_id
+                    WHERE blocks.block_id = ?
+                    """,
+                    (each_candidate_id,)
+                ).fetchone()
+                if row:
+                    return {"id": row[0], "type": row[1], "parent_id": row[2], "page_id": row[3]}
+        return None
+
+    def mark_block_stale(self, block_id):
+        """
+        Forgets the stored `last_edited_time` of the two children lists a write to `block_id` changes:
+        the block's own children (appends) and its parent's children , which hold its text and
+        `has_children`. Only those lists are fetched again on the next crawl , the rest of the page
+        and the block types stay cached. Needed because Notion rounds `last_edited_time` to the
+        minute , so a write does not always move it.
+
+        Returns:
+            bool: True if any cached entry was marked.
+        """
+        candidate_ids = self._candidate_ids(block_id)
+        placeholders = ", ".join("?" * len(candidate_ids))
+        with closing(self._connect()) as connection, connection:
+            marked_count = connection.execute(
+                f"""
+                UPDATE block_parents SET last_edited_time = NULL
+                WHERE parent_id IN ({placeholders})
+                   OR parent_id IN (SELECT parent_id FROM blocks WHERE block_id IN ({placeholders}))
+                """,
+                candidate_ids + candidate_ids
+            ).rowcount
+        return marked_count > 0
+
+    def clear_page_tree(self, page_id):
+        """Removes every cached entry of the given page , forcing a full crawl on next fetch."""
+        self.save_page_tree(page_id, {})
@@ -0,0 +1,151 @@
+import os
+import concurrent.futures
+from notion_api_tools import update_block_content, delete_block, append_bulleted_list_to_block, notion_block_tree_cache
+
+
+# Notion accepts at most 100 children in one append request
+MAX_BULLETS_PER_APPEND = 100
+MAX_CONCURRENT_CHANGE_REQUESTS = int(os.getenv("NOTION_MAX_CONCURRENT_CHANGE_REQUESTS", "8"))
+
+
+def normalize_block_id(block_id):
+    # The LLM returns ids dashed , undashed and in either case , Notion accepts the undashed lower case form
+    return block_id.replace("-", "").lower()
+
+
+def find_cached_ancestor_ids(block_id, block_tree_cache):
+    """Returns the normalized ids of the cached ancestors of the given block , nearest first."""
+    ancestor_ids = []
+    cached_block_info = block_tree_cache.lookup_block(block_id)
+    while cached_block_info and cached_block_info.get("parent_id"):
+        parent_id = normalize_block_id(cached_block_info["parent_id"])
+        if parent_id in ancestor_ids:
+            break
+        ancestor_ids.append(parent_id)
+        cached_block_info = block_tree_cache.lookup_block(parent_id)
+    return ancestor_ids
+
+
+def plan_block_changes(changes, block_tree_cache=None):
+    """
+    Turns the LLM suggested changes of one page into the smallest set of Notion requests
+    which gives the same result as applying them one by one in the given order.
+
+    - Appends are grouped by target block , keeping their order , and sent as one children
+      PATCH per `MAX_BULLETS_PER_APPEND` bullets.
+    - Only the last update of a block is kept.
+    - Updates and appends targeting a block which is deleted in the same change set are dropped,
+      since they are either archived along with it or rejected by Notion. With `block_tree_cache`
+      this covers blocks nested anywhere under a deleted block as well , their deletes included.
+    - Block ids are compared in their normalized (undashed , lower case) form.
+
+    Args:
+        changes (list[dict]): [{"objectId": str, "ChangeType": "update" | "delete" | "append", "ContentForChange": str}, ...]
+        block_tree_cache (NotionBlockTreeCache): Cache of the fetched page , used to find the parents of the targets.
+
+    Returns:
+        dict: {
+            "deletes": [block_id, ...],
+            "updates": {block_id: new_text_content},
+            "appends": {block_id: [[bullet, ...], ...]}   # one inner list per request
+        }
+    """
+    deleted_block_ids = []
+    latest_update_by_block_id = {}
+    appended_bullets_by_block_id = {}
+
+    for change in changes:
+        block_id = change.get("objectId")
+        change_type = change.get("ChangeType")
+        content = change.get("ContentForChange")
+        if not block_id:
+            continue
+        block_id = normalize_block_id(block_id)
+
+        if change_type == "update":
+            latest_update_by_block_id[block_id] = content
+        elif change_type == "delete":
+            if block_id not in deleted_block_ids:
+                deleted_block_ids.append(block_id)
+        elif change_type == "append":
+            appended_bullets_by_block_id.setdefault(block_id, []).append(content)
+        else:
+            print(f"⚠️ Skipping change with unknown ChangeType {change_type} for ObjectId {block_id}")
+
+    deleted_block_id_set = set(deleted_block_ids)
+    if block_tree_cache is not None:
+        # Archiving a block archives its whole subtree , so a change below a deleted block is dropped too
+        target_block_ids = set(deleted_block_ids) | set(latest_update_by_block_id) | set(appended_bullets_by_block_id)
+        blocks_under_deleted_block = {
+            block_id for block_id in target_block_ids
+            if deleted_block_id_set.intersection(find_cached_ancestor_ids(block_id, block_tree_cache))
+        }
+        deleted_block_ids = [block_id for block_id in deleted_block_ids if block_id not in blocks_under_deleted_block]
+        deleted_block_id_set |= blocks_under_deleted_block
+
+    return {
+        "deletes": deleted_block_ids,
+        "updates": {
+            block_id: content for block_id, content in latest_update_by_block_id.items()
+            if block_id not in deleted_block_id_set
+        },
+        "appends": {
+            block_id: [
+                bullet_points[start_index:start_index + MAX_BULLETS_PER_APPEND]
+                for start_index in range(0, len(bullet_points), MAX_BULLETS_PER_APPEND)
+            ]
+            for block_id, bullet_points in appended_bullets_by_block_id.items()
+            if block_id not in deleted_block_id_set
+        }
+    }
+
+
+def apply_block_changes(changes, max_workers=MAX_CONCURRENT_CHANGE_REQUESTS):
+    """
+    Plans the given changes with `plan_block_changes` and sends them concurrently.
+
+    Every planned request touches a different block (chunks appended to the same block are
+    sent one after another to keep their order) , so they are independent of each other. The
+    shared `notion_http` rate limiter keeps the concurrent requests under the API ceiling.
+
+    Returns:
+        dict: {"requests": int, "succeeded": int, "failed": int, "skipped_changes": int}
+    """
+    # Planned before any request is sent , from the cached tree which gives the block parents
+    planned_changes = plan_block_changes(changes, block_tree_cache=notion_block_tree_cache)
+
+    def appending_bullets_in_order(block_id, bullet_point_chunks):
+        return all(
+            append_bulleted_list_to_block.invoke(input={"adding_content_info": {"blockId": block_id, "bullet_points_list": each_chunk}})
+            for each_chunk in bullet_point_chunks
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(delete_block.invoke, input={"deleting_block_info": {"blockId": block_id}})
+            for block_id in planned_changes["deletes"]
+        ]
+        futures += [
+            executor.submit(update_block_content.invoke, input={"updating_block_info": {"blockId": block_id, "new_text_content": content}})
+            for block_id, content in planned_changes["updates"].items()
+        ]
+        futures += [
+            executor.submit(appending_bullets_in_order, block_id, bullet_point_chunks)
+            for block_id, bullet_point_chunks in planned_changes["appends"].items()
+        ]
+        results = [future.result() for future in futures]
+
+    total_requests = (
+        len(planned_changes["deletes"]) + len(planned_changes["updates"])
+        + sum(len(bullet_point_chunks) for bullet_point_chunks in planned_changes["appends"].values())
+    )
+    succeeded = sum(1 for each_result in results if each_result)
+    summary = {
+        "requests": total_requests,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "skipped_changes": len(changes) - len(planned_changes["deletes"]) - len(planned_changes["updates"])
+                           - sum(len(chunk) for chunks in planned_changes["appends"].values() for chunk in chunks)
+    }
+    print(f"🟢 Applied {len(changes)} changes with {total_requests} requests , summary: {summary}")
+    return summary
@@ -0,0 +1,223 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+
+# Lower-cases , drops punctuation and collapses whitespace , so "Marketing-Agent  Sync" == "marketing agent sync"
+def normalize_lookup_key(text):
+    return " ".join(re.sub(r"[^\w\s]", " ", str(text or "").lower()).split())
+
+
+class NotionDatabaseMirror:
+    """
+    Local (SQLite + in-memory) mirror of one Notion database.
+
+    Each row is kept as the small dict built by `row_extractor` from the row's properties, along
+    with its `last_edited_time`. `sync` only asks Notion for rows edited on or after its sync
+    cursor , the newest `last_edited_time` seen in its own query results (rows written through
+    `upsert_page` never move it) , and does nothing at all when the last sync is younger
+    than `min_sync_interval_seconds`. Archived rows never show up in an incremental query, so a
+    full re-read replaces the mirror every `full_resync_interval_seconds`.
+
+    Rows are also indexed in memory by the normalized value of `key_field`, so lookups and prompt
+    building read from memory only. `version` goes up whenever a row is added , changed or
+    removed , so data built from the rows (e.g. an embedding index) can be cached until then.
+
+    Args:
+        database_id (str): The Notion Database Id to mirror.
+        row_extractor (callable): properties dict -> plain row dict.
+        key_field (str): Field of the extracted row used for the lookup index.
+        query_rows (callable): Paginated query function , `iterate_database_rows` in notion_api_tools.
+        filter_properties (list[str]): Columns requested from Notion , None for all.
+        cache_dir (str): Directory where the SQLite database file is created.
+        db_file_name (str): Name of the SQLite database file inside `cache_dir`.
+        min_sync_interval_seconds (float): Syncs requested more often than this are skipped.
+        full_resync_interval_seconds (float): Age after which a sync re-reads the whole database.
+    """
+
+    def __init__(self, database_id, row_extractor, key_field, query_rows, filter_properties=None,
+                 cache_dir=".notion_cache", db_file_name="database_mirror.sqlite3",
+                 min_sync_interval_seconds=300.0, full_resync_interval_seconds=86400.0):
+        self.database_id = database_id
+        self.row_extractor = row_extractor
+        self.key_field = key_field
+        self.query_rows = query_rows
+        self.filter_properties = filter_properties
+        self.min_sync_interval_seconds = min_sync_interval_seconds
+        self.full_resync_interval_seconds = full_resync_interval_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, db_file_name)
+
+        self._lock = threading.RLock()
+        self.rows_by_id = {}
+        self.row_ids_by_key = {}
+        self.last_synced_at = 0.0           # time.monotonic() of the last sync of this process
+        self.last_full_synced_at = None     # datetime of the last full re-read , kept on disk
+        self.sync_cursor = None             # newest last_edited_time returned by a sync query , kept on disk
+        self.version = 0                    # bumped on every change of the mirrored rows
+
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS mirrored_rows (
+                    database_id TEXT NOT NULL,
+                    row_id TEXT NOT NULL,
+                    last_edited_time TEXT,
+                    row_json TEXT NOT NULL,
+                    PRIMARY KEY (database_id, row_id)
+                );
+                CREATE TABLE IF NOT EXISTS mirror_sync_state (
+                    database_id TEXT PRIMARY KEY,
+                    last_full_synced_at TEXT,
+                    sync_cursor TEXT
+                );
+                """
+            )
+            sync_state_columns = [column[1] for column in connection.execute("PRAGMA table_info(mirror_sync_state)")]
+            if "sync_cursor" not in sync_state_columns:
+                # Mirrors created before the cursor existed start from a full re-read
+                connection.execute("ALTER TABLE mirror_sync_state ADD COLUMN sync_cursor TEXT")
+                connection.execute("UPDATE mirror_sync_state SET last_full_synced_at = NULL")
+        self._load_from_disk()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def _load_from_disk(self):
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT row_id, last_edited_time, row_json FROM mirrored_rows WHERE database_id = ? ORDER BY last_edited_time, row_id",
+                (self.database_id,)
+            ).fetchall()
+            sync_state = connection.execute(
+                "SELECT last_full_synced_at, sync_cursor FROM mirror_sync_state WHERE database_id = ?",
+                (self.database_id,)
+            ).fetchone()
+
+        with self._lock:
+            self.rows_by_id = {}
+            self.row_ids_by_key = {}
+            for row_id, last_edited_time, row_json in rows:
+                self._index_row(row_id, last_edited_time, json.loads(row_json))
+            self.last_full_synced_at = datetime.fromisoformat(sync_state[0]) if sync_state and sync_state[0] else None
+            self.sync_cursor = sync_state[1] if sync_state else None
+
+    def _index_row(self, row_id, last_edited_time, row):
+        previous_entry = self.rows_by_id.get(row_id)
+        if previous_entry is not None:
+            previous_key = normalize_lookup_key(previous_entry["row"].get(self.key_field))
+            self.row_ids_by_key.get(previous_key, set()).discard(row_id)
+
+        self.rows_by_id[row_id] = {"last_edited_time": last_edited_time, "row": row}
+        self.row_ids_by_key.setdefault(normalize_lookup_key(row.get(self.key_field)), set()).add(row_id)
+
+    def _store_rows(self, changed_pages, replace_all=False, sync_cursor=None):
+        extracted_rows = [
+            (page["id"], page.get("last_edited_time"), self.row_extractor(page.get("properties", {})))
+            for page in changed_pages
+        ]
+        with self._lock:
+            with closing(self._connect()) as connection, connection:
+                if replace_all:
+                    connection.execute("DELETE FROM mirrored_rows WHERE database_id = ?", (self.database_id,))
+                    self.last_full_synced_at = datetime.now()
+                    connection.execute(
+                        "INSERT OR REPLACE INTO mirror_sync_state (database_id, last_full_synced_at) VALUES (?, ?)",
+                        (self.database_id, self.last_full_synced_at.isoformat())
+                    )
+                if sync_cursor is not None:
+                    connection.execute("INSERT OR IGNORE INTO mirror_sync_state (database_id) VALUES (?)", (self.database_id,))
+                    connection.execute(
+                        "UPDATE mirror_sync_state SET sync_cursor = ? WHERE database_id = ?",
+                        (sync_cursor, self.database_id)
+                    )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO mirrored_rows (database_id, row_id, last_edited_time, row_json) VALUES (?, ?, ?, ?)",
+                    [(self.database_id, row_id, last_edited_time, json.dumps(row)) for row_id, last_edited_time, row in extracted_rows]
+                )
+
+            if sync_cursor is not None:
+                self.sync_cursor = sync_cursor
+            # Incremental syncs read the boundary rows again , only a real difference counts as a change
+            rows_changed = any(
+                self.rows_by_id.get(row_id) != {"last_edited_time": last_edited_time, "row": row}
+                for row_id, last_edited_time, row in extracted_rows
+            )
+            if replace_all:
+                rows_changed = rows_changed or set(self.rows_by_id) != {row_id for row_id, _, _ in extracted_rows}
+                self.rows_by_id = {}
+                self.row_ids_by_key = {}
+            for row_id, last_edited_time, row in extracted_rows:
+                self._index_row(row_id, last_edited_time, row)
+            if rows_changed:
+                self.version += 1
+
+    def sync(self, force=False):
+        """
+        Pulls rows changed since the last sync into the mirror.
+
+        Args:
+            force (bool): Sync even if the last sync is younger than `min_sync_interval_seconds`.
+
+        Returns:
+            int: Number of rows fetched from Notion (0 when the sync was skipped).
+
+        Raises:
+            requests.RequestException: If the query fails , the mirror is left as it was.
+        """
+        with self._lock:
+            if not force and self.last_synced_at and time.monotonic() - self.last_synced_at < self.min_sync_interval_seconds:
+                return 0
+
+            full_resync_due = (
+                self.last_full_synced_at is None
+                or (datetime.now() - self.last_full_synced_at).total_seconds() >= self.full_resync_interval_seconds
+            )
+            latest_edited_time = None if full_resync_due else self.sync_cursor
+
+            query_filter = None
+            if latest_edited_time:
+                # last_edited_time is rounded to the minute by Notion , so the boundary rows are read again and just overwritten
+                query_filter = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": latest_edited_time}}
+
+            changed_pages = list(self.query_rows(
+                self.database_id,
+                filter=query_filter,
+                sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+                filter_properties=self.filter_properties
+            ))
+            # The cursor only moves with rows this query returned , never with rows the agent wrote itself
+            fetched_edited_times = [page.get("last_edited_time") for page in changed_pages if page.get("last_edited_time")]
+            if latest_edited_time:
+                fetched_edited_times.append(latest_edited_time)
+            next_sync_cursor = max(fetched_edited_times) if fetched_edited_times else None
+            self._store_rows(changed_pages, replace_all=query_filter is None, sync_cursor=next_sync_cursor)
+            self.last_synced_at = time.monotonic()
+
+        print(f"🟢 Synced mirror of database {self.database_id} , {len(changed_pages)} rows fetched , {len(self.rows_by_id)} rows mirrored")
+        return len(changed_pages)
+
+    def upsert_page(self, page):
+        """
+        Writes a page object returned by Notion (e.g. from a create / update call) straight into the mirror.
+
+        The sync cursor is left alone , so rows other people edited before this write are still fetched by the next sync.
+        """
+        if page and page.get("id"):
+            self._store_rows([page])
+
+    def get_rows(self):
+        """Returns every mirrored row , oldest edit first."""
+        with self._lock:
+            ordered_entries = sorted(self.rows_by_id.values(), key=lambda entry: entry["last_edited_time"] or "")
+            return [dict(entry["row"]) for entry in ordered_entries]
+
+    def find_by_key(self, text):
+        """Returns the rows whose normalized `key_field` equals the normalized `text`."""
+        with self._lock:
+            return [dict(self.rows_by_id[row_id]["row"]) for row_id in self.row_ids_by_key.get(normalize_lookup_key(text), ())]
@@ -0,0 +1,431 @@
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+NOTION_API_BASE_URL = "https://api.notion.com/v1"
+NOTION_API_VERSION = "2022-06-28"
+
+# Responses which are retried with backoff , 429 is rate limited and 5xx are transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# aiohttp errors raised before the request left this machine , safe to retry for writes as well
+ASYNC_CONNECT_FAILURE_ERRORS = (aiohttp.ClientConnectorError, getattr(aiohttp, "ConnectionTimeoutError", aiohttp.ClientConnectorError))
+
+
+def is_idempotent_notion_request(method, url):
+    """
+    Tells whether sending the request twice leaves Notion as sending it once.
+
+    Creates (POST /pages) and appends (PATCH /blocks/{id}/children) are not: when a 5xx or a read
+    timeout comes back Notion may already have written the change , and a retry writes it again.
+    POST /databases/{id}/query and POST /search only read.
+    """
+    path = url.split("?", 1)[0].rstrip("/")
+    if method in ("GET", "DELETE"):
+        return True
+    if method == "POST":
+        return path.endswith("/query") or path.endswith("/search")
+    if method == "PATCH":
+        return not path.endswith("/children")
+    return False
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket shared by every request sent to the Notion API.
+
+    Tokens refill at `rate_per_second` up to `burst`. Each request takes one token and waits
+    when the bucket is empty, so concurrent callers are spread out at the API ceiling instead
+    of bursting into 429s. Async callers use `reserve` and sleep with `asyncio.sleep`, so
+    threads and event loops share one budget. `pause` empties the bucket and delays refilling, which is used to
+    honor the `Retry-After` header of a throttled response.
+
+    Args:
+        rate_per_second (float): Sustained number of requests allowed per second.
+        burst (int): Maximum number of requests which may be sent back to back.
+    """
+
+    def __init__(self, rate_per_second=3.0, burst=3):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        # Moment at which `tokens` was last computed , may be in the future while paused
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes one token without sleeping. Returns the number of seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated_at:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate_per_second)
+                self.updated_at = now
+            self.tokens -= 1
+            wait_seconds = max(0.0, self.updated_at - now)
+            if self.tokens < 0:
+                wait_seconds += -self.tokens / self.rate_per_second
+        return wait_seconds
+
+    def acquire(self):
+        """Takes one token , sleeping until it is available. Returns the number of seconds waited."""
+        wait_seconds = self.reserve()
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    def pause(self, seconds):
+        """Stops handing out tokens for the given number of seconds."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self.updated_at:
+                self.tokens = min(self.tokens, 0.0)
+                self.updated_at = resume_at
+
+
+class AsyncHTTPClientBase:
+    """
+    Shared base of the aiohttp clients (`AsyncNotionHTTP` , `AsyncSlackHTTP`).
+
+    Keeps one `aiohttp.ClientSession` (keep-alive pool limited to `pool_size` connections, with
+    `headers` preset) per running event loop , so coroutines on different loops never share a
+    session bound to another loop. A loop's session is closed when the loop shuts down its async
+    generators , which `asyncio.run` does before closing the loop. Loops closed any other way
+    should await `close()` first.
+
+    `_send_with_retries` takes a token from a `TokenBucketRateLimiter` before every attempt and
+    retries throttled responses (after pausing the limiter for `Retry-After`) , 5xx and connection
+    errors with jittered exponential backoff. Requests which are not safe to resend are only retried
+    when throttled or when the connection could not be opened.
+
+    Args:
+        headers (dict): Headers sent with every request.
+        timeout (aiohttp.ClientTimeout): Timeout of every request.
+        pool_size (int): Maximum number of open connections per event loop.
+        max_retries (int): Number of retries for throttled , 5xx or failed-to-connect requests.
+        backoff_base_seconds (float): First backoff step , doubled on every retry.
+        backoff_max_seconds (float): Upper bound of a single backoff.
+    """
+
+    def __init__(self, headers, timeout, pool_size=10, max_retries=5, backoff_base_seconds=0.5, backoff_max_seconds=30.0):
+        self.headers = headers
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        # event loop -> (ClientSession , async generator closing it on loop shutdown) , entries go away when the loop shuts down
+        self._sessions = {}
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "requests_sent": 0,
+            "throttled": 0,
+            "retried": 0,
+            "failed_after_retries": 0,
+            "rate_limit_wait_seconds": 0.0
+        }
+
+    def _count(self, stat_name, amount=1):
+        with self._stats_lock:
+            self.stats[stat_name] += amount
+
+    def get_stats(self):
+        """Returns a copy of the request counters (sent , throttled , retried , failed_after_retries , waits)."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    async def _close_on_loop_shutdown(self, loop, session):
+        # Suspended at the yield until the loop's `shutdown_asyncgens()` closes it
+        try:
+            yield
+        finally:
+            if self._sessions.get(loop, (None,))[0] is session:
+                del self._sessions[loop]
+            if not session.closed:
+                await session.close()
+
+    async def _get_session(self):
+        loop = asyncio.get_running_loop()
+        # Loops closed without shutting down their async generators can not close their session any more , just forgetting them
+        for each_loop in [each_loop for each_loop in list(self._sessions) if each_loop.is_closed()]:
+            self._sessions.pop(each_loop, None)
+
+        session_entry = self._sessions.get(loop)
+        if session_entry is None or session_entry[0].closed:
+            session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.pool_size)
+            )
+            shutdown_closer = self._close_on_loop_shutdown(loop, session)
+            await shutdown_closer.asend(None)
+            self._sessions[loop] = (session, shutdown_closer)
+        return self._sessions[loop][0]
+
+    async def close(self):
+        """Closes the session of the running event loop , for loops which are closed without `asyncio.run`."""
+        session_entry = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session_entry is not None:
+            session, shutdown_closer = session_entry
+            await shutdown_closer.aclose()
+            if not session.closed:
+                await session.close()
+
+    def _backoff_seconds(self, attempt):
+        # Full jitter , random wait between 0 and the exponential step
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** attempt)))
+
+    @staticmethod
+    def _retry_after_seconds(retry_after_header):
+        try:
+            return float(retry_after_header)
+        except (TypeError, ValueError):
+            return None
+
+    async def _send_with_retries(self, log_label, rate_limiter, safe_to_resend, is_throttled, method, url, **kwargs):
+        """
+        Sends one request , retrying throttled / transient failures.
+
+        Args:
+            log_label (str): Prefix of the retry warnings , e.g. "Notion PATCH <url>".
+            rate_limiter (TokenBucketRateLimiter): Limiter the request takes its token from , paused when throttled.
+            safe_to_resend (bool): False for writes which Notion / Slack may already have applied after a timeout or 5xx.
+            is_throttled (callable): (status_code, response_json) -> bool.
+
+        Returns:
+            tuple: (status_code, response_json) of the last attempt. Bodies which are not JSON come back as {"message": <text>}.
+
+        Raises:
+            aiohttp.ClientConnectionError , asyncio.TimeoutError: When the last attempt got no response.
+        """
+        session = await self._get_session()
+
+        for attempt in range(self.max_retries + 1):
+            wait_seconds = rate_limiter.reserve()
+            self._count("rate_limit_wait_seconds", wait_seconds)
+            if wait_seconds > 0:
+                await asyncio.sleep(wait_seconds)
+            self._count("requests_sent")
+
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    status_code = response.status
+                    retry_after_header = response.headers.get("Retry-After")
+                    response_text = await response.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                # A write which may have reached the server is not sent again , only a failed connect is safe to retry
+                if attempt == self.max_retries or not (safe_to_resend or isinstance(e, ASYNC_CONNECT_FAILURE_ERRORS)):
+                    self._count("failed_after_retries")
+                    raise
+                wait_seconds = self._backoff_seconds(attempt)
+                logging.warning("%s failed (%s) , retrying in %.1fs", log_label, e, wait_seconds)
+                self._count("retried")
+                await asyncio.sleep(wait_seconds)
+                continue
+
+            try:
+                response_json = json.loads(response_text) if response_text else {}
+            except json.JSONDecodeError:
+                response_json = {"message": response_text}
+
+            throttled = is_throttled(status_code, response_json)
+            if not throttled and status_code not in RETRYABLE_STATUS_CODES:
+                return status_code, response_json
+            if attempt == self.max_retries or not (throttled or safe_to_resend):
+                # The server may have applied a write before failing , surfacing the 5xx instead of applying it twice
+                self._count("failed_after_retries")
+                return status_code, response_json
+
+            if throttled:
+                self._count("throttled")
+                retry_after_seconds = self._retry_after_seconds(retry_after_header)
+                wait_seconds = retry_after_seconds if retry_after_seconds is not None else self._backoff_seconds(attempt)
+                # Pausing the shared limiter , so every caller using it waits as well
+                rate_limiter.pause(wait_seconds)
+            else:
+                wait_seconds = self._backoff_seconds(attempt)
+                await asyncio.sleep(wait_seconds)
+
+            logging.warning("%s returned %s , retrying in %.1fs", log_label, status_code, wait_seconds)
+            self._count("retried")
+
+
+class NotionHTTP:
+    """
+    Shared HTTP client for the Notion API.
+
+    Wraps a single `requests.Session` with a keep-alive connection pool, so repeated calls
+    reuse the same TCP+TLS connections instead of doing a new handshake per request. The
+    Authorization, Notion-Version and Content-Type headers are preset on the session.
+
+    Every request first takes a token from the shared `TokenBucketRateLimiter`. Responses with
+    a status in `RETRYABLE_STATUS_CODES` and connection errors are retried with jittered
+    exponential backoff , and a 429 pauses the limiter for its `Retry-After` seconds. When all
+    retries are used up the last response is returned as it is , so callers keep their status checks.
+    Requests which are not idempotent (see `is_idempotent_notion_request`) are only retried after a
+    429 or a failure to connect , both of which mean Notion never received them.
+
+    Args:
+        api_key (str): Notion integration token.
+        pool_size (int): Maximum number of kept-alive connections to api.notion.com.
+        connect_timeout (float): Seconds to wait for a connection to be established.
+        read_timeout (float): Seconds to wait for the server to send a response.
+        notion_version (str): Value sent in the Notion-Version header.
+        base_url (str): Prefix used when a path (e.g. "/blocks/{id}") is given instead of a full URL.
+        rate_limiter (TokenBucketRateLimiter): Limiter shared by every request , 3 requests/second by default.
+        max_retries (int): Number of retries for throttled , 5xx or failed-to-connect requests.
+        backoff_base_seconds (float): First backoff step , doubled on every retry.
+        backoff_max_seconds (float): Upper bound of a single backoff.
+
+    Example Usage:
+        response = notion_http.get(f"/blocks/{block_id}/children", params={"page_size": 100})
+        response = notion_http.patch(f"https://api.notion.com/v1/blocks/{block_id}", json=payload)
+    """
+
+    def __init__(self, api_key, pool_size=10, connect_timeout=5.0, read_timeout=30.0,
+                 notion_version=NOTION_API_VERSION, base_url=NOTION_API_BASE_URL,
+                 rate_limiter=None, max_retries=5, backoff_base_seconds=0.5, backoff_max_seconds=30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter()
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "requests_sent": 0,
+            "throttled": 0,           # 429 responses received
+            "retried": 0,             # requests sent again after 429 / 5xx / connection error
+            "failed_after_retries": 0,
+            "rate_limit_wait_seconds": 0.0
+        }
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Notion-Version": notion_version
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def build_url(self, path_or_url):
+        if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    def _count(self, stat_name, amount=1):
+        with self._stats_lock:
+            self.stats[stat_name] += amount
+
+    def get_stats(self):
+        """Returns a copy of the request counters (sent , throttled , retried , failed_after_retries , waits)."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _backoff_seconds(self, attempt):
+        # Full jitter , random wait between 0 and the exponential step
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** attempt)))
+
+    @staticmethod
+    def _retry_after_seconds(response):
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _failed_before_sending(error):
+        # Connect timeouts and refused / unresolvable connections , the request never left this machine
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        error_reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(error_reason, (NewConnectionError, ConnectTimeoutError))
+
+    def request(self, method, path_or_url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.build_url(path_or_url)
+        idempotent = is_idempotent_notion_request(method, url)
+
+        for attempt in range(self.max_retries + 1):
+            self._count("rate_limit_wait_seconds", self.rate_limiter.acquire())
+            self._count("requests_sent")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries or not (idempotent or self._failed_before_sending(e)):
+                    self._count("failed_after_retries")
+                    raise
+                wait_seconds = self._backoff_seconds(attempt)
+                logging.warning("Notion %s %s failed (%s) , retrying in %.1fs", method, url, e, wait_seconds)
+                self._count("retried")
+                time.sleep(wait_seconds)
+                continue
+
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            if response.status_code != 429 and not idempotent:
+                # Notion may have written the change before failing , surfacing the 5xx instead of writing it twice
+                self._count("failed_after_retries")
+                return response
+            if attempt == self.max_retries:
+                self._count("failed_after_retries")
+                return response
+
+            if response.status_code == 429:
+                self._count("throttled")
+                retry_after_seconds = self._retry_after_seconds(response)
+                wait_seconds = retry_after_seconds if retry_after_seconds is not None else self._backoff_seconds(attempt)
+                # Every thread waits , not only the one which got throttled
+                self.rate_limiter.pause(wait_seconds)
+            else:
+                wait_seconds = self._backoff_seconds(attempt)
+                time.sleep(wait_seconds)
+
+            logging.warning("Notion %s %s returned %s , retrying in %.1fs", method, url, response.status_code, wait_seconds)
+            self._count("retried")
+
+        return response
+
+    def get(self, path_or_url, **kwargs):
+        return self.request("GET", path_or_url, **kwargs)
+
+    def post(self, path_or_url, **kwargs):
+        return self.request("POST", path_or_url, **kwargs)
+
+    def patch(self, path_or_url, **kwargs):
+        return self.request("PATCH", path_or_url, **kwargs)
+
+    def delete(self, path_or_url, **kwargs):
+        return self.request("DELETE", path_or_url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+# Single client shared by every Notion tool function
+notion_http = NotionHTTP(
+    os.getenv("NOTION_API_KEY"),
+    pool_size=int(os.getenv("NOTION_HTTP_POOL_SIZE", "10")),
+    connect_timeout=float(os.getenv("NOTION_HTTP_CONNECT_TIMEOUT", "5")),
+    read_timeout=float(os.getenv("NOTION_HTTP_READ_TIMEOUT", "30")),
+    rate_limiter=TokenBucketRateLimiter(
+        rate_per_second=float(os.getenv("NOTION_RATE_LIMIT_PER_SECOND", "3")),
+        burst=int(os.getenv("NOTION_RATE_LIMIT_BURST", "3"))
+    ),
+    max_retries=int(os.getenv("NOTION_HTTP_MAX_RETRIES", "5"))
+)
@@ -0,0 +1,256 @@
+import os
+import re
+import heapq
+import itertools
+from embedding_index import EmbeddingIndex
+
+try:
+    import tiktoken
+except ImportError:    # token counts fall back to a characters based estimate
+    tiktoken = None
+
+
+CHANGES_PROMPT_TOKEN_BUDGET = int(os.getenv("CHANGES_PROMPT_TOKEN_BUDGET", "12000"))
+
+# Dashed or undashed Notion ids
+NOTION_ID_PATTERN = re.compile(r"\b[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}\b", re.IGNORECASE)
+# "1.2.3 - text {id: ...}" and "1.2 Data not fetched for ObjectId ..." lines of `fetch_notion_page_content`
+CONTENT_LINE_PATTERN = re.compile(r"^(\d+(?:\.\d+)*)\s")
+OMITTED_MARKER_TOKENS = 16
+
+_encodings_by_model_name = {}
+
+
+def count_tokens(text, model_name="gpt-4o-mini"):
+    """
+    Counts the tokens of `text` locally , with tiktoken when it is installed.
+
+    Without tiktoken one token is taken as 4 characters , which is close enough for budgeting English text.
+    """
+    text = str(text or "")
+    if tiktoken is None:
+        return (len(text) + 3) // 4
+
+    encoding = _encodings_by_model_name.get(model_name)
+    if encoding is None:
+        try:
+            encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        _encodings_by_model_name[model_name] = encoding
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class BlockIdAliaser:
+    """
+    Replaces Notion block ids in prompt text with short aliases ("b1" , "b2" , ...) and maps them back.
+
+    A 36 character UUID costs around 20 tokens , an alias one or two , and page content has one
+    id per line.
+
+    Example Usage:
+        block_id_aliases = BlockIdAliaser()
+        aliased_content = block_id_aliases.alias_text(fetched_notion_content)
+        ... LLM answers with "objectId": "b12" ...
+        changes = block_id_aliases.restore_changes(changes)
+    """
+
+    def __init__(self, alias_prefix="b"):
+        self.alias_prefix = alias_prefix
+        self.alias_by_block_id = {}
+        self.block_id_by_alias = {}
+
+    def alias_for(self, block_id):
+        normalized_block_id = block_id.replace("-", "").lower()
+        alias = self.alias_by_block_id.get(normalized_block_id)
+        if alias is None:
+            alias = f"{self.alias_prefix}{len(self.alias_by_block_id) + 1}"
+            self.alias_by_block_id[normalized_block_id] = alias
+            self.block_id_by_alias[alias.lower()] = block_id
+        return alias
+
+    def alias_text(self, text):
+        return NOTION_ID_PATTERN.sub(lambda id_match: self.alias_for(id_match.group(0)), str(text or ""))
+
+    def resolve(self, alias_or_block_id):
+        """Returns the block id of an alias , anything which is not a known alias is returned as it is."""
+        if not isinstance(alias_or_block_id, str):
+            return alias_or_block_id
+        # LLMs echo aliases as "B12" , "{id: b12}" , "ID: b12" , ...
+        cleaned_alias = alias_or_block_id.strip().strip("{}").strip().lower()
+        if cleaned_alias.startswith("id:"):
+            cleaned_alias = cleaned_alias[len("id:"):].strip()
+        return self.block_id_by_alias.get(cleaned_alias, alias_or_block_id)
+
+    def restore_changes(self, changes, id_fields=("objectId",)):
+        """Returns copies of the change dicts with the aliases in `id_fields` mapped back to block ids."""
+        restored_changes = []
+        for each_change in changes or []:
+            restored_change = dict(each_change)
+            for each_field in id_fields:
+                if each_field in restored_change:
+                    restored_change[each_field] = self.resolve(restored_change[each_field])
+            restored_changes.append(restored_change)
+        return restored_changes
+
+
+#####  Page content compression  #####
+
+def _parse_content_tree(page_content, model_name):
+    # Builds the hierarchy of the numbered content lines , blocks without text get a placeholder node
+    root = {"line": None, "children": []}
+    nodes_by_number = {(): root}
+    for each_line in str(page_content or "").splitlines():
+        if not each_line.strip():
+            continue
+        number_match = CONTENT_LINE_PATTERN.match(each_line)
+        if not number_match:
+            root["children"].append({"line": each_line, "children": []})
+            continue
+
+        number = tuple(int(part) for part in number_match.group(1).split("."))
+        for depth in range(1, len(number)):
+            if number[:depth] not in nodes_by_number:
+                placeholder_node = {"line": None, "children": []}
+                nodes_by_number[number[:depth - 1]]["children"].append(placeholder_node)
+                nodes_by_number[number[:depth]] = placeholder_node
+        node = nodes_by_number.get(number)
+        if node is None:
+            node = {"line": None, "children": []}
+            nodes_by_number[number[:-1]]["children"].append(node)
+            nodes_by_number[number] = node
+        node["line"] = each_line
+
+    def measure(node):
+        node["line_tokens"] = count_tokens(node["line"] + "\n", model_name) if node["line"] else 0
+        node["subtree_lines"] = ([node["line"]] if node["line"] else [])
+        for each_child in node["children"]:
+            measure(each_child)
+            node["subtree_lines"] += each_child["subtree_lines"]
+        node["subtree_tokens"] = node["line_tokens"] + sum(each_child["subtree_tokens"] for each_child in node["children"])
+
+    measure(root)
+    return root
+
+
+def _score_nodes(root, relevance_text):
+    # Cosine similarity of every subtree's text with the meeting points , via the local embedding index
+    all_nodes = []
+
+    def collect(node):
+        for each_child in node["children"]:
+            all_nodes.append(each_child)
+            collect(each_child)
+
+    collect(root)
+    for each_node in all_nodes:
+        each_node["score"] = 0.0
+    if not all_nodes or not str(relevance_text or "").strip():
+        return
+
+    subtree_index = EmbeddingIndex()
+    for node_position, each_node in enumerate(all_nodes):
+        subtree_index.add(node_position, NOTION_ID_PATTERN.sub("", " ".join(each_node["subtree_lines"])))
+    for each_result in subtree_index.search(relevance_text, top_k=len(all_nodes), min_score=-1.0):
+        all_nodes[each_result["id"]]["score"] = each_result["score"]
+
+
+def _fit_children(children, token_budget):
+    """
+    Picks what is kept of the given subtrees , most relevant first.
+
+    Blocks are taken best first by score: a block whose whole subtree fits is kept whole , else
+    its line is kept (with room for a "... N nested lines omitted" marker) and its children join
+    the candidates. So the children of a related subtree come before the top lines of unrelated
+    ones. A block whose line does not fit is dropped with its subtree.
+
+    Returns:
+        tuple(list[str], int): Kept lines in document order and the tokens they use.
+    """
+    total_tokens = sum(each_child["subtree_tokens"] for each_child in children)
+    if total_tokens <= token_budget:
+        return [line for each_child in children for line in each_child["subtree_lines"]], total_tokens
+
+    # Room for the closing "... N more lines omitted" marker
+    remaining_budget = token_budget - OMITTED_MARKER_TOKENS
+    kept_whole_ids = set()
+    kept_line_ids = set()
+    # Ties keep document order , children are numbered after everything already queued
+    candidate_order = itertools.count()
+    candidates = [(-each_child["score"], next(candidate_order), each_child) for each_child in children]
+    heapq.heapify(candidates)
+    while candidates and remaining_budget > 0:
+        _, _, node = heapq.heappop(candidates)
+        if node["subtree_tokens"] <= remaining_budget:
+            kept_whole_ids.add(id(node))
+            remaining_budget -= node["subtree_tokens"]
+            continue
+        head_cost = node["line_tokens"] + OMITTED_MARKER_TOKENS
+        if node["children"] and head_cost <= remaining_budget:
+            kept_line_ids.add(id(node))
+            remaining_budget -= head_cost
+            for each_child in node["children"]:
+                heapq.heappush(candidates, (-each_child["score"], next(candidate_order), each_child))
+
+    def render(nodes):
+        rendered_lines = []
+        omitted_count = 0
+        for each_node in nodes:
+            if id(each_node) in kept_whole_ids:
+                rendered_lines += each_node["subtree_lines"]
+            elif id(each_node) in kept_line_ids:
+                rendered_lines += [each_node["line"]] if each_node["line"] else []
+                nested_lines, nested_omitted_count = render(each_node["children"])
+                rendered_lines += nested_lines
+                if nested_omitted_count:
+                    rendered_lines.append(f"... {nested_omitted_count} nested lines omitted (not related to this meeting)")
+            else:
+                omitted_count += len(each_node["subtree_lines"])
+        return rendered_lines, omitted_count
+
+    kept_lines, dropped_count = render(children)
+    if dropped_count:
+        kept_lines.append(f"... {dropped_count} more lines omitted (not related to this meeting)")
+    return kept_lines, token_budget - remaining_budget
+
+
+def compress_page_content(page_content, relevance_text, token_budget, model_name="gpt-4o-mini"):
+    """
+    Shrinks `fetch_notion_page_content` output to about `token_budget` tokens.
+
+    Subtrees are ranked by their similarity with `relevance_text` (e.g. the meeting points of
+    the project). The most related subtrees are kept whole , the others are cut down to their
+    top block line with a "... N nested lines omitted" marker , or dropped when even that does
+    not fit. Kept lines stay in document order with their hierarchy numbers and ids , so the LLM
+    can still point at them.
+
+    Returns:
+        str: The content itself when it already fits , else the compressed content.
+    """
+    root = _parse_content_tree(page_content, model_name)
+    if root["subtree_tokens"] <= token_budget:
+        return page_content
+    _score_nodes(root, relevance_text)
+    kept_lines, _ = _fit_children(root["children"], max(token_budget, 0))
+    return "\n".join(kept_lines)
+
+
+def fit_prompt_to_budget(prompt, page_content, relevance_text, token_budget=CHANGES_PROMPT_TOKEN_BUDGET, model_name="gpt-4o-mini"):
+    """
+    Returns `prompt` with the `page_content` inside it compressed so the whole prompt fits `token_budget`.
+
+    Args:
+        prompt (str): The full prompt , containing `page_content` once.
+        page_content (str): Notion page content as returned by `fetch_notion_page_content`.
+        relevance_text (str): Text the kept content should relate to.
+        token_budget (int): Maximum prompt tokens.
+    """
+    prompt_tokens = count_tokens(prompt, model_name)
+    if prompt_tokens <= token_budget or not page_content or page_content not in prompt:
+        return prompt
+
+    content_token_budget = token_budget - (prompt_tokens - count_tokens(page_content, model_name))
+    compressed_content = compress_page_content(page_content, relevance_text, content_token_budget, model_name)
+    compressed_prompt = prompt.replace(page_content, compressed_content, 1)
+    print(f"✂️ Prompt compressed from {prompt_tokens} to {count_tokens(compressed_prompt, model_name)} tokens (budget {token_budget})")
+    return compressed_prompt
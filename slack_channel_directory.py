@@ -0,0 +1,132 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+from slack_http_client import slack_sync_http
+
+load_dotenv()
+
+SLACK_CHANNEL_DIRECTORY_TTL_SECONDS = float(os.getenv("SLACK_CHANNEL_DIRECTORY_TTL_SECONDS", "3600"))
+# Channel types listed by conversations.list , private channels also need the groups:read scope
+SLACK_CHANNEL_TYPES = os.getenv("SLACK_CHANNEL_TYPES", "public_channel")
+# Names which were not found are not searched for again within this many seconds
+MISSED_CHANNEL_NAME_COOLDOWN_SECONDS = 60.0
+# conversations.list pages are capped at 1000 channels
+CHANNELS_PAGE_LIMIT = 1000
+
+
+def call_slack_web_api(method_name, params):
+    """
+    Calls one Slack Web API method through the shared blocking client (rate limited , retried on 429).
+
+    Returns:
+        dict: The response JSON.
+
+    Raises:
+        RuntimeError: When Slack answers with "ok": false , even after the retries of throttled requests.
+    """
+    json_response = slack_sync_http.call(method_name, params)
+    if not json_response.get("ok"):
+        raise RuntimeError(f"Slack {method_name} failed: {json_response.get('error')}")
+    return json_response
+
+
+def normalize_channel_name(channel_name):
+    return str(channel_name or "").strip().lstrip("#").lower()
+
+
+class SlackChannelDirectory:
+    """
+    In-memory name -> id directory of the Slack channels of the workspace.
+
+    The directory is filled by paging through `conversations.list` (1000 channels per page,
+    archived channels left out) and is kept for `ttl_seconds` , after which the next lookup
+    reloads it fully. A lookup which misses the cached names pages through the list again
+    but stops at the page containing the name , merging every page it reads , so a newly
+    created channel is found without a full reload. Names still missing are remembered for
+    `MISSED_CHANNEL_NAME_COOLDOWN_SECONDS` so repeated misses do not page the whole list again.
+
+    Requests go through `slack_sync_http` , which keeps conversations.list under its Tier 2 limit.
+
+    Args:
+        ttl_seconds (float): Seconds after which the whole directory is reloaded.
+        channel_types (str): Comma separated conversation types to list.
+
+    Example Usage:
+        channel_id = slack_channel_directory.lookup("doc_agent_msgs")
+    """
+
+    def __init__(self, ttl_seconds=SLACK_CHANNEL_DIRECTORY_TTL_SECONDS, channel_types=SLACK_CHANNEL_TYPES):
+        self.ttl_seconds = ttl_seconds
+        self.channel_types = channel_types
+        self.channel_id_by_name = {}
+        self.loaded_at = None
+        self.missed_at_by_name = {}
+        self._lock = threading.Lock()
+
+    def _fetch_channels_page(self, cursor=None):
+        """
+        Fetches one conversations.list page.
+
+        Returns:
+            tuple(list[dict], str): The channels of the page and the cursor of the next one ("" on the last page).
+        """
+        params = {"limit": CHANNELS_PAGE_LIMIT, "exclude_archived": "true", "types": self.channel_types}
+        if cursor:
+            params["cursor"] = cursor
+        json_response = call_slack_web_api("conversations.list", params)
+        next_cursor = json_response.get("response_metadata", {}).get("next_cursor", "")
+        return json_response.get("channels", []), next_cursor
+
+    def _load_pages(self, stop_at_name=None):
+        # Merges pages into the directory , stopping early once `stop_at_name` is seen
+        seen_names = set()
+        cursor = None
+        while True:
+            channels, cursor = self._fetch_channels_page(cursor)
+            for each_channel in channels:
+                channel_name = normalize_channel_name(each_channel.get("name"))
+                self.channel_id_by_name[channel_name] = each_channel.get("id")
+                seen_names.add(channel_name)
+            if stop_at_name is not None and stop_at_name in seen_names:
+                return False
+            if not cursor:
+                return True
+
+    def refresh(self):
+        """Reloads the whole directory , dropping channels which were archived or deleted."""
+        with self._lock:
+            self.channel_id_by_name = {}
+            self.missed_at_by_name = {}
+            self._load_pages()
+            self.loaded_at = time.monotonic()
+            print(f"📇 Slack channel directory loaded with {len(self.channel_id_by_name)} channels")
+
+    def lookup(self, channel_name):
+        """
+        Returns the id of the channel with the given name (a leading "#" is ignored) , or None.
+        """
+        channel_name = normalize_channel_name(channel_name)
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl_seconds:
+            self.refresh()
+
+        with self._lock:
+            channel_id = self.channel_id_by_name.get(channel_name)
+            if channel_id is not None:
+                return channel_id
+
+            missed_at = self.missed_at_by_name.get(channel_name)
+            if missed_at is not None and time.monotonic() - missed_at < MISSED_CHANNEL_NAME_COOLDOWN_SECONDS:
+                return None
+
+            read_whole_list = self._load_pages(stop_at_name=channel_name)
+            if read_whole_list:
+                self.loaded_at = time.monotonic()
+            channel_id = self.channel_id_by_name.get(channel_name)
+            if channel_id is None:
+                self.missed_at_by_name[channel_name] = time.monotonic()
+            return channel_id
+
+
+# Single directory shared by every channel lookup of the agent
+slack_channel_directory = SlackChannelDirectory()
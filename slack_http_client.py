@@ -0,0 +1,172 @@
+import os
+import asyncio
+import threading
+import aiohttp
+from dotenv import load_dotenv
+from notion_http_client import TokenBucketRateLimiter, AsyncHTTPClientBase
+
+load_dotenv()
+
+SLACK_API_BASE_URL = "https://slack.com/api"
+
+# Requests per minute of Slack's rate limit tiers , limits apply per method and workspace
+REQUESTS_PER_MINUTE_BY_TIER = {1: 1, 2: 20, 3: 50, 4: 100}
+SLACK_METHOD_RATE_TIERS = {
+    "auth.test": 4,
+    "chat.postMessage": "special",      # about 1 message per second per channel
+    "conversations.list": 2,
+    "conversations.members": 4,
+    "conversations.replies": 3,
+    "users.info": 4,
+    "users.list": 2,
+}
+SPECIAL_METHOD_REQUESTS_PER_MINUTE = {"chat.postMessage": 60}
+DEFAULT_SLACK_METHOD_TIER = 3
+# Methods whose parameters are sent as a JSON body , the others are read methods sent as a query string
+JSON_BODY_METHODS = {"chat.postMessage", "chat.update", "chat.delete", "reactions.add"}
+
+
+class AsyncSlackHTTP(AsyncHTTPClientBase):
+    """
+    Async client for the Slack Web API , shared by every Slack tool of the agent.
+
+    Sessions per event loop (with the bot's Authorization header preset) and the retry loop come
+    from `AsyncHTTPClientBase`. Every method has its own `TokenBucketRateLimiter` sized to its rate
+    limit tier (`SLACK_METHOD_RATE_TIERS`) , so e.g. a burst of user lookups never uses up the
+    budget of conversations.replies. Throttled requests (HTTP 429 or "error": "ratelimited") pause
+    the method's limiter for the `Retry-After` seconds and are retried , connection errors and 5xx
+    are retried with jittered exponential backoff. Write methods (`JSON_BODY_METHODS`) are only
+    retried when throttled or when the connection could not be opened: after a response timeout
+    or a 5xx Slack may already have posted the message.
+
+    Args:
+        bot_token (str): Bot token (xoxb-...).
+        pool_size (int): Maximum number of open connections per event loop.
+        request_timeout (float): Seconds one request may take.
+        max_retries (int): Number of retries for throttled , 5xx or failed-to-connect requests.
+
+    Example Usage:
+        response_json = await slack_http.call("conversations.replies", params={"channel": channel_id, "ts": thread_ts})
+        if response_json.get("ok"): ...
+    """
+
+    def __init__(self, bot_token, pool_size=10, request_timeout=30.0, max_retries=4,
+                 backoff_base_seconds=1.0, backoff_max_seconds=30.0):
+        super().__init__(
+            headers={"Authorization": f"Bearer {bot_token}"},
+            timeout=aiohttp.ClientTimeout(total=request_timeout),
+            pool_size=pool_size,
+            max_retries=max_retries,
+            backoff_base_seconds=backoff_base_seconds,
+            backoff_max_seconds=backoff_max_seconds
+        )
+        self.rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
+
+    def rate_limiter_for(self, method_name):
+        with self._rate_limiters_lock:
+            rate_limiter = self.rate_limiters.get(method_name)
+            if rate_limiter is None:
+                tier = SLACK_METHOD_RATE_TIERS.get(method_name, DEFAULT_SLACK_METHOD_TIER)
+                if tier == "special":
+                    requests_per_minute = SPECIAL_METHOD_REQUESTS_PER_MINUTE[method_name]
+                else:
+                    requests_per_minute = REQUESTS_PER_MINUTE_BY_TIER[tier]
+                rate_limiter = TokenBucketRateLimiter(rate_per_second=requests_per_minute / 60.0, burst=max(1, requests_per_minute // 20))
+                self.rate_limiters[method_name] = rate_limiter
+            return rate_limiter
+
+    async def call(self, method_name, params=None):
+        """
+        Calls one Slack Web API method , retrying throttled / transient failures.
+
+        Args:
+            method_name (str): e.g. "conversations.replies".
+            params (dict): Method arguments , sent as JSON for `JSON_BODY_METHODS` and as a query string otherwise.
+
+        Returns:
+            dict: The response JSON. Failures come back the way Slack reports them , {"ok": False, "error": ...}.
+        """
+        url = f"{SLACK_API_BASE_URL}/{method_name}"
+        is_write_method = method_name in JSON_BODY_METHODS
+        if is_write_method:
+            request_kwargs = {"json": params or {}}
+        else:
+            request_kwargs = {"params": params or {}}
+
+        try:
+            status_code, response_json = await self._send_with_retries(
+                f"Slack {method_name}",
+                self.rate_limiter_for(method_name),
+                not is_write_method,
+                lambda status_code, response_json: status_code == 429 or response_json.get("error") == "ratelimited",
+                "POST" if is_write_method else "GET",
+                url,
+                **request_kwargs
+            )
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            return {"ok": False, "error": f"connection_error: {e}"}
+
+        if status_code == 429 or response_json.get("error") == "ratelimited":
+            return {"ok": False, "error": "ratelimited"}
+        if "ok" not in response_json:
+            # Error pages which are not Slack JSON
+            return {"ok": False, "error": f"http_{status_code}", **response_json}
+        return response_json
+
+    async def paginate(self, method_name, params, items_key):
+        """Calls a cursor paginated method until its last page , returns the items of every page."""
+        all_items = []
+        cursor = None
+        while True:
+            page_params = dict(params, cursor=cursor) if cursor else params
+            response_json = await self.call(method_name, page_params)
+            if not response_json.get("ok"):
+                raise RuntimeError(f"Slack {method_name} failed: {response_json.get('error')}")
+            all_items += response_json.get(items_key, [])
+            cursor = response_json.get("response_metadata", {}).get("next_cursor", "")
+            if not cursor:
+                return all_items
+
+
+class SlackHTTP:
+    """
+    Blocking facade over `AsyncSlackHTTP` for the sync callers (LangChain tools , directory caches).
+
+    Calls run on one background event loop thread , so they share the async client's rate
+    limiters and keep one session alive instead of opening a connection per call. Safe to call
+    from any thread , including one which is running its own event loop.
+
+    Example Usage:
+        response_json = slack_sync_http.call("users.info", params={"user": user_id})
+    """
+
+    def __init__(self, async_client):
+        self.async_client = async_client
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def _get_loop(self):
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="slack-http-loop", daemon=True).start()
+            return self._loop
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result()
+
+    def call(self, method_name, params=None):
+        return self._run(self.async_client.call(method_name, params))
+
+    def paginate(self, method_name, params, items_key):
+        return self._run(self.async_client.paginate(method_name, params, items_key))
+
+
+# Single Slack client shared by every async Slack tool , and its facade for the blocking ones
+slack_http = AsyncSlackHTTP(
+    os.getenv("SLACK_BOT_TOKEN"),
+    pool_size=int(os.getenv("SLACK_HTTP_POOL_SIZE", "10")),
+    max_retries=int(os.getenv("SLACK_HTTP_MAX_RETRIES", "4"))
+)
+slack_sync_http = SlackHTTP(slack_http)
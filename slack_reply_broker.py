@@ -0,0 +1,204 @@
+import os
+import json
+import asyncio
+from collections import OrderedDict
+from dotenv import load_dotenv
+from slack_sdk.socket_mode.aiohttp import SocketModeClient
+from slack_sdk.socket_mode.request import SocketModeRequest
+from slack_sdk.socket_mode.response import SocketModeResponse
+from slack_http_client import slack_http
+from testing_socket import handle_event as queue_read_ai_summary_event
+
+load_dotenv()
+
+SLACK_REPLY_TIMEOUT_SECONDS = float(os.getenv("SLACK_REPLY_TIMEOUT_SECONDS", "21600"))
+# How often a waiter checks the socket connection , a poll is only sent when the socket is down
+SLACK_REPLY_CONNECTION_CHECK_SECONDS = float(os.getenv("SLACK_REPLY_CONNECTION_CHECK_SECONDS", "30"))
+MAX_UNCLAIMED_REPLIES = 1000
+
+
+class SlackReplyBroker:
+    """
+    Waits for human replies in Slack threads through Socket Mode events instead of polling.
+
+    It is the one Socket Mode dispatcher of the app: Slack hands each event to only one of the
+    app's open connections , so the same connection also queues Read.ai summaries (through
+    `testing_socket.handle_event`) and testing_socket.py listens through this broker instead of
+    opening a connection of its own. Events are acknowledged only once they were handled.
+
+    Every waiting coroutine gets an asyncio future keyed by (channel, thread_ts). `message`
+    events carrying a `thread_ts` resolve the futures of their thread with the reply text, so
+    no API call is made while waiting. A reply arriving before its waiter registers is kept in
+    a small buffer and handed over on registration.
+
+    `conversations.replies` is only called to cover gaps of the socket connection: once for every
+    pending thread when the socket says `hello` again after being down , and by a waiter which
+    finds the socket down on one of its periodic checks.
+
+    The Socket Mode client is started lazily on the event loop of the first waiter , so it runs
+    on the graph's own loop.
+
+    Args:
+        app_token (str): App level token (xapp-...) with connections:write.
+        bot_token (str): Bot token (xoxb-...) , the Web API calls go through the shared `slack_http` client.
+
+    Example Usage:
+        human_response = await slack_reply_broker.wait_for_reply(channel_id, thread_ts)
+    """
+
+    def __init__(self, app_token, bot_token):
+        self.app_token = app_token
+        self.bot_token = bot_token
+        self.socket_client = None
+        self.bot_user_id = None
+        self.connected = False
+        self.futures_by_thread = {}                # (channel, thread_ts) -> list of futures
+        self.unclaimed_replies = OrderedDict()     # (channel, thread_ts) -> reply text
+        self._start_lock = None
+
+    @property
+    def enabled(self):
+        return bool(self.app_token and self.bot_token)
+
+    async def start(self):
+        """Connects the Socket Mode client on the running loop , does nothing if it is already connected."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.socket_client is not None:
+                return
+            self.bot_user_id = (await slack_http.call("auth.test")).get("user_id")
+
+            socket_client = SocketModeClient(app_token=self.app_token)
+            socket_client.socket_mode_request_listeners.append(self._on_socket_mode_request)
+            socket_client.on_message_listeners.append(self._on_raw_message)
+            socket_client.on_close_listeners.append(self._on_connection_lost)
+            socket_client.on_error_listeners.append(self._on_connection_lost)
+            await socket_client.connect()
+            self.socket_client = socket_client
+            self.connected = True
+            print(f"🔌 Slack reply broker connected through Socket Mode , bot user {self.bot_user_id}")
+
+    async def close(self):
+        if self.socket_client is not None:
+            await self.socket_client.close()
+            self.socket_client = None
+            self.connected = False
+
+    #####  Socket Mode listeners  #####
+
+    async def _on_socket_mode_request(self, client, req: SocketModeRequest):
+        if req.type == "events_api":
+            event = req.payload.get("event", {})
+            if event.get("type") == "message" and event.get("thread_ts") and event.get("ts") != event.get("thread_ts"):
+                if self._is_human_message(event):
+                    self._deliver_reply((event.get("channel"), event.get("thread_ts")), event.get("text"))
+            else:
+                try:
+                    # One SQLite insert at most , well within Slack's 3 second ack window
+                    await asyncio.to_thread(queue_read_ai_summary_event, req.payload)
+                except Exception as e:
+                    # Leaving the envelope unacknowledged , so Slack redelivers it instead of the summary being lost
+                    print(f"❌ Could not queue event {req.envelope_id} ({e}) , not acknowledging it.")
+                    return
+        await client.send_socket_mode_response(SocketModeResponse(envelope_id=req.envelope_id))
+
+    async def _on_raw_message(self, message):
+        try:
+            message_type = json.loads(message.data).get("type")
+        except (TypeError, ValueError):
+            return
+        if message_type == "disconnect":
+            self.connected = False
+        elif message_type == "hello":
+            was_connected = self.connected
+            self.connected = True
+            if not was_connected:
+                # Replies sent while the socket was down never arrive as events , reading them once
+                print("🔌 Slack socket reconnected , checking pending threads for missed replies")
+                asyncio.get_running_loop().create_task(self._catch_up_pending_threads())
+
+    async def _on_connection_lost(self, message):
+        self.connected = False
+
+    #####  Waiting  #####
+
+    def _is_human_message(self, message):
+        return (
+            bool(message.get("user"))
+            and message.get("user") != self.bot_user_id
+            and not message.get("bot_id")
+            and message.get("subtype") in (None, "thread_broadcast")
+        )
+
+    def _deliver_reply(self, thread_key, reply_text):
+        waiting_futures = self.futures_by_thread.pop(thread_key, [])
+        waiting_futures = [future for future in waiting_futures if not future.done()]
+        if not waiting_futures:
+            self.unclaimed_replies[thread_key] = reply_text
+            while len(self.unclaimed_replies) > MAX_UNCLAIMED_REPLIES:
+                self.unclaimed_replies.popitem(last=False)
+            return
+        print(f"✅ Human response received in thread {thread_key[1]}")
+        for future in waiting_futures:
+            future.set_result(reply_text)
+
+    async def _poll_thread_once(self, thread_key):
+        """Reads the thread through conversations.replies , returns the first human reply text or None."""
+        channel_id, thread_ts = thread_key
+        response = await slack_http.call("conversations.replies", {"channel": channel_id, "ts": thread_ts, "oldest": thread_ts})
+        if not response.get("ok"):
+            print(f"❌ Polling thread {thread_ts} failed: {response.get('error')}")
+            return None
+        for each_message in response.get("messages", []):
+            if each_message.get("ts") != thread_ts and self._is_human_message(each_message):
+                return each_message.get("text")
+        return None
+
+    async def _catch_up_pending_threads(self):
+        for thread_key in list(self.futures_by_thread):
+            reply_text = await self._poll_thread_once(thread_key)
+            if reply_text is not None:
+                self._deliver_reply(thread_key, reply_text)
+
+    async def wait_for_reply(self, channel_id, thread_ts, timeout_seconds=SLACK_REPLY_TIMEOUT_SECONDS):
+        """
+        Waits for the first human reply in the given thread.
+
+        Returns:
+            str: The reply text , or None if nobody answered within `timeout_seconds`.
+        """
+        await self.start()
+        thread_key = (channel_id, thread_ts)
+        if thread_key in self.unclaimed_replies:
+            return self.unclaimed_replies.pop(thread_key)
+
+        reply_future = asyncio.get_running_loop().create_future()
+        self.futures_by_thread.setdefault(thread_key, []).append(reply_future)
+        deadline = asyncio.get_running_loop().time() + timeout_seconds
+        try:
+            while True:
+                remaining_seconds = deadline - asyncio.get_running_loop().time()
+                if remaining_seconds <= 0:
+                    print(f"⌛ No human response in thread {thread_ts} within {timeout_seconds} seconds")
+                    return None
+                try:
+                    return await asyncio.wait_for(asyncio.shield(reply_future), min(SLACK_REPLY_CONNECTION_CHECK_SECONDS, remaining_seconds))
+                except asyncio.TimeoutError:
+                    pass
+                # Polling only while the socket is down , events cover everything else
+                if not self.connected or not await self.socket_client.is_connected():
+                    self.connected = False
+                    reply_text = await self._poll_thread_once(thread_key)
+                    if reply_text is not None:
+                        self._deliver_reply(thread_key, reply_text)
+        finally:
+            thread_futures = self.futures_by_thread.get(thread_key, [])
+            if reply_future in thread_futures:
+                thread_futures.remove(reply_future)
+            if not thread_futures:
+                self.futures_by_thread.pop(thread_key, None)
+
+
+# Single broker shared by every Slack confirmation of the agent
+slack_reply_broker = SlackReplyBroker(os.getenv("SLACK_APP_TOKEN"), os.getenv("SLACK_BOT_TOKEN"))
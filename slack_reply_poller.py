@@ -0,0 +1,175 @@
+import os
+import random
+import asyncio
+from dotenv import load_dotenv
+from slack_http_client import slack_http
+from slack_reply_broker import SLACK_REPLY_TIMEOUT_SECONDS
+
+load_dotenv()
+
+SLACK_REPLY_POLL_INITIAL_SECONDS = float(os.getenv("SLACK_REPLY_POLL_INITIAL_SECONDS", "3"))
+SLACK_REPLY_POLL_MAX_SECONDS = float(os.getenv("SLACK_REPLY_POLL_MAX_SECONDS", "60"))
+
+
+class SlackThreadReplyPoller:
+    """
+    Single polling service for every thread the agent is waiting on , used when Socket Mode is not available.
+
+    Outstanding waits are kept by (channel, thread_ts). One scheduler task polls the thread which
+    is due next through the shared `slack_http` client , so any number of waiting coroutines share
+    one connection pool and one request budget:
+
+    - Each thread is polled after `initial_interval_seconds` , and the interval doubles (with
+      jitter) after every poll without a human reply , up to `max_interval_seconds`.
+    - Polls send `oldest` with the newest ts already seen , so only new replies come back.
+    - `slack_http` keeps conversations.replies under its Tier 3 limit and waits out a 429 for its
+      `Retry-After` seconds.
+    - Every waiter has its own deadline and gets None when it passes.
+
+    Args:
+        initial_interval_seconds (float): Delay before the first poll of a thread.
+        max_interval_seconds (float): Upper bound of the delay between two polls of a thread.
+
+    Example Usage:
+        human_response = await slack_reply_poller.wait_for_reply(channel_id, thread_ts)
+    """
+
+    def __init__(self, initial_interval_seconds=SLACK_REPLY_POLL_INITIAL_SECONDS, max_interval_seconds=SLACK_REPLY_POLL_MAX_SECONDS):
+        self.initial_interval_seconds = initial_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.bot_user_id = None
+        self.waits = {}           # (channel, thread_ts) -> {"futures", "oldest", "interval", "next_poll_at"}
+        self.loop = None
+        self.scheduler_task = None
+        self._waits_changed = None
+        self.stats = {"polls_sent": 0, "replies_received": 0, "timed_out": 0}
+
+    def get_stats(self):
+        """Returns a copy of the poller counters (polls sent , replies received , timed out)."""
+        return dict(self.stats, outstanding_waits=len(self.waits))
+
+    def _bind_to_running_loop(self):
+        # The event and the scheduler belong to one loop , a new loop starts them again
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.scheduler_task = None
+            self.waits = {}
+            self._waits_changed = asyncio.Event()
+        if self.scheduler_task is None or self.scheduler_task.done():
+            self.scheduler_task = loop.create_task(self._run_scheduler())
+
+    def _is_human_message(self, message):
+        return (
+            bool(message.get("user"))
+            and message.get("user") != self.bot_user_id
+            and not message.get("bot_id")
+            and message.get("subtype") in (None, "thread_broadcast")
+        )
+
+    def _schedule_next_poll(self, thread_wait):
+        thread_wait["next_poll_at"] = self.loop.time() + thread_wait["interval"] * random.uniform(0.8, 1.2)
+        thread_wait["interval"] = min(thread_wait["interval"] * 2, self.max_interval_seconds)
+
+    def _resolve(self, thread_key, reply_text):
+        thread_wait = self.waits.pop(thread_key, None)
+        if thread_wait is None:
+            return
+        for each_future in thread_wait["futures"]:
+            if not each_future.done():
+                each_future.set_result(reply_text)
+
+    async def _poll_thread(self, thread_key):
+        channel_id, thread_ts = thread_key
+        thread_wait = self.waits[thread_key]
+        if self.bot_user_id is None:
+            self.bot_user_id = (await slack_http.call("auth.test")).get("user_id")
+        self.stats["polls_sent"] += 1
+        response_json = await slack_http.call(
+            "conversations.replies",
+            {"channel": channel_id, "ts": thread_ts, "oldest": thread_wait["oldest"], "inclusive": "false", "limit": 200}
+        )
+
+        if thread_key not in self.waits:    # every waiter gave up while the request was running
+            return
+        if not response_json.get("ok"):
+            print(f"❌ Slack error while polling thread {thread_ts}: {response_json.get('error')}")
+            self._schedule_next_poll(thread_wait)
+            return
+
+        for each_message in response_json.get("messages", []):
+            message_ts = each_message.get("ts", "0")
+            if float(message_ts) <= float(thread_wait["oldest"]):
+                continue
+            if self._is_human_message(each_message):
+                print(f"✅ Human response received in thread {thread_ts}")
+                self.stats["replies_received"] += 1
+                self._resolve(thread_key, each_message.get("text"))
+                return
+            thread_wait["oldest"] = max(thread_wait["oldest"], message_ts, key=float)
+        self._schedule_next_poll(thread_wait)
+
+    async def _run_scheduler(self):
+        # Polls the thread which is due next , sleeping until then or until a wait is added
+        while True:
+            self._waits_changed.clear()
+            if not self.waits:
+                await self._waits_changed.wait()
+                continue
+            thread_key, thread_wait = min(self.waits.items(), key=lambda item: item[1]["next_poll_at"])
+            sleep_seconds = thread_wait["next_poll_at"] - self.loop.time()
+            if sleep_seconds > 0:
+                try:
+                    await asyncio.wait_for(self._waits_changed.wait(), sleep_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._poll_thread(thread_key)
+            except Exception as e:
+                # One failed poll (e.g. a closed session) must not stop the polling of every other thread
+                print(f"❌ Polling thread {thread_key[1]} failed ({e!r}) , trying again later")
+                if thread_key in self.waits:
+                    self._schedule_next_poll(self.waits[thread_key])
+
+    async def wait_for_reply(self, channel_id, thread_ts, timeout_seconds=SLACK_REPLY_TIMEOUT_SECONDS):
+        """
+        Waits for the first human reply in the given thread.
+
+        Returns:
+            str: The reply text , or None if nobody answered within `timeout_seconds`.
+        """
+        self._bind_to_running_loop()
+        thread_key = (channel_id, thread_ts)
+        reply_future = self.loop.create_future()
+        thread_wait = self.waits.get(thread_key)
+        if thread_wait is None:
+            thread_wait = {"futures": [], "oldest": thread_ts, "interval": self.initial_interval_seconds, "next_poll_at": 0.0}
+            self._schedule_next_poll(thread_wait)
+            self.waits[thread_key] = thread_wait
+            self._waits_changed.set()
+        thread_wait["futures"].append(reply_future)
+
+        try:
+            return await asyncio.wait_for(reply_future, timeout_seconds)
+        except asyncio.TimeoutError:
+            print(f"⌛ No human response in thread {thread_ts} within {timeout_seconds} seconds")
+            self.stats["timed_out"] += 1
+            return None
+        finally:
+            thread_wait = self.waits.get(thread_key)
+            if thread_wait is not None:
+                if reply_future in thread_wait["futures"]:
+                    thread_wait["futures"].remove(reply_future)
+                if not thread_wait["futures"]:
+                    self.waits.pop(thread_key, None)
+
+    async def close(self):
+        """Stops the scheduler , call it before the loop is closed."""
+        if self.scheduler_task is not None:
+            self.scheduler_task.cancel()
+            self.scheduler_task = None
+
+
+# Single poller shared by every Slack confirmation waiting without Socket Mode
+slack_reply_poller = SlackThreadReplyPoller()
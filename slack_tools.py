@@ -1,14 +1,16 @@
-import requests
 import time
 from langchain.tools import tool
 import re , json
 from langchain_core.messages import AIMessage
 from langchain_core.output_parsers import JsonOutputParser
 import asyncio
-import aiohttp
 from dotenv import load_dotenv
 import os
-from slack_sdk import WebClient
+from slack_http_client import slack_http
+from slack_reply_broker import slack_reply_broker
+from slack_reply_poller import slack_reply_poller
+from slack_channel_directory import slack_channel_directory
+from slack_workspace_directory import slack_workspace_directory
 
 load_dotenv()
 SLACK_BOT_TOKEN  = os.getenv("SLACK_BOT_TOKEN")
@@ -16,15 +18,15 @@ SLACK_BOT_TOKEN  = os.getenv("SLACK_BOT_TOKEN")
 YOUR_BOT_USER_ID = os.getenv("U08BWREB2VA")
 # print(SLACK_BOT_TOKEN)
 # print("Used environment variables")
-client = WebClient(token=SLACK_BOT_TOKEN)
 
 @tool
 def retrieve_channel_id_by_name(channel_name):
     """
     Retrieves the Slack channel ID for a given channel name.
 
-    This function calls the Slack API's `conversations.list` endpoint to fetch a list of all available channels 
-    in the workspace. It then iterates through the list to find a channel matching the provided name.
+    The name is looked up in the shared `slack_channel_directory` , a cached name -> id map built by
+    paging through the Slack API's `conversations.list` endpoint. The map is reloaded after its TTL
+    and searched again page by page when a name is missing from it.
 
     Args:
         channel_name (str): The name of the Slack channel (e.g., "doc_agent_msgs").
@@ -40,36 +42,13 @@ def retrieve_channel_id_by_name(channel_name):
     - Requires a valid Slack Bot Token (`SLACK_BOT_TOKEN`) with `channels:read` permission.
     - If the provided channel name does not exist, the function returns `None`.
     """
-
-    url = "https://slack.com/api/conversations.list"
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    
-    response = requests.get(url, headers=headers)
-    print("✔️✔️✔️✔️✔️✔️✔️✔️✔️")
-    print(response)
-    print("✔️✔️✔️✔️✔️✔️✔️✔️✔️")
-    json_response = response.json()
-    channels_list = json_response.get("channels")
-    for each_channel in channels_list:
-        print(each_channel)
-        if each_channel.get("name") == channel_name:
-            return each_channel.get("id")
-        print("🟢🟢🟢🟢🟢🟢🟢🟢")
-
-    return None  # Return None if channel not found
+    return slack_channel_directory.lookup(channel_name)
 
 def get_bot_user_id(channel_id):
     try:
-        # Get list of members in the channel
-        response = client.conversations_members(channel=channel_id)
-        members = response["members"]
-        
-        # Get bot user ID
-        bot_info = client.auth_test()  # Fetch bot user info
-        bot_user_id = bot_info["user_id"]
+        # Bot user ID and channel members come from the shared workspace directory cache
+        bot_user_id = slack_workspace_directory.get_bot_user_id()
+        members = slack_workspace_directory.get_channel_members(channel_id)
 
         if bot_user_id in members:
             return bot_user_id
@@ -145,27 +124,17 @@ async def post_message_to_channel(sending_msg_info):
     channel_id = sending_msg_info.get("channel_id")
     message = sending_msg_info.get("message")
     
-    url = "https://slack.com/api/chat.postMessage"
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json"
-    }
     data = {
         "channel": channel_id,
         "text": message
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, headers=headers, json=data) as response:
-            if response.status == 200:
-                response_json = await response.json()
-                if response_json.get("ok"):
-                    print("✅ Message sent successfully!")
-                    return response_json["ts"]
-                else:
-                    print("❌ Failed to send message:", response_json)
-            else:
-                print(f"❌ HTTP Error: {response.status}")
+    response_json = await slack_http.call("chat.postMessage", data)
+    if response_json.get("ok"):
+        print("✅ Message sent successfully!")
+        return response_json["ts"]
+    else:
+        print("❌ Failed to send message:", response_json)
     return None
 
 
@@ -239,42 +208,23 @@ async def post_message_to_channel(sending_msg_info):
 
 
 async def fetch_replies_from_channel(getting_human_response_info):
+    """
+    Waits for the first human reply in a Slack thread by polling it.
+
+    The thread is handed to the shared `slack_reply_poller` , which polls every waiting thread
+    through one session with backoff and Slack's rate limits.
+
+    Args:
+        getting_human_response_info (dict): {"CHANNEL_ID": str, "thread_ts": str}
+
+    Returns:
+        str: The human reply text , or None if nobody answered before the timeout.
+    """
     CHANNEL_ID = getting_human_response_info.get("CHANNEL_ID")
     thread_ts = getting_human_response_info.get("thread_ts")
 
     print("🔍 Listening for replies...")
-
-    url = "https://slack.com/api/conversations.replies"
-    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
-    params = {"channel": CHANNEL_ID, "ts": thread_ts}
-
-    async with aiohttp.ClientSession() as session:
-        while True:
-            try:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        json_response = await response.json()
-                        if json_response.get("ok"):
-                            messages = json_response.get("messages", [])
-                            if len(messages) > 1:  # The first message is the bot's message, so look for replies
-                                # print(f"message received {len(messages)}")
-                                for msg in messages[1:]:  # Skip the first message
-                                    # print("checked")
-                                    if msg.get("user") != YOUR_BOT_USER_ID:  # Ensure it's a human response
-                                        print("✅ Human response received!")
-                                        return msg.get("text")  # Return human response
-
-                    else:
-                        print(f"❌ HTTP Error: {response.status}")
-
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                print("Request failed, stopping listening...")
-                break
-
-            await asyncio.sleep(3)  # Non-blocking sleep for 20 seconds
-
-    return None
+    return await slack_reply_poller.wait_for_reply(CHANNEL_ID, thread_ts)
 
 
 
@@ -429,7 +379,9 @@ async def handle_sending_msg(meeting_topic):
 
     print(f"📩 Message sent! Listening for replies in thread {thread_ts}...")
 
-    # Fetch human responses from the Slack thread
+    # Waiting on Socket Mode events when an app token is configured , else polling the thread
+    if slack_reply_broker.enabled:
+        return await slack_reply_broker.wait_for_reply(channel_id, thread_ts)
     human_response = await fetch_replies_from_channel({"CHANNEL_ID": channel_id, "thread_ts": thread_ts})
 
     return human_response
@@ -447,21 +399,10 @@ def get_users_in_channel(channel_id):
     Returns:
         list: A list of user IDs in the channel.
     """
-    url = "https://slack.com/api/conversations.members"
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    params = {"channel": channel_id}
-
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
-    print(data)
-
-    if data.get("ok"):
-        return data.get("members", [])  # Returns a list of user IDs
-    else:
-        print("Error fetching users:", data.get("error"))
+    try:
+        return list(slack_workspace_directory.get_channel_members(channel_id))  # Returns a list of user IDs
+    except Exception as e:
+        print("Error fetching users:", e)
         return []
     
 
@@ -475,29 +416,26 @@ def get_user_info(user_id):
     Returns:
         dict: User details including name, real name, and email.
     """
-    url = "https://slack.com/api/users.info"
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    params = {"user": user_id}
-
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
-
-    if data.get("ok"):
-        user = data.get("user", {})
-        return {
-            "id": user.get("id"),
-            "name": user.get("name"),
-            "real_name": user.get("real_name"),
-            "email": user.get("profile", {}).get("email")  # Might require extra permissions
-        }
-    else:
-        print(f"Error fetching user {user_id}: {data.get('error')}")
+    try:
+        return slack_workspace_directory.get_user(user_id)
+    except Exception as e:
+        print(f"Error fetching user {user_id}: {e}")
         return {}
 
 
+def resolve_slack_users_by_name(user_names):
+    """
+    Resolves names as written in a meeting (e.g. action item assignees) to Slack users.
+
+    Args:
+        user_names (list[str]): Handles , real names , display names or emails.
+
+    Returns:
+        dict: name -> user details dict (see `get_user_info`) , or None for names matching no user.
+    """
+    return {each_name: slack_workspace_directory.find_user(each_name) for each_name in user_names}
+
+
 async def main():
     meeting_topic = "AI and Blockchain"
     response = await handle_sending_msg(meeting_topic)
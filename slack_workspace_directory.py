@@ -0,0 +1,139 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+from slack_http_client import slack_sync_http
+from slack_channel_directory import call_slack_web_api
+
+load_dotenv()
+
+SLACK_USERS_DIRECTORY_TTL_SECONDS = float(os.getenv("SLACK_USERS_DIRECTORY_TTL_SECONDS", "3600"))
+SLACK_CHANNEL_MEMBERS_TTL_SECONDS = float(os.getenv("SLACK_CHANNEL_MEMBERS_TTL_SECONDS", "600"))
+# Page sizes , Slack advises at most 200 users per users.list page
+USERS_PAGE_LIMIT = 200
+MEMBERS_PAGE_LIMIT = 1000
+
+
+def normalize_user_name(user_name):
+    return " ".join(str(user_name or "").strip().lstrip("@").lower().split())
+
+
+def summarize_user(user):
+    return {
+        "id": user.get("id"),
+        "name": user.get("name"),
+        "real_name": user.get("real_name") or user.get("profile", {}).get("real_name"),
+        "email": user.get("profile", {}).get("email")  # Might require extra permissions
+    }
+
+
+class SlackWorkspaceDirectory:
+    """
+    In-memory cache of the Slack users , channel memberships and bot identity of the workspace.
+
+    - Users are bulk loaded by paging through `users.list` and kept for `users_ttl_seconds`. Every
+      active user is indexed by id and by its normalized handle , real name , display name and
+      email , so resolving a meeting's assignees is a dictionary lookup per name instead of one
+      `users.info` call each. An id missing from the cache falls back to one `users.info` call,
+      whose answer is cached too.
+    - Channel members are loaded through `conversations.members` (paginated) and kept as a set
+      per channel for `members_ttl_seconds`.
+    - The bot's own user id (`auth.test`) does not change , it is fetched once per process.
+
+    Requests go through `slack_sync_http` , so every method stays under its own rate limit tier.
+
+    Args:
+        users_ttl_seconds (float): Seconds after which the users are reloaded.
+        members_ttl_seconds (float): Seconds after which a channel's members are reloaded.
+
+    Example Usage:
+        user_info = slack_workspace_directory.find_user("Jane Doe")
+        channel_members = slack_workspace_directory.get_channel_members("C08BRF3MZT7")
+    """
+
+    def __init__(self, users_ttl_seconds=SLACK_USERS_DIRECTORY_TTL_SECONDS, members_ttl_seconds=SLACK_CHANNEL_MEMBERS_TTL_SECONDS):
+        self.users_ttl_seconds = users_ttl_seconds
+        self.members_ttl_seconds = members_ttl_seconds
+        self.users_by_id = {}
+        self.user_id_by_lookup_name = {}
+        self.users_loaded_at = None
+        self.members_by_channel_id = {}     # channel_id -> (set of user ids, loaded_at)
+        self.bot_user_id = None
+        self._lock = threading.Lock()
+
+    #####  Users  #####
+
+    def _index_user(self, user):
+        self.users_by_id[user.get("id")] = user
+        profile = user.get("profile", {})
+        for each_name in (user.get("name"), user.get("real_name"), profile.get("real_name"),
+                          profile.get("display_name"), profile.get("email")):
+            lookup_name = normalize_user_name(each_name)
+            if lookup_name:
+                self.user_id_by_lookup_name.setdefault(lookup_name, user.get("id"))
+
+    def refresh_users(self):
+        """Reloads every user of the workspace through users.list."""
+        all_users = slack_sync_http.paginate("users.list", {"limit": USERS_PAGE_LIMIT}, "members")
+        with self._lock:
+            self.users_by_id = {}
+            self.user_id_by_lookup_name = {}
+            for each_user in all_users:
+                if not each_user.get("deleted"):
+                    self._index_user(each_user)
+            self.users_loaded_at = time.monotonic()
+        print(f"📇 Slack user directory loaded with {len(self.users_by_id)} users")
+
+    def _ensure_users_loaded(self):
+        if self.users_loaded_at is None or time.monotonic() - self.users_loaded_at > self.users_ttl_seconds:
+            self.refresh_users()
+
+    def get_user(self, user_id):
+        """
+        Returns the summary dict ("id" , "name" , "real_name" , "email") of the user , or {} if Slack does not know the id.
+        """
+        self._ensure_users_loaded()
+        user = self.users_by_id.get(user_id)
+        if user is None:
+            try:
+                user = call_slack_web_api("users.info", {"user": user_id}).get("user", {})
+            except RuntimeError as e:
+                print(f"Error fetching user {user_id}: {e}")
+                return {}
+            if not user:
+                return {}
+            with self._lock:
+                self._index_user(user)
+        return summarize_user(user)
+
+    def find_user(self, user_name):
+        """
+        Resolves a name as written in a meeting (handle , real name , display name or email) to its user.
+
+        Returns:
+            dict: The user summary , or None if no user has that name.
+        """
+        self._ensure_users_loaded()
+        user_id = self.user_id_by_lookup_name.get(normalize_user_name(user_name))
+        return summarize_user(self.users_by_id[user_id]) if user_id else None
+
+    #####  Channels and bot  #####
+
+    def get_channel_members(self, channel_id):
+        """Returns the set of user ids in the channel , reloaded after `members_ttl_seconds`."""
+        cached_members = self.members_by_channel_id.get(channel_id)
+        if cached_members is not None and time.monotonic() - cached_members[1] <= self.members_ttl_seconds:
+            return cached_members[0]
+        channel_members = set(slack_sync_http.paginate("conversations.members", {"channel": channel_id, "limit": MEMBERS_PAGE_LIMIT}, "members"))
+        self.members_by_channel_id[channel_id] = (channel_members, time.monotonic())
+        return channel_members
+
+    def get_bot_user_id(self):
+        """Returns the bot's own user id , auth.test is only called the first time."""
+        if self.bot_user_id is None:
+            self.bot_user_id = call_slack_web_api("auth.test", {}).get("user_id")
+        return self.bot_user_id
+
+
+# Single directory shared by every Slack user lookup of the agent
+slack_workspace_directory = SlackWorkspaceDirectory()
@@ -1,34 +1,28 @@
 import os
 import re
-import json
-from slack_sdk.socket_mode import SocketModeClient
-from slack_sdk.web import WebClient
-from slack_sdk.socket_mode.request import SocketModeRequest
+import asyncio
 from dotenv import load_dotenv
+from meeting_ingestion_queue import meeting_ingestion_queue
 
 load_dotenv()
 
 # Environment Variables (Set these before running the script)
-SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")  # Bot User Token (xoxb-...)
-APP_LEVEL_TOKEN = os.getenv("SLACK_APP_TOKEN")  # App Token (xapp-...)
 READ_AI_CHANNEL_ID = os.getenv("READ_AI_CHANNEL_ID")  # Slack channel ID where Read.ai sends summaries
 
-# Initialize Slack Clients
-slack_client = WebClient(token=SLACK_BOT_TOKEN)
-socket_client = SocketModeClient(app_token=APP_LEVEL_TOKEN, web_client=slack_client)
-
 # Regex to identify Read.ai summary messages (Optional: Adjust based on Read.ai's format)
 SUMMARY_PATTERN = re.compile(r"Meeting Summary|Transcript|Notes", re.IGNORECASE)
 
-def store_summary(summary_text):
-    """ Store Read.ai summary text (Modify as needed for database, file storage, etc.) """
-    with open("meeting_summaries.txt", "a", encoding="utf-8") as file:
-        file.write(summary_text + "\n\n")
-    print("Summary stored successfully!")
+def store_summary(summary_text, event):
+    """ Queue Read.ai summary text in the durable ingestion queue , the agent workers pick it up from there """
+    summary_key = meeting_ingestion_queue.build_summary_key(event)
+    if meeting_ingestion_queue.enqueue(summary_key, summary_text, channel_id=event.get("channel"), message_ts=event.get("ts")):
+        print(f"Summary queued successfully! ({summary_key})")
+    else:
+        print(f"Summary {summary_key} was already queued , duplicate event ignored.")
 
 def handle_event(payload):
     """ Handles incoming Slack events and extracts Read.ai summaries """
-    event = payload["event"]
+    event = payload.get("event", {})
 
     # Check if event is a message from the Read.ai channel
     if event.get("type") == "message" and event.get("channel") == READ_AI_CHANNEL_ID:
@@ -37,21 +31,31 @@ def handle_event(payload):
         # Check if the message is a Read.ai summary
         if SUMMARY_PATTERN.search(message_text):
             print(f"Read.ai Summary Detected: \n{message_text}")
-            store_summary(message_text)  # Save the summary
+            store_summary(message_text, event)  # Save the summary
         else:
             print("Message received but does not match Read.ai summary format.")
 
-@socket_client.socket_mode_request_listeners.append
-def on_event_request(client: SocketModeClient, req: SocketModeRequest):
-    """ Listener for Slack Socket Mode events """
-    if req.type == "events_api":
-        handle_event(req.payload)
-        client.ack(req)  # Acknowledge event
+async def listen_for_summaries():
+    """
+    Listens through the shared `slack_reply_broker` connection , which queues Read.ai summaries
+    with `handle_event` and acknowledges them once queued.
+
+    Slack hands each event to only one of the app's connections , so this script opens no
+    connection of its own. Run it only while the agent (whose broker already queues summaries) is not running.
+    """
+    from slack_reply_broker import slack_reply_broker
+    await slack_reply_broker.start()
+    try:
+        while True:
+            await asyncio.sleep(60)
+            print(f"Meeting ingestion queue: {meeting_ingestion_queue.get_counts()}")
+    finally:
+        await slack_reply_broker.close()
 
 # Start listening for Read.ai summaries
 if __name__ == "__main__":
     print("Listening for Read.ai summaries in Slack...")
-    socket_client.connect()
-
-
-
+    try:
+        asyncio.run(listen_for_summaries())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# The modules under test live at the repo root , next to this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Module level caches and queues are created at import , they are kept out of the working tree
+TEST_CACHE_DIR = tempfile.mkdtemp(prefix="documentation_agent_tests_")
+os.environ.setdefault("NOTION_BLOCK_CACHE_DIR", os.path.join(TEST_CACHE_DIR, "notion_cache"))
+os.environ.setdefault("MEETING_INGESTION_QUEUE_DIR", os.path.join(TEST_CACHE_DIR, "ingestion_queue"))
@@ -0,0 +1,83 @@
+import pytest
+
+from llm_output_parser import (
+    HumanIntent, LLMOutputParseError, ProjectPointsList, TopicClassification,
+    extract_json_text, load_llm_json, parse_llm_output, repair_json_text
+)
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Answers the re-ask with the queued responses and records the prompts and invalidated responses."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+        self.invalidated = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return FakeResponse(self.responses.pop(0))
+
+    def invalidate_response(self, llm_content):
+        self.invalidated.append(llm_content)
+
+
+def test_extract_json_text_prefers_a_fenced_block():
+    llm_content = 'Here you go:\n```json\n{"acceptance": "yes"}\n```\nanything else?'
+    assert extract_json_text(llm_content) == '{"acceptance": "yes"}'
+
+
+def test_extract_json_text_takes_the_outermost_brackets():
+    assert extract_json_text('Sure! [{"a": "]"}, {"b": 2}] hope it helps') == '[{"a": "]"}, {"b": 2}]'
+
+
+def test_repair_json_text_fixes_the_usual_mistakes():
+    broken_text = '{"a": None, "b": True, // comment\n "c": [1, 2,], "d": “x”,}'
+    assert load_llm_json(broken_text) == {"a": None, "b": True, "c": [1, 2], "d": "x"}
+
+
+def test_repair_json_text_closes_a_cut_off_response():
+    assert load_llm_json('{"points": ["one", "tw') == {"points": ["one", "tw"]}
+    assert load_llm_json('{"a": 1, "b":') == {"a": 1}
+    assert repair_json_text('{"a": "None of True"}') == '{"a": "None of True"}'
+
+
+def test_parse_llm_output_normalizes_and_coerces_the_root():
+    parsed = parse_llm_output('{"projects": [{"notion_id": "abc", "project_name": "Docs"}]}', ProjectPointsList)
+    assert parsed == [{"notion_id": "abc", "project_name": "Docs", "points_list": []}]
+    assert parse_llm_output('[{"acceptance": " Yes "}]', HumanIntent) == {"acceptance": "yes", "notion_page_id": None}
+
+
+def test_parse_llm_output_raises_without_llm():
+    with pytest.raises(LLMOutputParseError):
+        parse_llm_output('{"is_new_topic": "maybe"}', TopicClassification)
+    with pytest.raises(LLMOutputParseError):
+        parse_llm_output("no json here", HumanIntent)
+
+
+def test_parse_llm_output_reasks_only_the_failing_fields():
+    llm = FakeLLM('{"is_new_topic": "no"}')
+    llm_content = '{"status": "matched", "is_new_topic": "maybe"}'
+    parsed = parse_llm_output(llm_content, TopicClassification, llm=llm, node_name="test")
+    assert parsed["is_new_topic"] == "no"
+    assert parsed["status"] == "matched"
+    assert len(llm.prompts) == 1 and "is_new_topic" in llm.prompts[0]
+    assert llm.invalidated == [llm_content]
+
+
+def test_parse_llm_output_raises_when_the_reask_is_still_invalid():
+    llm = FakeLLM('{"is_new_topic": "perhaps"}')
+    with pytest.raises(LLMOutputParseError):
+        parse_llm_output('{"is_new_topic": "maybe"}', TopicClassification, llm=llm)
+    assert llm.invalidated == ['{"is_new_topic": "maybe"}', '{"is_new_topic": "perhaps"}']
+
+
+def test_parse_llm_output_reasks_for_json_when_it_does_not_load():
+    llm = FakeLLM('```json\n{"acceptance": "no"}\n```')
+    assert parse_llm_output("I think the answer is no", HumanIntent, llm=llm)["acceptance"] == "no"
+    assert llm.invalidated == ["I think the answer is no"]
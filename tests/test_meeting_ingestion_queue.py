@@ -0,0 +1,96 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from meeting_ingestion_queue import MeetingIngestionQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return MeetingIngestionQueue(str(tmp_path), max_attempts=2, lease_seconds=60)
+
+
+def make_due(queue, summary_key):
+    # Skipping the retry backoff instead of sleeping through it
+    with closing(queue._connect()) as connection:
+        connection.execute("UPDATE meeting_summaries SET available_at = 0 WHERE summary_key = ?", (summary_key,))
+
+
+def expire_lease(queue, summary_key):
+    with closing(queue._connect()) as connection:
+        connection.execute("UPDATE meeting_summaries SET leased_until = 0 WHERE summary_key = ?", (summary_key,))
+
+
+def test_build_summary_key_prefers_client_msg_id():
+    assert MeetingIngestionQueue.build_summary_key({"client_msg_id": "abc", "channel": "C1", "ts": "1.2"}) == "abc"
+    assert MeetingIngestionQueue.build_summary_key({"channel": "C1", "ts": "1.2"}) == "C1:1.2"
+
+
+def test_enqueue_ignores_duplicates(queue):
+    assert queue.enqueue("key", "summary", channel_id="C1", message_ts="1.2") is True
+    assert queue.enqueue("key", "summary replayed") is False
+    assert queue.get_counts() == {"pending": 1}
+
+
+def test_claim_then_ack_stores_the_result(queue):
+    queue.enqueue("key", "summary", channel_id="C1", message_ts="1.2")
+    claimed = queue.claim("worker-1")
+    assert claimed == {"summary_key": "key", "summary_text": "summary", "channel_id": "C1", "message_ts": "1.2", "attempts": 1}
+    assert queue.claim("worker-2") is None
+
+    assert queue.ack("key", "worker-1", result={"pages": 2}) is True
+    assert queue.get_result("key") == {"pages": 2}
+    assert queue.get_counts() == {"done": 1}
+    assert queue.claim("worker-1") is None
+
+
+def test_only_the_lease_owner_can_ack(queue):
+    queue.enqueue("key", "summary")
+    queue.claim("worker-1")
+    assert queue.ack("key", "worker-2") is False
+    assert queue.renew_lease("key", "worker-2") is False
+    assert queue.renew_lease("key", "worker-1") is True
+
+
+def test_expired_lease_is_claimed_again_and_the_old_owner_is_ignored(queue):
+    queue.enqueue("key", "summary")
+    queue.claim("worker-1")
+    expire_lease(queue, "key")
+
+    reclaimed = queue.claim("worker-2")
+    assert reclaimed["summary_key"] == "key" and reclaimed["attempts"] == 2
+    assert queue.ack("key", "worker-1") is False
+    assert queue.ack("key", "worker-2") is True
+
+
+def test_fail_retries_with_backoff_then_dead_letters(queue):
+    queue.enqueue("key", "summary")
+    queue.claim("worker-1")
+    assert queue.fail("key", "worker-1", "boom") is True
+    assert queue.get_counts() == {"pending": 1}
+    assert queue.claim("worker-1") is None  # waiting for the backoff
+
+    make_due(queue, "key")
+    assert queue.claim("worker-1")["attempts"] == 2
+    assert queue.fail("key", "worker-1", "boom again") is True
+    assert queue.get_counts() == {"dead": 1}
+    with closing(sqlite3.connect(queue.db_path)) as connection:
+        assert connection.execute("SELECT last_error FROM meeting_summaries").fetchone() == ("boom again",)
+
+
+def test_requeue_dead_gives_fresh_attempts(queue):
+    for summary_key in ("first", "second"):
+        queue.enqueue(summary_key, "summary")
+        queue.claim("worker-1")
+        make_due(queue, summary_key)
+        queue.fail(summary_key, "worker-1", "boom")
+        make_due(queue, summary_key)
+        queue.claim("worker-1")
+        queue.fail(summary_key, "worker-1", "boom")
+    assert queue.get_counts() == {"dead": 2}
+
+    assert queue.requeue_dead("first") == 1
+    assert queue.get_counts() == {"dead": 1, "pending": 1}
+    assert queue.claim("worker-1") == {"summary_key": "first", "summary_text": "summary", "channel_id": None, "message_ts": None, "attempts": 1}
+    assert queue.requeue_dead() == 1
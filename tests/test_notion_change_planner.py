@@ -0,0 +1,82 @@
+from notion_block_cache import NotionBlockTreeCache
+from notion_change_planner import MAX_BULLETS_PER_APPEND, plan_block_changes
+
+PAGE_ID = "11111111-1111-1111-1111-111111111111"
+TOGGLE_ID = "22222222-2222-2222-2222-222222222222"
+NESTED_ID = "33333333-3333-3333-3333-333333333333"
+DEEPER_ID = "44444444-4444-4444-4444-444444444444"
+SIBLING_ID = "55555555-5555-5555-5555-555555555555"
+
+
+def compact(block_id):
+    return block_id.replace("-", "")
+
+
+def child(block_id, has_children=False):
+    return {"id": block_id, "type": "bulleted_list_item", "text": f"text of {block_id}", "has_children": has_children, "last_edited_time": "2025-01-01T00:00:00.000Z"}
+
+
+def build_block_tree_cache(tmp_path):
+    # page -> toggle -> nested -> deeper , and a sibling of the toggle
+    block_tree_cache = NotionBlockTreeCache(str(tmp_path))
+    block_tree_cache.save_page_tree(PAGE_ID, {
+        PAGE_ID: {"last_edited_time": "t", "children": [child(TOGGLE_ID, has_children=True), child(SIBLING_ID)]},
+        TOGGLE_ID: {"last_edited_time": "t", "children": [child(NESTED_ID, has_children=True)]},
+        NESTED_ID: {"last_edited_time": "t", "children": [child(DEEPER_ID)]},
+    })
+    return block_tree_cache
+
+
+def test_only_the_last_update_of_a_block_is_kept():
+    planned_changes = plan_block_changes([
+        {"objectId": SIBLING_ID, "ChangeType": "update", "ContentForChange": "first"},
+        {"objectId": SIBLING_ID, "ChangeType": "update", "ContentForChange": "second"},
+    ])
+    assert planned_changes == {"deletes": [], "updates": {compact(SIBLING_ID): "second"}, "appends": {}}
+
+
+def test_block_ids_are_normalized_before_being_compared():
+    planned_changes = plan_block_changes([
+        {"objectId": SIBLING_ID.upper(), "ChangeType": "update", "ContentForChange": "first"},
+        {"objectId": compact(SIBLING_ID), "ChangeType": "delete"},
+        {"objectId": SIBLING_ID, "ChangeType": "delete"},
+    ])
+    assert planned_changes == {"deletes": [compact(SIBLING_ID)], "updates": {}, "appends": {}}
+
+
+def test_appends_keep_their_order_and_are_chunked_per_request():
+    bullet_points = [f"point {index}" for index in range(MAX_BULLETS_PER_APPEND + 5)]
+    planned_changes = plan_block_changes([
+        {"objectId": TOGGLE_ID, "ChangeType": "append", "ContentForChange": each_point} for each_point in bullet_points
+    ])
+    assert planned_changes["appends"] == {
+        compact(TOGGLE_ID): [bullet_points[:MAX_BULLETS_PER_APPEND], bullet_points[MAX_BULLETS_PER_APPEND:]]
+    }
+
+
+def test_changes_without_target_or_with_unknown_type_are_skipped():
+    planned_changes = plan_block_changes([
+        {"objectId": None, "ChangeType": "update", "ContentForChange": "lost"},
+        {"objectId": SIBLING_ID, "ChangeType": "rename", "ContentForChange": "lost"},
+    ])
+    assert planned_changes == {"deletes": [], "updates": {}, "appends": {}}
+
+
+def test_changes_under_a_deleted_block_are_dropped(tmp_path):
+    planned_changes = plan_block_changes([
+        {"objectId": DEEPER_ID, "ChangeType": "update", "ContentForChange": "archived with the toggle"},
+        {"objectId": NESTED_ID, "ChangeType": "append", "ContentForChange": "archived with the toggle"},
+        {"objectId": NESTED_ID, "ChangeType": "delete"},
+        {"objectId": TOGGLE_ID, "ChangeType": "delete"},
+        {"objectId": SIBLING_ID, "ChangeType": "update", "ContentForChange": "kept"},
+    ], block_tree_cache=build_block_tree_cache(tmp_path))
+    assert planned_changes == {"deletes": [compact(TOGGLE_ID)], "updates": {compact(SIBLING_ID): "kept"}, "appends": {}}
+
+
+def test_without_a_cache_only_the_deleted_block_itself_is_dropped():
+    planned_changes = plan_block_changes([
+        {"objectId": TOGGLE_ID, "ChangeType": "append", "ContentForChange": "dropped"},
+        {"objectId": NESTED_ID, "ChangeType": "update", "ContentForChange": "kept"},
+        {"objectId": TOGGLE_ID, "ChangeType": "delete"},
+    ])
+    assert planned_changes == {"deletes": [compact(TOGGLE_ID)], "updates": {compact(NESTED_ID): "kept"}, "appends": {}}
@@ -0,0 +1,50 @@
+from prompt_budget import OMITTED_MARKER_TOKENS, BlockIdAliaser, _fit_children
+
+BLOCK_ID = "22222222-2222-2222-2222-222222222222"
+OTHER_BLOCK_ID = "33333333333333333333333333333333"
+
+
+def node(line, score, children=(), line_tokens=10):
+    # Same shape as the nodes built by `_parse_content_tree` , with fixed token counts
+    children = list(children)
+    return {
+        "line": line,
+        "line_tokens": line_tokens,
+        "score": score,
+        "children": children,
+        "subtree_lines": [line] + [line for each_child in children for line in each_child["subtree_lines"]],
+        "subtree_tokens": line_tokens + sum(each_child["subtree_tokens"] for each_child in children),
+    }
+
+
+def test_alias_text_and_restore_changes_round_trip():
+    block_id_aliases = BlockIdAliaser()
+    aliased_text = block_id_aliases.alias_text(f"1 first {BLOCK_ID}\n2 second {OTHER_BLOCK_ID}\n3 again {BLOCK_ID.replace('-', '')}")
+    assert aliased_text == "1 first b1\n2 second b2\n3 again b1"
+
+    restored_changes = block_id_aliases.restore_changes([
+        {"objectId": "B1", "ChangeType": "update"},
+        {"objectId": "{id: b2}", "ChangeType": "delete"},
+        {"objectId": "unknown", "ChangeType": "delete"},
+    ])
+    assert [each_change["objectId"] for each_change in restored_changes] == [BLOCK_ID, OTHER_BLOCK_ID, "unknown"]
+
+
+def test_fit_children_keeps_everything_that_fits():
+    children = [node("1 a", 0.1), node("2 b", 0.9, [node("2.1 c", 0.5)])]
+    assert _fit_children(children, 100) == (["1 a", "2 b", "2.1 c"], 30)
+
+
+def test_fit_children_prefers_children_of_related_subtrees_over_unrelated_headers():
+    related = node("1 related", 0.9, [node("1.1 relevant detail", 0.8), node("1.2 other detail", 0.1, line_tokens=40)])
+    unrelated = node("2 unrelated", 0.0, [node("2.1 nested", 0.0)])
+    token_budget = OMITTED_MARKER_TOKENS + (10 + OMITTED_MARKER_TOKENS) + 10
+
+    kept_lines, used_tokens = _fit_children([related, unrelated], token_budget)
+    assert kept_lines == [
+        "1 related",
+        "1.1 relevant detail",
+        "... 1 nested lines omitted (not related to this meeting)",
+        "... 2 more lines omitted (not related to this meeting)",
+    ]
+    assert used_tokens <= token_budget
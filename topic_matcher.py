@@ -0,0 +1,127 @@
+import os
+from notion_database_mirror import normalize_lookup_key
+
+
+TOPIC_MATCH_EXISTING_THRESHOLD = float(os.getenv("TOPIC_MATCH_EXISTING_THRESHOLD", "0.85"))
+
+
+def build_character_ngrams(normalized_text, ngram_size=3):
+    padded_text = f" {normalized_text} "
+    if len(padded_text) <= ngram_size:
+        return {padded_text}
+    return {padded_text[index:index + ngram_size] for index in range(len(padded_text) - ngram_size + 1)}
+
+
+class TopicMatcher:
+    """
+    Local matcher deciding whether a meeting topic was seen before , without an LLM call.
+
+    Candidates are past meeting names and project titles. A topic is first looked up by its
+    normalized text (exact match). Otherwise candidates sharing character n-grams with it are
+    pulled from an inverted index and scored with
+
+        0.6 * dice(character n-grams) + 0.4 * jaccard(word tokens)
+
+    Only a best score >= `existing_threshold` is a confident "existing". Everything else ,
+    including a low score or no candidate at all (e.g. an empty or failed mirror sync) , is
+    "ambiguous" and left to the LLM along with the top-k candidates: a "new" topic creates pages
+    and pings Slack , so low lexical overlap alone is never taken as proof that a topic is new.
+
+    Args:
+        candidates (list[dict]): [{"text": str, "source": "meeting" | "project", "row": dict}, ...]
+        ngram_size (int): Character n-gram length used by the fuzzy index.
+        existing_threshold (float): Score from which a topic is treated as existing.
+
+    Example Usage:
+        topic_matcher = TopicMatcher.from_database_rows(past_meetings_rows, notion_pages_rows)
+        match_result = topic_matcher.match("Marketing agent weekly sync")
+    """
+
+    def __init__(self, candidates, ngram_size=3, existing_threshold=TOPIC_MATCH_EXISTING_THRESHOLD):
+        self.ngram_size = ngram_size
+        self.existing_threshold = existing_threshold
+
+        self.candidates = []
+        self.candidate_indexes_by_normalized_text = {}
+        self.candidate_indexes_by_ngram = {}
+        for each_candidate in candidates:
+            normalized_text = normalize_lookup_key(each_candidate.get("text"))
+            if not normalized_text:
+                continue
+            candidate_index = len(self.candidates)
+            ngrams = build_character_ngrams(normalized_text, ngram_size)
+            self.candidates.append({
+                **each_candidate,
+                "normalized_text": normalized_text,
+                "ngrams": ngrams,
+                "tokens": set(normalized_text.split())
+            })
+            self.candidate_indexes_by_normalized_text.setdefault(normalized_text, []).append(candidate_index)
+            for each_ngram in ngrams:
+                self.candidate_indexes_by_ngram.setdefault(each_ngram, set()).add(candidate_index)
+
+    @classmethod
+    def from_database_rows(cls, past_meetings_rows, notion_pages_rows, **kwargs):
+        """Builds a matcher from Meetings History rows (meeting_name) and Notion Pages Data rows (page_project_title)."""
+        candidates = [
+            {"text": each_row.get("meeting_name"), "source": "meeting", "row": each_row}
+            for each_row in past_meetings_rows if "error" not in each_row
+        ]
+        candidates += [
+            {"text": each_row.get("page_project_title"), "source": "project", "row": each_row}
+            for each_row in notion_pages_rows if "error" not in each_row
+        ]
+        return cls(candidates, **kwargs)
+
+    def _score(self, topic_ngrams, topic_tokens, candidate):
+        ngram_dice = 2 * len(topic_ngrams & candidate["ngrams"]) / (len(topic_ngrams) + len(candidate["ngrams"]))
+        union_tokens = topic_tokens | candidate["tokens"]
+        token_jaccard = len(topic_tokens & candidate["tokens"]) / len(union_tokens) if union_tokens else 0.0
+        return 0.6 * ngram_dice + 0.4 * token_jaccard
+
+    def match(self, topic, top_k=5):
+        """
+        Scores the topic against every candidate sharing at least one n-gram with it.
+
+        Returns:
+            dict: {
+                "decision": "existing" | "ambiguous",
+                "matched": best candidate dict or None ("text", "source", "row", "score"),
+                "score": float,
+                "candidates": top-k candidate dicts , best first
+            }
+        """
+        normalized_topic = normalize_lookup_key(topic)
+
+        exact_indexes = self.candidate_indexes_by_normalized_text.get(normalized_topic, [])
+        if normalized_topic and exact_indexes:
+            exact_candidates = [self._public_candidate(self.candidates[index], 1.0) for index in exact_indexes]
+            return {"decision": "existing", "matched": exact_candidates[0], "score": 1.0, "candidates": exact_candidates[:top_k]}
+
+        topic_ngrams = build_character_ngrams(normalized_topic, self.ngram_size)
+        topic_tokens = set(normalized_topic.split())
+        sharing_indexes = set()
+        for each_ngram in topic_ngrams:
+            sharing_indexes |= self.candidate_indexes_by_ngram.get(each_ngram, set())
+
+        scored_candidates = sorted(
+            (self._public_candidate(self.candidates[index], self._score(topic_ngrams, topic_tokens, self.candidates[index]))
+             for index in sharing_indexes),
+            key=lambda each_candidate: each_candidate["score"],
+            reverse=True
+        )[:top_k]
+
+        best_candidate = scored_candidates[0] if scored_candidates else None
+        best_score = best_candidate["score"] if best_candidate else 0.0
+        decision = "existing" if best_score >= self.existing_threshold else "ambiguous"
+
+        return {
+            "decision": decision,
+            "matched": best_candidate if decision == "existing" else None,
+            "score": best_score,
+            "candidates": scored_candidates
+        }
+
+    @staticmethod
+    def _public_candidate(candidate, score):
+        return {"text": candidate["text"], "source": candidate["source"], "row": candidate["row"], "score": round(score, 4)}